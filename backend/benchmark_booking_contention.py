@@ -0,0 +1,222 @@
+#!/usr/bin/env python3
+"""
+Booking contention benchmark for POST /api/mentee/bookings
+
+Seeds a throwaway database on a local mongod, then fires concurrent bookings
+through the FastAPI app in-process and checks exactly-once outcomes:
+1. Same slot     - N mentees race for one slot; exactly one booking must win
+2. Distinct slots - N mentees each book their own slot; all must succeed
+3. Quota race    - one mentee with quota 1 books N slots; exactly one must win
+
+Run against a replica set to exercise real transactions:
+    mongod --replSet rs0 --dbpath /tmp/rs0 && mongosh --eval "rs.initiate()"
+    MONGO_URL=mongodb://localhost:27017/?replicaSet=rs0 python benchmark_booking_contention.py -n 300
+
+The benchmark database (BENCH_DB_NAME, default codementee_bench) is dropped
+before and after the run. Emails are stubbed out.
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).parent
+sys.path.insert(0, str(ROOT_DIR))
+
+os.environ.setdefault("MONGO_URL", "mongodb://localhost:27017")
+os.environ["DB_NAME"] = os.environ.get("BENCH_DB_NAME", "codementee_bench")
+
+import httpx
+import server
+
+# Never send real emails from a benchmark
+server.resend.Emails.send = staticmethod(lambda params: {"id": "benchmark"})
+
+db = server.db
+
+
+def percentile(values, pct):
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+async def seed_mentees(count: int, quota: int):
+    mentees = [{
+        "id": str(uuid.uuid4()),
+        "name": f"Bench Mentee {i}",
+        "email": f"bench-mentee-{i}-{uuid.uuid4().hex[:6]}@example.com",
+        "password": "not-used",
+        "role": "mentee",
+        "status": "Active",
+        "plan_id": "growth",
+        "plan_name": "Growth Plan",
+        "interview_quota_total": quota,
+        "interview_quota_remaining": quota,
+        "created_at": datetime.now(timezone.utc).isoformat()
+    } for i in range(count)]
+    await db.users.insert_many(mentees)
+    return mentees
+
+
+async def seed_slots(mentor: dict, count: int):
+    # Spread slots over future days so the 24h reminder path is exercised too
+    base = datetime.now(timezone.utc) + timedelta(days=3)
+    slots = []
+    for i in range(count):
+        day = base + timedelta(days=i // 10)
+        hour = 8 + (i % 10)
+        slots.append({
+            "id": str(uuid.uuid4()),
+            "mentor_id": mentor["id"],
+            "mentor_name": mentor["name"],
+            "mentor_email": mentor["email"],
+            "date": day.date().isoformat(),
+            "start_time": f"{hour:02d}:00",
+            "end_time": f"{hour:02d}:45",
+            "meeting_link": "https://meet.google.com/bench-mark-abc",
+            "status": "available",
+            "interview_types": ["coding"],
+            "experience_levels": ["mid"],
+            "company_specializations": [],
+            "preparation_notes": "",
+            "created_at": datetime.now(timezone.utc),
+            "updated_at": datetime.now(timezone.utc)
+        })
+    await db.mentor_slots.insert_many(slots)
+    return slots
+
+
+async def fire(http: httpx.AsyncClient, requests: list):
+    """Send (mentee, slot) bookings concurrently; returns (status codes, latencies, wall time)"""
+    async def book(mentee, slot):
+        token = server.create_token(mentee["id"], "mentee")
+        started = time.perf_counter()
+        response = await http.post(
+            "/api/mentee/bookings",
+            json={"slot_id": slot["id"], "company_id": COMPANY_ID, "interview_track": "coding"},
+            headers={"Authorization": f"Bearer {token}"}
+        )
+        return response.status_code, (time.perf_counter() - started) * 1000
+
+    started = time.perf_counter()
+    results = await asyncio.gather(*(book(mentee, slot) for mentee, slot in requests))
+    wall = time.perf_counter() - started
+    return [r[0] for r in results], [r[1] for r in results], wall
+
+
+def report(name: str, codes: list, latencies: list, wall: float, violations: list):
+    counts = {}
+    for code in codes:
+        counts[code] = counts.get(code, 0) + 1
+    print(f"\n=== {name} ===")
+    print(f"  requests:    {len(codes)} in {wall:.2f}s ({len(codes) / wall:.0f} req/s)")
+    print(f"  status:      {dict(sorted(counts.items()))}")
+    print(f"  latency ms:  p50={percentile(latencies, 50):.1f} p95={percentile(latencies, 95):.1f} "
+          f"p99={percentile(latencies, 99):.1f} mean={statistics.mean(latencies):.1f}")
+    print(f"  invariants:  {'OK' if not violations else 'VIOLATED'}")
+    for violation in violations:
+        print(f"    - {violation}")
+
+
+async def scenario_same_slot(http, mentor, n):
+    mentees = await seed_mentees(n, quota=3)
+    slot = (await seed_slots(mentor, 1))[0]
+    codes, latencies, wall = await fire(http, [(m, slot) for m in mentees])
+
+    violations = []
+    bookings = await db.bookings.count_documents({"slot_id": slot["id"]})
+    if codes.count(200) != 1:
+        violations.append(f"expected exactly 1 success, got {codes.count(200)}")
+    if bookings != 1:
+        violations.append(f"expected 1 booking for the slot, found {bookings}")
+    if any(code not in (200, 409) for code in codes):
+        violations.append("unexpected status codes (only 200/409 allowed)")
+    spent = await db.users.count_documents({"id": {"$in": [m["id"] for m in mentees]}, "interview_quota_remaining": 2})
+    if spent != 1:
+        violations.append(f"expected 1 mentee charged quota, found {spent}")
+    report(f"Same slot x{n}", codes, latencies, wall, violations)
+    return violations
+
+
+async def scenario_distinct_slots(http, mentor, n):
+    mentees = await seed_mentees(n, quota=3)
+    slots = await seed_slots(mentor, n)
+    codes, latencies, wall = await fire(http, list(zip(mentees, slots)))
+
+    violations = []
+    if codes.count(200) != n:
+        violations.append(f"expected {n} successes, got {codes.count(200)}")
+    booked = await db.mentor_slots.count_documents({"id": {"$in": [s["id"] for s in slots]}, "status": "booked"})
+    bookings = await db.bookings.count_documents({"slot_id": {"$in": [s["id"] for s in slots]}})
+    if booked != n or bookings != n:
+        violations.append(f"expected {n} booked slots / bookings, found {booked} / {bookings}")
+    report(f"Distinct slots x{n}", codes, latencies, wall, violations)
+    return violations
+
+
+async def scenario_quota_race(http, mentor, n):
+    mentee = (await seed_mentees(1, quota=1))[0]
+    slots = await seed_slots(mentor, n)
+    codes, latencies, wall = await fire(http, [(mentee, s) for s in slots])
+
+    violations = []
+    user = await db.users.find_one({"id": mentee["id"]})
+    bookings = await db.bookings.count_documents({"mentee_id": mentee["id"]})
+    booked = await db.mentor_slots.count_documents({"id": {"$in": [s["id"] for s in slots]}, "status": "booked"})
+    if codes.count(200) != 1 or bookings != 1:
+        violations.append(f"expected exactly 1 booking, got {codes.count(200)} successes / {bookings} bookings")
+    if user["interview_quota_remaining"] != 0:
+        violations.append(f"quota should be 0, is {user['interview_quota_remaining']}")
+    if booked != bookings:
+        violations.append(f"{booked} slots marked booked for {bookings} bookings (leaked slot claims)")
+    report(f"Quota race x{n}", codes, latencies, wall, violations)
+    return violations
+
+
+COMPANY_ID = str(uuid.uuid4())
+
+
+async def main(n: int):
+    await server.client.drop_database(os.environ["DB_NAME"])
+    await server.ensure_indexes()
+    print(f"Database: {os.environ['DB_NAME']} | transactions: {await server.transactions_supported()}")
+
+    mentor = {
+        "id": str(uuid.uuid4()),
+        "name": "Bench Mentor",
+        "email": "bench-mentor@example.com",
+        "role": "mentor",
+        "status": "active"
+    }
+    await db.users.insert_one(dict(mentor))
+    await db.companies.insert_one({"id": COMPANY_ID, "name": "Bench Co"})
+
+    violations = []
+    transport = httpx.ASGITransport(app=server.app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as http:
+        violations += await scenario_same_slot(http, mentor, n)
+        violations += await scenario_distinct_slots(http, mentor, n)
+        violations += await scenario_quota_race(http, mentor, n)
+
+    # Let fire-and-forget email tasks finish before tearing down
+    await asyncio.sleep(0.5)
+    await server.client.drop_database(os.environ["DB_NAME"])
+    return violations
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("-n", "--concurrency", type=int, default=200, help="concurrent requests per scenario")
+    args = parser.parse_args()
+
+    result = asyncio.run(main(args.concurrency))
+    sys.exit(1 if result else 0)
@@ -0,0 +1,358 @@
+#!/usr/bin/env python3
+"""
+Microbenchmarks for the per-request helpers in server.py
+
+Times the pure helpers on the hot paths (no sockets, no database):
+  serialize_doc, the validate_* checks, create_token / JWT decode,
+  build_booking_ical, the booking email senders (Resend stubbed),
+  and the slot-browse / mentee-bookings response shaping including the
+  jsonable_encoder pass FastAPI applies to the returned value.
+
+The email senders hand the request to a thread with asyncio.to_thread, so the
+"to_thread hop" case is reported as a reference for that part of their cost.
+
+Each case is run for --rounds rounds of at least --min-time seconds and the
+fastest round is kept, which is the most repeatable figure for code this small.
+Right before each case a fixed pure-Python calibration workload is timed the
+same way, and cases are compared by their cost relative to it, so a machine
+that is uniformly faster or slower (CPU frequency, noisy neighbours) doesn't
+read as a change. Scores are compared against the stored baseline
+(benchmark_hot_helpers.baseline.json next to this file) and the run fails
+(exit 1) if any case is more than --threshold slower. Cases under SMALL_CASE_NS
+per call jitter by more than that from timer and cache noise alone, so they get
+three times the rounds and the looser --small-threshold:
+    python benchmark_hot_helpers.py                  # compare against the baseline
+    python benchmark_hot_helpers.py --save           # record a new baseline
+    python benchmark_hot_helpers.py -k email -k ical # only cases matching a filter
+
+Calibration absorbs machine speed but not Python or dependency upgrades, which
+change the helpers and the calibration loop differently; re-record the baseline
+(--save) when those change, on the machine that gates the deploy.
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+import platform
+import subprocess
+import sys
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).parent
+sys.path.insert(0, str(ROOT_DIR))
+
+os.environ.setdefault("MONGO_URL", "mongodb://localhost:27017")
+os.environ.setdefault("DB_NAME", "codementee_bench")
+
+from bson import ObjectId
+from fastapi.encoders import jsonable_encoder
+
+import server
+
+# Never send real emails from a benchmark
+server.resend.Emails.send = staticmethod(lambda params: {"id": "benchmark"})
+
+BASELINE_PATH = ROOT_DIR / "benchmark_hot_helpers.baseline.json"
+SMALL_CASE_NS = 20_000
+NOW = datetime.now(timezone.utc)
+
+
+def sample_booking(i: int = 0, days: int = 3) -> dict:
+    """A booking document as it comes back from Mongo"""
+    day = NOW + timedelta(days=days)
+    return {
+        "_id": ObjectId(),
+        "id": str(uuid.uuid4()),
+        "slot_id": str(uuid.uuid4()),
+        "mentee_id": "mentee-1",
+        "mentee_name": "Bench Mentee",
+        "mentee_email": "bench-mentee@example.com",
+        "mentor_id": "mentor-1",
+        "mentor_name": "Bench Mentor",
+        "mentor_email": "bench-mentor@example.com",
+        "company_id": "company-1",
+        "company_name": "Amazon",
+        "interview_type": "system_design",
+        "experience_level": "senior",
+        "interview_track": "sde2",
+        "specific_topics": ["caching", "sharding"],
+        "additional_notes": "",
+        "preparation_notes": "Bring a whiteboard tool and review consistent hashing.",
+        "date": day.date().isoformat(),
+        "start_time": f"{8 + i % 10:02d}:00",
+        "end_time": f"{8 + i % 10:02d}:45",
+        "meeting_link": "https://meet.google.com/bench-mark-abc",
+        "status": "confirmed",
+        "cancelled_by": None,
+        "cancellation_reason": None,
+        "feedback_submitted": False,
+        "feedback_id": None,
+        "created_at": NOW,
+        "confirmed_at": NOW,
+        "completed_at": None,
+        "cancelled_at": None
+    }
+
+
+def sample_slot(i: int) -> dict:
+    """An available slot document as it comes back from Mongo"""
+    day = NOW + timedelta(days=1 + i // 10)
+    return {
+        "_id": ObjectId(),
+        "id": str(uuid.uuid4()),
+        "mentor_id": f"mentor-{i % 20}",
+        "mentor_name": f"Bench Mentor {i % 20}",
+        "mentor_email": f"bench-mentor-{i % 20}@example.com",
+        "date": day.date().isoformat(),
+        "start_time": f"{8 + i % 10:02d}:00",
+        "end_time": f"{8 + i % 10:02d}:45",
+        "meeting_link": "https://meet.google.com/bench-mark-abc",
+        "status": "available",
+        "interview_types": ["coding", "system_design"],
+        "experience_levels": ["mid", "senior"],
+        "company_specializations": ["company-1"],
+        "preparation_notes": "",
+        "created_at": NOW,
+        "updated_at": NOW
+    }
+
+
+# ============ CASES ============
+# Each case returns (callable, is_async); the callable is timed as-is.
+CASES = {}
+
+
+def case(name: str):
+    def register(factory):
+        CASES[name] = factory
+        return factory
+    return register
+
+
+@case("serialize_doc")
+def _():
+    user = {"_id": ObjectId(), "id": "user-1", "name": "Bench", "email": "bench@example.com",
+            "password": "$2b$12$" + "x" * 53, "role": "mentee", "status": "Active", "plan_id": "growth"}
+    return lambda: server.serialize_doc(dict(user)), False
+
+
+@case("validate_time_range")
+def _():
+    return lambda: server.validate_time_range("10:00", "10:45"), False
+
+
+@case("validate_date_not_past")
+def _():
+    day = (NOW + timedelta(days=3)).date().isoformat()
+    return lambda: server.validate_date_not_past(day), False
+
+
+@case("validate_meeting_link")
+def _():
+    # Teams is the last pattern tried
+    return lambda: server.validate_meeting_link("https://teams.microsoft.com/l/meetup-join/bench"), False
+
+
+@case("validate_template_slots (4 weeks)")
+def _():
+    template = {"meeting_link": "https://meet.google.com/bench-mark-abc", "weekdays": [0, 2, 4],
+                "start_time": "10:00", "end_time": "10:45"}
+    slots = [{"date": f"2030-01-{d:02d}", "start_time": "10:00", "end_time": "10:45"} for d in range(1, 13)]
+    return lambda: server.validate_template_slots(template, slots), False
+
+
+@case("create_token")
+def _():
+    return lambda: server.create_token("user-1", "mentee"), False
+
+
+@case("jwt decode")
+def _():
+    token = server.create_token("user-1", "mentee")
+    return lambda: server.jwt.decode(token, server.SECRET_KEY, algorithms=[server.ALGORITHM]), False
+
+
+@case("build_booking_ical")
+def _():
+    booking = sample_booking()
+    return lambda: server.build_booking_ical(booking), False
+
+
+@case("to_thread hop (reference)")
+def _():
+    return lambda: asyncio.to_thread(lambda: None), True
+
+
+@case("email: booking confirmation (x2)")
+def _():
+    booking = sample_booking()
+    return lambda: server.send_new_booking_confirmation_emails(booking), True
+
+
+@case("email: cancellation (x2)")
+def _():
+    booking = sample_booking()
+    return lambda: server.send_cancellation_notification_emails(booking, "mentee", "Schedule conflict"), True
+
+
+@case("email: reminder (x2)")
+def _():
+    booking = sample_booking()
+    return lambda: server.send_reminder_emails(booking), True
+
+
+@case("email: welcome")
+def _():
+    return lambda: server.send_welcome_email("Bench Mentee", "bench-mentee@example.com", "Growth Plan", 4999), True
+
+
+@case("browse response (1000 slots)")
+def _():
+    slots = [sample_slot(i) for i in range(1000)]
+    return lambda: jsonable_encoder(server.shape_browse_slots(list(slots))), False
+
+
+@case("mentee bookings response (50)")
+def _():
+    bookings = [sample_booking(i, days=(i % 10) - 5) for i in range(50)]
+    feedback_ids = {booking["id"]: str(uuid.uuid4()) for booking in bookings[::3]}
+    return lambda: jsonable_encoder(server.shape_mentee_bookings(bookings, feedback_ids)), False
+
+
+# ============ TIMING ============
+def calibration():
+    """Fixed interpreter-bound work (formatting, dicts, sorting) to normalize timings against"""
+    rows = {f"key-{i}": i * 7 % 13 for i in range(100)}
+    return sorted(rows.items(), key=lambda item: (item[1], item[0]))
+
+
+def time_sync(fn, number: int) -> float:
+    started = time.perf_counter_ns()
+    for _ in range(number):
+        fn()
+    return (time.perf_counter_ns() - started) / number
+
+
+def time_async(loop, fn, number: int) -> float:
+    async def batch():
+        started = time.perf_counter_ns()
+        for _ in range(number):
+            await fn()
+        return (time.perf_counter_ns() - started) / number
+    return loop.run_until_complete(batch())
+
+
+def measure(loop, fn, is_async: bool, rounds: int, min_time: float) -> float:
+    """Nanoseconds per call: calibrate a batch size lasting min_time, keep the fastest round"""
+    run = (lambda n: time_async(loop, fn, n)) if is_async else (lambda n: time_sync(fn, n))
+    number = 1
+    while run(number) * number < min_time * 1e9:
+        number *= 2
+    return min(run(number) for _ in range(rounds))
+
+
+def format_ns(ns: float) -> str:
+    if ns >= 1e6:
+        return f"{ns / 1e6:.2f} ms"
+    if ns >= 1e3:
+        return f"{ns / 1e3:.2f} us"
+    return f"{ns:.0f} ns"
+
+
+def git_commit() -> str:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT_DIR,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except Exception:
+        return "unknown"
+
+
+def environment() -> dict:
+    return {"python": platform.python_version(), "machine": platform.machine(), "processor": platform.processor(),
+            "system": platform.system(), "node": platform.node()}
+
+
+def main(args) -> bool:
+    # The email senders log every send; terminal I/O would dominate their timings
+    logging.getLogger("server").setLevel(logging.WARNING)
+    baseline = json.loads(args.baseline.read_text()) if args.baseline.exists() else None
+    if baseline and not args.save:
+        recorded = baseline.get("environment", {})
+        current = environment()
+        different = [key for key in ("python", "machine", "processor", "node") if recorded.get(key) != current[key]]
+        if different:
+            print(f"warning: baseline was recorded on a different environment ({', '.join(different)}); "
+                  f"scores may not be comparable")
+
+    names = [name for name in CASES if not args.filter or any(f in name for f in args.filter)]
+    loop = asyncio.new_event_loop()
+    results = {}
+    scores = {}
+    regressions = []
+    print(f"{'case':<36} {'time':>10} {'baseline':>10} {'score':>9} {'change':>8}")
+    for name in names:
+        fn, is_async = CASES[name]()
+        before = (baseline or {}).get("results", {}).get(name)
+        before_score = (baseline or {}).get("scores", {}).get(name)
+        small = (before or measure(loop, fn, is_async, 1, args.min_time)) < SMALL_CASE_NS
+        rounds = args.rounds * 3 if small else args.rounds
+        unit = measure(loop, calibration, False, rounds, args.min_time)
+        ns = measure(loop, fn, is_async, rounds, args.min_time)
+        results[name] = ns
+        scores[name] = ns / unit
+        change = ""
+        if before_score and not args.save:
+            ratio = scores[name] / before_score - 1
+            change = f"{ratio * 100:+.0f}%"
+            if ratio > (args.small_threshold if small else args.threshold):
+                regressions.append(name)
+                change += " !"
+        print(f"{name:<36} {format_ns(ns):>10} {format_ns(before) if before else '-':>10} "
+              f"{scores[name]:>9.3f} {change:>8}")
+    loop.close()
+
+    if args.save:
+        saved = dict((baseline or {}).get("results", {})) if args.filter else {}
+        saved_scores = dict((baseline or {}).get("scores", {})) if args.filter else {}
+        saved.update(results)
+        saved_scores.update(scores)
+        args.baseline.write_text(json.dumps({
+            "commit": git_commit(),
+            "recorded_at": datetime.now(timezone.utc).isoformat(),
+            "environment": environment(),
+            "results": saved,
+            "scores": saved_scores
+        }, indent=2) + "\n")
+        print(f"\nBaseline written to {args.baseline}")
+        return True
+
+    if baseline is None:
+        print(f"\nNo baseline at {args.baseline}; run with --save to record one")
+        return True
+    limits = f"{args.threshold * 100:.0f}% ({args.small_threshold * 100:.0f}% under {format_ns(SMALL_CASE_NS)})"
+    if regressions:
+        print(f"\n{len(regressions)} case(s) more than {limits} slower than baseline "
+              f"{baseline.get('commit', '?')}: {', '.join(regressions)}")
+        return False
+    print(f"\nOK: no case more than {limits} slower than baseline {baseline.get('commit', '?')}")
+    return True
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("-k", "--filter", action="append", help="only run cases whose name contains this (repeatable)")
+    parser.add_argument("--rounds", type=int, default=7, help="timed rounds per case (the fastest is kept)")
+    parser.add_argument("--min-time", type=float, default=0.1, help="minimum seconds per round")
+    parser.add_argument("--threshold", type=float, default=0.25, help="allowed slowdown vs the baseline (0.25 = 25%%)")
+    parser.add_argument("--small-threshold", type=float, default=0.5,
+                        help="allowed slowdown for cases under 20 us per call")
+    parser.add_argument("--baseline", type=Path, default=BASELINE_PATH, help="baseline file")
+    parser.add_argument("--save", action="store_true", help="record the results as the new baseline")
+    args = parser.parse_args()
+
+    sys.exit(0 if main(args) else 1)
@@ -0,0 +1,417 @@
+#!/usr/bin/env python3
+"""
+Load harness for the Codementee API with a weighted scenario mix
+
+Seeds a throwaway database on a local mongod, stubs Razorpay and Resend, then runs
+virtual users against the FastAPI app in-process. Each virtual user repeatedly
+picks a scenario by weight until the run ends:
+  landing        - anonymous pricing / founding-slots / recent-bookings polling
+  login          - password login (bcrypt verify)
+  browse         - mentee slot browsing with random filters
+  booking        - browse, then race other mentees for one of the first slots
+  notifications  - bell polling (conditional GET) plus the unread count
+  admin          - admin dashboards (orders, revenue, analytics)
+  checkout       - create a payment order and verify it
+
+Reports throughput and p50/p95/p99 latency per route template and per scenario,
+plus the Mongo commands per request the server attributed to each route.
+Runs are seeded, so two runs with the same arguments issue the same mix:
+    python benchmark_load_mix.py --duration 60 --users 50 --json before.json
+    git checkout <other commit>
+    python benchmark_load_mix.py --duration 60 --users 50 --compare before.json
+
+The benchmark database (BENCH_DB_NAME, default codementee_load) is dropped
+before and after the run.
+"""
+
+import argparse
+import asyncio
+import hashlib
+import hmac
+import json
+import logging
+import os
+import random
+import statistics
+import subprocess
+import sys
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).parent
+sys.path.insert(0, str(ROOT_DIR))
+
+os.environ.setdefault("MONGO_URL", "mongodb://localhost:27017")
+os.environ["DB_NAME"] = os.environ.get("BENCH_DB_NAME", "codementee_load")
+os.environ["RAZORPAY_KEY_ID"] = "rzp_test_load"
+os.environ["RAZORPAY_KEY_SECRET"] = "load-test-secret"
+
+import httpx
+import server
+
+# Never send real emails or create real Razorpay orders from a load test
+server.resend.Emails.send = staticmethod(lambda params: {"id": "load-test"})
+server.razorpay_client.order.create = lambda data: {"id": f"order_load_{uuid.uuid4().hex[:14]}", **data}
+
+db = server.db
+
+DEFAULT_MIX = "landing=30,login=5,browse=20,booking=5,notifications=25,admin=5,checkout=2"
+PASSWORD = "load-test-password"
+INTERVIEW_TYPES = ["coding", "system_design", "behavioral", "hr_round"]
+EXPERIENCE_LEVELS = ["junior", "mid", "senior", "staff_plus"]
+
+
+def percentile(values, pct):
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def git_commit() -> str:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT_DIR,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except Exception:
+        return "unknown"
+
+
+# ============ SEEDING ============
+async def seed(rng: random.Random, mentees: int, slots: int) -> dict:
+    now = datetime.now(timezone.utc)
+    # One bcrypt hash for every account; hashing per user would dominate seeding
+    password_hash = server.hash_password(PASSWORD)
+
+    def user(role, i, **extra):
+        return {
+            "id": str(uuid.uuid4()),
+            "name": f"Load {role.title()} {i}",
+            "email": f"load-{role}-{i}@example.com",
+            "password": password_hash,
+            "role": role,
+            "created_at": now.isoformat(),
+            **extra
+        }
+
+    admin = user("admin", 0, status="active")
+    mentors = [user("mentor", i, status="active") for i in range(max(1, mentees // 20))]
+    mentee_docs = [user(
+        "mentee", i,
+        status="Active", plan_id="growth", plan_name="Growth Plan",
+        interview_quota_total=1000, interview_quota_remaining=1000
+    ) for i in range(mentees)]
+    await db.users.insert_many([admin] + mentors + mentee_docs)
+
+    companies = [{"id": str(uuid.uuid4()), "name": f"Load Co {i}", "category": "product"} for i in range(12)]
+    await db.companies.insert_many(companies)
+
+    slot_docs = []
+    for i in range(slots):
+        mentor = mentors[i % len(mentors)]
+        day = (now + timedelta(days=2 + i // (len(mentors) * 10))).date().isoformat()
+        hour = 8 + (i // len(mentors)) % 10
+        slot_docs.append({
+            "id": str(uuid.uuid4()),
+            "mentor_id": mentor["id"],
+            "mentor_name": mentor["name"],
+            "mentor_email": mentor["email"],
+            "date": day,
+            "start_time": f"{hour:02d}:00",
+            "end_time": f"{hour:02d}:45",
+            "meeting_link": "https://meet.google.com/load-test-abc",
+            "status": "available",
+            "interview_types": rng.sample(INTERVIEW_TYPES, 2),
+            "experience_levels": rng.sample(EXPERIENCE_LEVELS, 2),
+            "company_specializations": [rng.choice(companies)["id"]],
+            "preparation_notes": "",
+            "created_at": now,
+            "updated_at": now
+        })
+    if slot_docs:
+        await db.mentor_slots.insert_many(slot_docs)
+
+    notifications = [{
+        "id": str(uuid.uuid4()),
+        "user_id": mentee["id"],
+        "type": "booking_confirmed",
+        "title": "Seeded notification",
+        "message": "Seeded for the load test",
+        "read": rng.random() < 0.7,
+        "created_at": (now - timedelta(minutes=rng.randint(1, 60 * 24 * 30))).isoformat()
+    } for mentee in mentee_docs for _ in range(10)]
+    if notifications:
+        await db.notifications.insert_many(notifications)
+
+    orders = [{
+        "id": str(uuid.uuid4()),
+        "razorpay_order_id": f"order_seed_{i}",
+        "email": mentee_docs[i % len(mentee_docs)]["email"] if mentee_docs else "",
+        "name": f"Load Buyer {i}",
+        "plan_id": "growth",
+        "plan_name": "Growth Plan",
+        "amount": 499900,
+        "currency": "INR",
+        "status": "paid",
+        "created_at": (now - timedelta(days=rng.randint(0, 90))).isoformat()
+    } for i in range(mentees)]
+    if orders:
+        await db.orders.insert_many(orders)
+
+    return {"admin": admin, "mentors": mentors, "mentees": mentee_docs, "companies": companies}
+
+
+# ============ VIRTUAL USERS ============
+class Recorder:
+    def __init__(self):
+        self.routes = {}     # "METHOD /route/template" -> [(latency ms, status)]
+        self.scenarios = {}  # scenario -> [latency ms]
+
+    def add_request(self, label: str, ms: float, status: int):
+        self.routes.setdefault(label, []).append((ms, status))
+
+    def add_scenario(self, name: str, ms: float):
+        self.scenarios.setdefault(name, []).append(ms)
+
+
+class VirtualUser:
+    def __init__(self, http: httpx.AsyncClient, recorder: Recorder, data: dict, rng: random.Random):
+        self.http = http
+        self.recorder = recorder
+        self.data = data
+        self.rng = rng
+        self.mentee = rng.choice(data["mentees"])
+        self.mentee_auth = {"Authorization": f"Bearer {server.create_token(self.mentee['id'], 'mentee')}"}
+        self.admin_auth = {"Authorization": f"Bearer {server.create_token(data['admin']['id'], 'admin')}"}
+        self.etags = {}
+
+    async def call(self, method: str, template: str, url: str, **kwargs) -> httpx.Response:
+        started = time.perf_counter()
+        response = await self.http.request(method, url, **kwargs)
+        self.recorder.add_request(f"{method} {template}", (time.perf_counter() - started) * 1000, response.status_code)
+        return response
+
+    async def poll(self, template: str, url: str, headers: dict = None):
+        """GET with If-None-Match, like a browser revalidating a cached response"""
+        headers = dict(headers or {})
+        if url in self.etags:
+            headers["If-None-Match"] = self.etags[url]
+        response = await self.call("GET", template, url, headers=headers)
+        if response.headers.get("etag"):
+            self.etags[url] = response.headers["etag"]
+        return response
+
+    async def landing(self):
+        await self.poll("/api/pricing-plans", "/api/pricing-plans")
+        await self.poll("/api/founding-slots", "/api/founding-slots")
+        await self.call("GET", "/api/recent-bookings", "/api/recent-bookings")
+
+    async def login(self):
+        await self.call("POST", "/api/auth/login", "/api/auth/login",
+                        json={"email": self.mentee["email"], "password": PASSWORD})
+
+    async def browse(self):
+        params = {}
+        if self.rng.random() < 0.5:
+            params["interview_type"] = self.rng.choice(INTERVIEW_TYPES)
+        if self.rng.random() < 0.3:
+            params["experience_level"] = self.rng.choice(EXPERIENCE_LEVELS)
+        if self.rng.random() < 0.2:
+            params["company_id"] = self.rng.choice(self.data["companies"])["id"]
+        url = "/api/mentee/slots/browse?" + "&".join(f"{k}={v}" for k, v in params.items())
+        return await self.poll("/api/mentee/slots/browse", url, headers=self.mentee_auth)
+
+    async def booking(self):
+        response = await self.browse()
+        slots = response.json() if response.status_code == 200 else []
+        if not slots:
+            return
+        # Everyone aims at the earliest slots, so concurrent users collide
+        slot = self.rng.choice(slots[:3])
+        companies = slot["company_specializations"] or [c["id"] for c in self.data["companies"]]
+        await self.call("POST", "/api/mentee/bookings", "/api/mentee/bookings", headers=self.mentee_auth, json={
+            "slot_id": slot["id"],
+            "company_id": self.rng.choice(companies),
+            "interview_track": "coding"
+        })
+
+    async def notifications(self):
+        await self.poll("/api/notifications", "/api/notifications", headers=self.mentee_auth)
+        await self.call("GET", "/api/notifications/unread/count", "/api/notifications/unread/count", headers=self.mentee_auth)
+
+    async def admin(self):
+        page = self.rng.choice([
+            "/api/admin/orders",
+            "/api/admin/revenue-stats",
+            "/api/admin/mentor-analytics",
+            "/api/admin/booking-analytics",
+            "/api/admin/bookings"
+        ])
+        await self.call("GET", page, page, headers=self.admin_auth)
+
+    async def checkout(self):
+        buyer = uuid.uuid4().hex[:10]
+        response = await self.call("POST", "/api/payment/create-order", "/api/payment/create-order", json={
+            "name": f"Load Buyer {buyer}",
+            "email": f"load-buyer-{buyer}@example.com",
+            "password": PASSWORD,
+            "plan_id": "growth"
+        })
+        if response.status_code != 200:
+            return
+        order = response.json()
+        order_id = order["razorpay_order_id"]
+        payment_id = f"pay_load_{uuid.uuid4().hex[:14]}"
+        signature = hmac.new(
+            server.RAZORPAY_KEY_SECRET.encode(), f"{order_id}|{payment_id}".encode(), hashlib.sha256
+        ).hexdigest()
+        await self.call("POST", "/api/payment/verify", "/api/payment/verify", json={
+            "order_id": order["order_id"],
+            "razorpay_order_id": order_id,
+            "razorpay_payment_id": payment_id,
+            "razorpay_signature": signature
+        })
+
+    async def run(self, mix: list, deadline: float):
+        names = [name for name, _ in mix]
+        weights = [weight for _, weight in mix]
+        while time.perf_counter() < deadline:
+            name = self.rng.choices(names, weights)[0]
+            started = time.perf_counter()
+            try:
+                await getattr(self, name)()
+            except Exception as e:
+                self.recorder.add_request(f"{name} (exception: {type(e).__name__})", 0.0, 599)
+            self.recorder.add_scenario(name, (time.perf_counter() - started) * 1000)
+
+
+# ============ REPORTING ============
+def summarize(recorder: Recorder, wall: float) -> dict:
+    db_commands = {f"{method} {route}": count for (method, route), count in server.metrics.db_commands.items()}
+    routes = {}
+    for label, samples in sorted(recorder.routes.items()):
+        latencies = [ms for ms, _ in samples]
+        statuses = {}
+        for _, status in samples:
+            statuses[str(status)] = statuses.get(str(status), 0) + 1
+        routes[label] = {
+            "requests": len(samples),
+            "rps": len(samples) / wall,
+            "p50": percentile(latencies, 50),
+            "p95": percentile(latencies, 95),
+            "p99": percentile(latencies, 99),
+            "mean": statistics.mean(latencies),
+            "errors": sum(1 for _, status in samples if status >= 500),
+            "statuses": statuses,
+            "db_per_request": db_commands.get(label, 0) / len(samples)
+        }
+    scenarios = {name: {
+        "runs": len(latencies),
+        "p50": percentile(latencies, 50),
+        "p95": percentile(latencies, 95),
+        "p99": percentile(latencies, 99)
+    } for name, latencies in sorted(recorder.scenarios.items())}
+    total = sum(route["requests"] for route in routes.values())
+    return {
+        "total": {"requests": total, "rps": total / wall, "wall_seconds": wall,
+                  "errors": sum(route["errors"] for route in routes.values())},
+        "routes": routes,
+        "scenarios": scenarios
+    }
+
+
+def report(result: dict, baseline: dict = None):
+    total = result["total"]
+    print(f"\nCommit {result['commit']} | {total['requests']} requests in {total['wall_seconds']:.1f}s "
+          f"({total['rps']:.0f} req/s) | 5xx: {total['errors']}")
+    print(f"\n{'route':<48} {'req':>7} {'req/s':>8} {'p50':>8} {'p95':>8} {'p99':>8} {'db/req':>7}  statuses")
+    for label, route in result["routes"].items():
+        print(f"{label:<48} {route['requests']:>7} {route['rps']:>8.1f} {route['p50']:>8.1f} {route['p95']:>8.1f} "
+              f"{route['p99']:>8.1f} {route['db_per_request']:>7.1f}  {route['statuses']}")
+    print(f"\n{'scenario':<16} {'runs':>7} {'p50':>8} {'p95':>8} {'p99':>8}   (ms)")
+    for name, scenario in result["scenarios"].items():
+        print(f"{name:<16} {scenario['runs']:>7} {scenario['p50']:>8.1f} {scenario['p95']:>8.1f} {scenario['p99']:>8.1f}")
+
+    if baseline:
+        print(f"\nCompared with {baseline.get('commit', '?')} (positive = slower / less throughput)")
+        print(f"{'route':<48} {'p95 ms':>16} {'p95 %':>8} {'req/s %':>8}")
+        for label, route in result["routes"].items():
+            before = baseline.get("routes", {}).get(label)
+            if not before:
+                print(f"{label:<48} {'(new)':>16}")
+                continue
+            p95_change = (route["p95"] - before["p95"]) / before["p95"] * 100 if before["p95"] else 0.0
+            rps_change = (before["rps"] - route["rps"]) / before["rps"] * 100 if before["rps"] else 0.0
+            print(f"{label:<48} {before['p95']:>7.1f} -> {route['p95']:>6.1f} {p95_change:>+7.1f}% {rps_change:>+7.1f}%")
+
+
+def parse_mix(spec: str) -> list:
+    mix = []
+    for part in spec.split(","):
+        name, _, weight = part.partition("=")
+        if not hasattr(VirtualUser, name.strip()):
+            raise SystemExit(f"Unknown scenario: {name}")
+        mix.append((name.strip(), float(weight or 1)))
+    return mix
+
+
+async def main(args) -> dict:
+    if not args.verbose:
+        logging.getLogger("server").setLevel(logging.WARNING)
+        logging.getLogger("httpx").setLevel(logging.WARNING)
+
+    await server.client.drop_database(os.environ["DB_NAME"])
+    await server.ensure_indexes()
+    rng = random.Random(args.seed)
+    data = await seed(rng, args.mentees, args.slots)
+    await server.backfill_founding_counter()
+    await server.ensure_social_proof_collection()
+    await server.load_plan_catalog()
+    print(f"Database: {os.environ['DB_NAME']} | transactions: {await server.transactions_supported()} | "
+          f"{args.mentees} mentees, {args.slots} slots | {args.users} users for {args.duration}s | mix {args.mix}")
+
+    recorder = Recorder()
+    mix = parse_mix(args.mix)
+    transport = httpx.ASGITransport(app=server.app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://load", timeout=60) as http:
+        users = [VirtualUser(http, recorder, data, random.Random(args.seed * 1000 + i)) for i in range(args.users)]
+        started = time.perf_counter()
+        deadline = started + args.duration
+        await asyncio.gather(*(user.run(mix, deadline) for user in users))
+        wall = time.perf_counter() - started
+
+    # Let fire-and-forget tasks (emails, event dispatch) finish before tearing down
+    await asyncio.sleep(1)
+    await server.client.drop_database(os.environ["DB_NAME"])
+
+    result = {
+        "commit": git_commit(),
+        "recorded_at": datetime.now(timezone.utc).isoformat(),
+        "config": {key: getattr(args, key) for key in ("duration", "users", "mentees", "slots", "mix", "seed")},
+        **summarize(recorder, wall)
+    }
+    return result
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--duration", type=float, default=30, help="seconds to run")
+    parser.add_argument("--users", type=int, default=50, help="concurrent virtual users")
+    parser.add_argument("--mentees", type=int, default=200, help="seeded mentee accounts")
+    parser.add_argument("--slots", type=int, default=500, help="seeded available slots")
+    parser.add_argument("--mix", default=DEFAULT_MIX, help=f"scenario weights (default {DEFAULT_MIX})")
+    parser.add_argument("--seed", type=int, default=42, help="random seed for data and scenario choice")
+    parser.add_argument("--json", help="write the results to this file")
+    parser.add_argument("--compare", help="results file from an earlier run to diff against")
+    parser.add_argument("--verbose", action="store_true", help="keep the server's INFO logging")
+    args = parser.parse_args()
+
+    result = asyncio.run(main(args))
+    baseline = json.loads(Path(args.compare).read_text()) if args.compare else None
+    report(result, baseline)
+    if args.json:
+        Path(args.json).write_text(json.dumps(result, indent=2))
+        print(f"\nResults written to {args.json}")
+    sys.exit(1 if result["total"]["errors"] else 0)
@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+Per-request overhead benchmark for MetricsMiddleware
+
+Drives a no-op ASGI route directly (no sockets, no database) with and without
+the metrics middleware and reports the difference per request:
+1. Bare route      - the route alone, as the baseline
+2. With metrics    - the same route wrapped in MetricsMiddleware
+3. Scrape          - rendering /metrics once the label sets are populated
+
+The run fails (exit 1) if the middleware adds more than --budget-us per request
+(default 50 us). Requests are spread over --routes route templates so the
+histogram lookups see a realistic number of label sets.
+
+    python benchmark_metrics_overhead.py -n 200000
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import time
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).parent
+sys.path.insert(0, str(ROOT_DIR))
+
+os.environ.setdefault("MONGO_URL", "mongodb://localhost:27017")
+os.environ.setdefault("DB_NAME", "codementee_bench")
+
+import server
+
+
+class FakeRoute:
+    def __init__(self, path: str):
+        self.path = path
+
+
+async def noop_app(scope, receive, send):
+    # What the router does on a match, then a minimal response
+    scope["route"] = scope["_bench_route"]
+    await send({"type": "http.response.start", "status": 200, "headers": []})
+    await send({"type": "http.response.body", "body": b"{}"})
+
+
+async def receive():
+    return {"type": "http.request", "body": b"", "more_body": False}
+
+
+async def send(message):
+    pass
+
+
+def make_scopes(routes: int) -> list:
+    return [{
+        "type": "http",
+        "method": "GET" if i % 3 else "POST",
+        "path": f"/api/bench/{i}/items",
+        "_bench_route": FakeRoute(f"/api/bench/{i}/{{item_id}}")
+    } for i in range(routes)]
+
+
+async def time_app(app, scopes: list, n: int, rounds: int) -> list:
+    """Nanoseconds per request for each round"""
+    per_request = []
+    for _ in range(rounds):
+        started = time.perf_counter_ns()
+        for i in range(n):
+            await app(dict(scopes[i % len(scopes)]), receive, send)
+        per_request.append((time.perf_counter_ns() - started) / n)
+    return per_request
+
+
+async def main(n: int, routes: int, rounds: int, budget_us: float):
+    scopes = make_scopes(routes)
+    wrapped = server.MetricsMiddleware(noop_app)
+
+    # Warm up both paths (and create every label set) before measuring
+    await time_app(noop_app, scopes, routes * 10, 1)
+    await time_app(wrapped, scopes, routes * 10, 1)
+
+    bare = await time_app(noop_app, scopes, n, rounds)
+    with_metrics = await time_app(wrapped, scopes, n, rounds)
+    overhead_us = (statistics.median(with_metrics) - statistics.median(bare)) / 1000
+
+    started = time.perf_counter()
+    body = server.metrics.render()
+    render_ms = (time.perf_counter() - started) * 1000
+
+    print(f"requests:        {n} x {rounds} rounds over {routes} route templates")
+    print(f"bare route:      {statistics.median(bare) / 1000:.2f} us/request")
+    print(f"with metrics:    {statistics.median(with_metrics) / 1000:.2f} us/request")
+    print(f"overhead:        {overhead_us:.2f} us/request (budget {budget_us:.0f} us)")
+    print(f"scrape:          {render_ms:.2f} ms for {len(body.splitlines())} lines")
+    print(f"result:          {'OK' if overhead_us <= budget_us else 'OVER BUDGET'}")
+    return overhead_us <= budget_us
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("-n", "--requests", type=int, default=100000, help="requests per round")
+    parser.add_argument("--routes", type=int, default=60, help="distinct route templates")
+    parser.add_argument("--rounds", type=int, default=5, help="rounds per variant (the median is reported)")
+    parser.add_argument("--budget-us", type=float, default=50.0, help="maximum allowed overhead per request")
+    args = parser.parse_args()
+
+    ok = asyncio.run(main(args.requests, args.routes, args.rounds, args.budget_us))
+    sys.exit(0 if ok else 1)
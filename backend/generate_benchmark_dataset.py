@@ -0,0 +1,451 @@
+#!/usr/bin/env python3
+"""
+Synthetic dataset generator for benchmarking at production-like volumes
+
+Fills a database with referentially consistent data at a configurable scale:
+  users          - one admin, mentors (--mentors), the rest mentees (a --paid-ratio share on paid plans)
+  companies      - --companies target companies
+  mentor_slots   - --slots open future slots, plus the booked slot behind every booking
+  bookings       - --bookings spread over the past --days and the next two weeks
+                   (past ones completed or cancelled, future ones confirmed)
+  quota_ledger   - an opening entry per paid mentee and a consume entry per active booking
+  orders         - a paid order per paid mentee, the rest of --orders pending or failed
+  notifications  - --notifications, skewed towards active users, at most the retention cap per user
+
+Derived state (quota balances, notification_counters, the founding seat counter)
+is computed from the generated data, so it matches what the app would have
+written. Every account's password is --password.
+
+Documents are generated in a stream and written with unordered insert_many
+batches of --batch-size, with up to --concurrency batches in flight. Indexes are
+built after the load, which is much faster than maintaining them during it.
+
+    python generate_benchmark_dataset.py --users 100000 --slots 50000 --bookings 1000000 \\
+        --notifications 5000000 --orders 200000
+
+The target database (BENCH_DB_NAME, default codementee_scale) must be empty
+unless --drop is given.
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import sys
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).parent
+sys.path.insert(0, str(ROOT_DIR))
+
+os.environ.setdefault("MONGO_URL", "mongodb://localhost:27017")
+os.environ["DB_NAME"] = os.environ.get("BENCH_DB_NAME", "codementee_scale")
+
+from pymongo import UpdateOne
+
+import server
+
+db = server.db
+
+INTERVIEW_TYPES = ["coding", "system_design", "behavioral", "hr_round"]
+EXPERIENCE_LEVELS = ["junior", "mid", "senior", "staff_plus"]
+INTERVIEW_TRACKS = ["sde1", "sde2", "senior", "staff"]
+PAID_PLANS = ["foundation", "growth", "accelerator"]
+NOTIFICATION_TYPES = ["booking_confirmed", "booking_cancelled", "booking_reminder", "feedback_received", "plan_upgraded"]
+ROLES = ["SDE 1", "SDE 2", "Senior SDE", "Staff Engineer", "Student"]
+
+
+class BatchWriter:
+    """Buffers documents for one collection and writes them with parallel insert_many calls"""
+
+    def __init__(self, collection, batch_size: int, slots: asyncio.Semaphore):
+        self.collection = collection
+        self.batch_size = batch_size
+        self.slots = slots
+        self.buffer = []
+        self.pending = set()
+        self.written = 0
+
+    async def add(self, doc: dict):
+        self.buffer.append(doc)
+        if len(self.buffer) >= self.batch_size:
+            await self.send()
+
+    async def send(self):
+        if not self.buffer:
+            return
+        batch, self.buffer = self.buffer, []
+        # Blocks the generator once --concurrency batches are in flight (backpressure)
+        await self.slots.acquire()
+        task = asyncio.create_task(self.write(batch))
+        self.pending.add(task)
+        task.add_done_callback(self.pending.discard)
+
+    async def write(self, batch: list):
+        try:
+            await self.collection.insert_many(batch, ordered=False)
+            self.written += len(batch)
+        finally:
+            self.slots.release()
+
+    async def close(self) -> int:
+        await self.send()
+        if self.pending:
+            await asyncio.gather(*self.pending)
+        return self.written
+
+
+class Generator:
+    def __init__(self, args):
+        self.args = args
+        self.rng = random.Random(args.seed)
+        self.now = datetime.now(timezone.utc)
+        self.slots = asyncio.Semaphore(args.concurrency)
+        self.password_hash = server.hash_password(args.password)
+        self.counts = {}
+
+    def writer(self, name: str) -> BatchWriter:
+        return BatchWriter(db[name], self.args.batch_size, self.slots)
+
+    def past(self, days: int) -> datetime:
+        return self.now - timedelta(seconds=self.rng.randint(0, days * 86400))
+
+    async def run(self):
+        phases = [
+            ("companies", self.generate_companies),
+            ("users", self.generate_users),
+            ("mentor_slots + bookings", self.generate_bookings),
+            ("open mentor_slots", self.generate_open_slots),
+            ("users (quota balances) + quota_ledger", self.apply_quotas),
+            ("orders", self.generate_orders),
+            ("notifications", self.generate_notifications),
+        ]
+        for name, phase in phases:
+            started = time.perf_counter()
+            await phase()
+            print(f"  {name:<40} {time.perf_counter() - started:>8.1f}s")
+
+    async def generate_companies(self):
+        self.companies = [{
+            "id": str(uuid.uuid4()),
+            "name": f"Company {i}",
+            "logo_url": "",
+            "description": f"Synthetic company {i}",
+            "category": self.rng.choice(["product", "unicorn", "startup"]),
+            "interview_tracks": INTERVIEW_TRACKS,
+            "difficulty_levels": EXPERIENCE_LEVELS
+        } for i in range(self.args.companies)]
+        self.company_names = {company["id"]: company["name"] for company in self.companies}
+        await db.companies.insert_many([dict(company) for company in self.companies])
+        self.counts["companies"] = len(self.companies)
+
+    async def generate_users(self):
+        args = self.args
+        users = self.writer("users")
+        await users.add({
+            "id": str(uuid.uuid4()),
+            "name": "Scale Admin",
+            "email": "admin@scale.example.com",
+            "password": self.password_hash,
+            "role": "admin",
+            "status": "active",
+            "created_at": self.past(args.days).isoformat()
+        })
+
+        self.mentors = []
+        for i in range(args.mentors):
+            mentor = {
+                "id": str(uuid.uuid4()),
+                "name": f"Mentor {i}",
+                "email": f"mentor-{i}@scale.example.com",
+                "password": self.password_hash,
+                "role": "mentor",
+                "status": "active",
+                "created_at": self.past(args.days).isoformat()
+            }
+            self.mentors.append((mentor["id"], mentor["name"], mentor["email"]))
+            await users.add(mentor)
+
+        # Kept in memory for the later phases: (id, name, email, plan_id or None)
+        self.mentees = []
+        for i in range(max(0, args.users - args.mentors - 1)):
+            paid = self.rng.random() < args.paid_ratio
+            plan_id = self.rng.choice(PAID_PLANS) if paid else None
+            mentee = {
+                "id": str(uuid.uuid4()),
+                "name": f"Mentee {i}",
+                "email": f"mentee-{i}@scale.example.com",
+                "password": self.password_hash,
+                "role": "mentee",
+                "status": "Active" if paid else "Free",
+                "plan_id": plan_id,
+                "plan_name": server.BUILTIN_PLANS[plan_id]["name"] if paid else "Free Tier",
+                "mentor_id": None,
+                "current_role": self.rng.choice(ROLES),
+                "target_role": f"{self.rng.choice(self.companies)['name']} {self.rng.choice(ROLES)}",
+                "created_at": self.past(args.days).isoformat()
+            }
+            if paid:
+                # The generated database has no pricing_plans, so the built-in catalog entries apply
+                entitlements = server.BUILTIN_PLANS[plan_id]
+                mentee["plan_features"] = dict(entitlements["plan_features"])
+                mentee["interview_quota_total"] = entitlements["interview_quota_total"]
+                mentee["interview_quota_remaining"] = entitlements["interview_quota_total"]
+            self.mentees.append((mentee["id"], mentee["name"], mentee["email"], plan_id))
+            await users.add(mentee)
+        self.counts["users"] = await users.close()
+        self.paid_mentees = [mentee for mentee in self.mentees if mentee[3]]
+
+    def slot_doc(self, mentor: tuple, day: datetime, hour: int, status: str) -> dict:
+        created = min(day, self.now) - timedelta(days=self.rng.randint(1, 14))
+        return {
+            "id": str(uuid.uuid4()),
+            "mentor_id": mentor[0],
+            "mentor_name": mentor[1],
+            "mentor_email": mentor[2],
+            "date": day.date().isoformat(),
+            "start_time": f"{hour:02d}:00",
+            "end_time": f"{hour:02d}:45",
+            "meeting_link": f"https://meet.google.com/scale-{uuid.uuid4().hex[:10]}",
+            "status": status,
+            "interview_types": self.rng.sample(INTERVIEW_TYPES, self.rng.randint(1, 3)),
+            "experience_levels": self.rng.sample(EXPERIENCE_LEVELS, self.rng.randint(1, 3)),
+            "company_specializations": [c["id"] for c in self.rng.sample(self.companies, min(2, len(self.companies)))]
+                                       if self.rng.random() < 0.5 else [],
+            "preparation_notes": "",
+            "created_at": created,
+            "updated_at": created
+        }
+
+    async def generate_bookings(self):
+        """Each booking comes with the booked slot it claimed, so the two always agree"""
+        args = self.args
+        slots, bookings = self.writer("mentor_slots"), self.writer("bookings")
+        # Booked interviews per paid mentee, consumed from quota in apply_quotas
+        self.active_bookings = {}
+        if not self.paid_mentees or not self.mentors:
+            self.counts["bookings"] = 0
+            return
+
+        for _ in range(args.bookings):
+            mentee = self.rng.choice(self.paid_mentees)
+            mentor = self.rng.choice(self.mentors)
+            upcoming = self.rng.random() < args.upcoming_ratio
+            if upcoming:
+                day = self.now + timedelta(days=self.rng.randint(1, 14))
+                status = "confirmed"
+            else:
+                day = self.past(args.days)
+                status = "cancelled" if self.rng.random() < 0.1 else "completed"
+            slot = self.slot_doc(mentor, day, self.rng.randint(8, 20), "available" if status == "cancelled" else "booked")
+            company = self.rng.choice(slot["company_specializations"]) if slot["company_specializations"] \
+                else self.rng.choice(self.companies)["id"]
+            booked_at = slot["created_at"] + timedelta(hours=self.rng.randint(1, 72))
+            booking = {
+                "id": str(uuid.uuid4()),
+                "slot_id": slot["id"],
+                "mentee_id": mentee[0],
+                "mentee_name": mentee[1],
+                "mentee_email": mentee[2],
+                "mentor_id": mentor[0],
+                "mentor_name": mentor[1],
+                "mentor_email": mentor[2],
+                "company_id": company,
+                "company_name": self.company_names[company],
+                "interview_type": slot["interview_types"][0],
+                "experience_level": slot["experience_levels"][0],
+                "interview_track": self.rng.choice(INTERVIEW_TRACKS),
+                "specific_topics": [],
+                "additional_notes": "",
+                "date": slot["date"],
+                "start_time": slot["start_time"],
+                "end_time": slot["end_time"],
+                "meeting_link": slot["meeting_link"],
+                "status": status,
+                "cancelled_by": "mentee" if status == "cancelled" else None,
+                "cancellation_reason": "Schedule conflict" if status == "cancelled" else None,
+                "feedback_submitted": False,
+                "feedback_id": None,
+                "created_at": booked_at,
+                "confirmed_at": booked_at,
+                "completed_at": day if status == "completed" else None,
+                "cancelled_at": booked_at + timedelta(hours=1) if status == "cancelled" else None
+            }
+            if status != "cancelled":
+                self.active_bookings.setdefault(mentee[0], []).append(booking["id"])
+            await slots.add(slot)
+            await bookings.add(booking)
+        self.counts["bookings"] = await bookings.close()
+        self.counts["mentor_slots"] = await slots.close()
+
+    async def generate_open_slots(self):
+        slots = self.writer("mentor_slots")
+        for _ in range(self.args.slots if self.mentors else 0):
+            day = self.now + timedelta(days=self.rng.randint(1, 30))
+            await slots.add(self.slot_doc(self.rng.choice(self.mentors), day, self.rng.randint(8, 20), "available"))
+        self.counts["mentor_slots"] = self.counts.get("mentor_slots", 0) + await slots.close()
+
+    async def apply_quotas(self):
+        """Set each paid mentee's balance to cover their bookings and write the matching ledger"""
+        ledger = self.writer("quota_ledger")
+        updates = []
+        for mentee_id, _, _, plan_id in self.paid_mentees:
+            booked = self.active_bookings.get(mentee_id, [])
+            # Heavy bookers are treated as having bought add-on interviews
+            total = max(server.BUILTIN_PLANS[plan_id]["interview_quota_total"], len(booked))
+            entries = [("opening", total, f"opening:{mentee_id}:interview", "Opening balance", None)]
+            entries += [("consume", -1, f"booking:{booking_id}:consume", "Mock interview booking", booking_id)
+                        for booking_id in booked]
+            for kind, amount, key, reason, ref_id in entries:
+                await ledger.add({
+                    "id": str(uuid.uuid4()),
+                    "user_id": mentee_id,
+                    "quota_type": "interview",
+                    "kind": kind,
+                    "amount": amount,
+                    "idempotency_key": key,
+                    "reason": reason,
+                    "ref_id": ref_id,
+                    "actor_id": None,
+                    "created_at": self.now
+                })
+            if booked or total != server.BUILTIN_PLANS[plan_id]["interview_quota_total"]:
+                updates.append(UpdateOne({"id": mentee_id}, {"$set": {
+                    "interview_quota_total": total,
+                    "interview_quota_remaining": total - len(booked)
+                }}))
+        for start in range(0, len(updates), self.args.batch_size):
+            await db.users.bulk_write(updates[start:start + self.args.batch_size], ordered=False)
+        self.counts["quota_ledger"] = await ledger.close()
+
+    async def generate_orders(self):
+        orders = self.writer("orders")
+        founding = 0
+
+        def order(name, email, plan_id, status):
+            return {
+                "id": str(uuid.uuid4()),
+                "razorpay_order_id": f"order_{uuid.uuid4().hex[:14]}",
+                "name": name,
+                "email": email,
+                "password": None,
+                "plan_id": plan_id,
+                "plan_name": server.BUILTIN_PLANS[plan_id]["name"],
+                "amount": server.BUILTIN_PLANS[plan_id]["price"],
+                "currency": "INR",
+                "current_role": self.rng.choice(ROLES),
+                "target_role": self.rng.choice(ROLES),
+                "timeline": "",
+                "struggle": "",
+                "status": status,
+                "is_upgrade": False,
+                "is_founding_batch": False,
+                "created_at": self.past(self.args.days).isoformat()
+            }
+
+        paid = self.paid_mentees[:self.args.orders]
+        for _, name, email, plan_id in paid:
+            doc = order(name, email, plan_id, "paid")
+            doc["razorpay_payment_id"] = f"pay_{uuid.uuid4().hex[:14]}"
+            doc["paid_at"] = doc["created_at"]
+            if founding < server.FOUNDING_SLOTS_TOTAL:
+                doc["is_founding_batch"] = True
+                founding += 1
+            await orders.add(doc)
+        # Abandoned and failed checkouts, mostly from free users
+        for _ in range(max(0, self.args.orders - len(paid))):
+            _, name, email, _ = self.rng.choice(self.mentees)
+            await orders.add(order(name, email, self.rng.choice(PAID_PLANS), self.rng.choice(["pending", "pending", "failed"])))
+        self.counts["orders"] = await orders.close()
+        await server.backfill_founding_counter()
+
+    async def generate_notifications(self):
+        """Zipf-like spread over users (a few very active ones), each capped at the retention limit"""
+        args = self.args
+        recipients = [mentee[0] for mentee in self.mentees] + [mentor[0] for mentor in self.mentors]
+        if not recipients or not args.notifications:
+            self.counts["notifications"] = 0
+            return
+        weights = [1 / (rank + 1) ** 0.8 for rank in range(len(recipients))]
+        self.rng.shuffle(recipients)
+        per_user = {}
+        for user_id in self.rng.choices(recipients, weights, k=args.notifications):
+            per_user[user_id] = per_user.get(user_id, 0) + 1
+
+        notifications = self.writer("notifications")
+        counters = []
+        for user_id, count in per_user.items():
+            count = min(count, server.NOTIFICATION_USER_CAP)
+            unread = 0
+            for _ in range(count):
+                created = self.past(min(args.days, server.NOTIFICATION_ARCHIVE_AFTER_DAYS))
+                age_days = (self.now - created).days
+                # Older notifications are far more likely to have been read
+                read = self.rng.random() < min(0.95, 0.3 + age_days / 10)
+                kind = self.rng.choice(NOTIFICATION_TYPES)
+                doc = {
+                    "id": str(uuid.uuid4()),
+                    "user_id": user_id,
+                    "type": kind,
+                    "title": kind.replace("_", " ").title(),
+                    "message": f"Synthetic {kind.replace('_', ' ')} notification",
+                    "read": read,
+                    "created_at": created.isoformat()
+                }
+                if read:
+                    doc["read_at"] = created + timedelta(hours=self.rng.randint(1, 48))
+                else:
+                    unread += 1
+                await notifications.add(doc)
+            counters.append({"_id": user_id, "unread": unread, "total": count})
+        self.counts["notifications"] = await notifications.close()
+        for start in range(0, len(counters), args.batch_size):
+            await db.notification_counters.insert_many(counters[start:start + args.batch_size], ordered=False)
+
+
+async def main(args):
+    existing = await db.list_collection_names()
+    if existing and not args.drop:
+        raise SystemExit(f"Database {os.environ['DB_NAME']} is not empty ({len(existing)} collections); pass --drop to replace it")
+    await server.client.drop_database(os.environ["DB_NAME"])
+
+    print(f"Generating into {os.environ['DB_NAME']} (batch {args.batch_size}, {args.concurrency} in flight)")
+    started = time.perf_counter()
+    generator = Generator(args)
+    await generator.run()
+
+    index_started = time.perf_counter()
+    await server.ensure_indexes()
+    print(f"  {'indexes':<40} {time.perf_counter() - index_started:>8.1f}s")
+
+    elapsed = time.perf_counter() - started
+    total = sum(generator.counts.values())
+    print(f"\nWrote {total:,} documents in {elapsed:.1f}s ({total / elapsed:,.0f} docs/s)")
+    for name, count in generator.counts.items():
+        print(f"  {name:<16} {count:>12,}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--users", type=int, default=10000, help="total accounts (admin + mentors + mentees)")
+    parser.add_argument("--mentors", type=int, help="mentor accounts (default: 2%% of --users)")
+    parser.add_argument("--paid-ratio", type=float, default=0.3, help="share of mentees on a paid plan")
+    parser.add_argument("--companies", type=int, default=40, help="target companies")
+    parser.add_argument("--slots", type=int, default=5000, help="open future slots (booked slots come with bookings)")
+    parser.add_argument("--bookings", type=int, default=50000, help="bookings, each with its own slot")
+    parser.add_argument("--upcoming-ratio", type=float, default=0.05, help="share of bookings in the next two weeks")
+    parser.add_argument("--notifications", type=int, default=200000, help="notifications (before the per-user cap)")
+    parser.add_argument("--orders", type=int, default=20000, help="orders: one paid per paid mentee, the rest pending/failed")
+    parser.add_argument("--days", type=int, default=365, help="history window for past bookings, orders and sign-ups")
+    parser.add_argument("--batch-size", type=int, default=5000, help="documents per insert_many")
+    parser.add_argument("--concurrency", type=int, default=8, help="insert_many batches in flight")
+    parser.add_argument("--password", default="Scale@123", help="password for every generated account")
+    parser.add_argument("--seed", type=int, default=42, help="random seed")
+    parser.add_argument("--drop", action="store_true", help="drop the target database first if it has data")
+    args = parser.parse_args()
+    if args.mentors is None:
+        args.mentors = max(1, args.users // 50)
+
+    asyncio.run(main(args))
@@ -1,5 +1,7 @@
-from fastapi import FastAPI, APIRouter, HTTPException, Depends, Response, File, UploadFile, Form
+from fastapi import FastAPI, APIRouter, HTTPException, Depends, Request, Response, File, UploadFile, Form
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import StreamingResponse
 from dotenv import load_dotenv
 from starlette.middleware.cors import CORSMiddleware
 from motor.motor_asyncio import AsyncIOMotorClient
@@ -9,6 +11,10 @@ from pathlib import Path
 from pydantic import BaseModel, Field, EmailStr
 from typing import List, Optional
 import uuid
+import math
+import functools
+import json
+import time
 from datetime import datetime, timezone, timedelta
 import jwt
 from passlib.context import CryptContext
@@ -17,21 +23,344 @@ import hmac
 import hashlib
 import resend
 import asyncio
+import bisect
+import contextlib
+import contextvars
+import threading
+from collections import OrderedDict, deque
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
 from apscheduler.triggers.cron import CronTrigger
+from apscheduler.triggers.interval import IntervalTrigger
+from pymongo import ASCENDING, DESCENDING, ReturnDocument, monitoring
+from pymongo.errors import CollectionInvalid, DuplicateKeyError, OperationFailure
 
 ROOT_DIR = Path(__file__).parent
 load_dotenv(ROOT_DIR / '.env')
 
+# ============ METRICS ============
+# Prometheus text-format metrics for this worker, kept in plain dicts so the
+# per-request cost is a few dict and list updates. Requests are labelled by
+# route template (FastAPI puts the matched route in scope["route"]), never the
+# raw path; requests that match no route share the "unmatched" label.
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+LOOP_LAG_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0)
+POOL_WAIT_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.5, 1.0)
+METRICS_SAMPLE_SECONDS = 0.5
+METRICS_TOKEN = os.environ.get('METRICS_TOKEN')
+
+class Histogram:
+    """Fixed-bucket histogram; counts[i] is the number of observations <= buckets[i] (last slot +Inf)"""
+    __slots__ = ("buckets", "counts", "sum", "count")
+    
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+    
+    def observe(self, value: float):
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+def metric_labels(**labels) -> str:
+    if not labels:
+        return ""
+    escaped = (str(v).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n") for v in labels.values())
+    return "{" + ",".join(f'{k}="{v}"' for k, v in zip(labels, escaped)) + "}"
+
+def render_histogram(lines: list, name: str, histogram: Histogram, **labels):
+    cumulative = 0
+    for bound, count in zip(histogram.buckets + ("+Inf",), histogram.counts):
+        cumulative += count
+        lines.append(f"{name}_bucket{metric_labels(**labels, le=bound)} {cumulative}")
+    lines.append(f"{name}_sum{metric_labels(**labels)} {histogram.sum}")
+    lines.append(f"{name}_count{metric_labels(**labels)} {histogram.count}")
+
+class Metrics:
+    def __init__(self):
+        self.requests = {}   # (method, route, status) -> count
+        self.errors = {}     # (method, route) -> count
+        self.latency = {}    # (method, route) -> Histogram
+        self.in_flight = 0
+        self.loop_lag = Histogram(LOOP_LAG_BUCKETS)
+        self.loop_lag_last = 0.0
+        self.pool_wait = Histogram(POOL_WAIT_BUCKETS)
+        self.pool_checkout_failures = 0
+        self._pool_lock = threading.Lock()  # pool events arrive on Motor's executor threads
+        self.db_commands = {}         # (method, route) -> Mongo commands issued
+        self.db_seconds = {}          # (method, route) -> time spent in them
+        self.budget_exceeded = {}     # (method, route) -> requests over MONGO_QUERY_BUDGET
+    
+    def observe_request(self, method: str, route: str, status: int, seconds: float):
+        key = (method, route, status)
+        self.requests[key] = self.requests.get(key, 0) + 1
+        key = (method, route)
+        histogram = self.latency.get(key)
+        if histogram is None:
+            histogram = self.latency[key] = Histogram(LATENCY_BUCKETS)
+        histogram.observe(seconds)
+        if status >= 500:
+            self.errors[key] = self.errors.get(key, 0) + 1
+    
+    def observe_pool_wait(self, seconds: float):
+        with self._pool_lock:
+            self.pool_wait.observe(seconds)
+    
+    def render(self) -> str:
+        lines = [
+            "# HELP http_requests_total Requests by method, route template and status",
+            "# TYPE http_requests_total counter"
+        ]
+        for (method, route, status), count in sorted(self.requests.items()):
+            lines.append(f"http_requests_total{metric_labels(method=method, route=route, status=status)} {count}")
+        lines += ["# HELP http_request_errors_total Requests that failed with a 5xx or an exception",
+                  "# TYPE http_request_errors_total counter"]
+        for (method, route), count in sorted(self.errors.items()):
+            lines.append(f"http_request_errors_total{metric_labels(method=method, route=route)} {count}")
+        lines += ["# HELP http_request_duration_seconds Time until the response completed",
+                  "# TYPE http_request_duration_seconds histogram"]
+        for (method, route), histogram in sorted(self.latency.items()):
+            render_histogram(lines, "http_request_duration_seconds", histogram, method=method, route=route)
+        lines += ["# HELP mongo_commands_total Mongo commands issued while serving each route",
+                  "# TYPE mongo_commands_total counter"]
+        for (method, route), count in sorted(self.db_commands.items()):
+            lines.append(f"mongo_commands_total{metric_labels(method=method, route=route)} {count}")
+        lines += ["# TYPE mongo_command_seconds_total counter"]
+        for (method, route), seconds in sorted(self.db_seconds.items()):
+            lines.append(f"mongo_command_seconds_total{metric_labels(method=method, route=route)} {seconds}")
+        lines += ["# HELP mongo_query_budget_exceeded_total Requests that issued more than MONGO_QUERY_BUDGET commands",
+                  "# TYPE mongo_query_budget_exceeded_total counter"]
+        for (method, route), count in sorted(self.budget_exceeded.items()):
+            lines.append(f"mongo_query_budget_exceeded_total{metric_labels(method=method, route=route)} {count}")
+        lines += ["# HELP http_requests_in_flight Requests currently being served",
+                  "# TYPE http_requests_in_flight gauge",
+                  f"http_requests_in_flight {self.in_flight}",
+                  "# HELP event_loop_lag_seconds How late the loop woke a sleeping sampler",
+                  "# TYPE event_loop_lag_seconds histogram"]
+        render_histogram(lines, "event_loop_lag_seconds", self.loop_lag)
+        lines += ["# TYPE event_loop_lag_last_seconds gauge",
+                  f"event_loop_lag_last_seconds {self.loop_lag_last}",
+                  "# HELP mongo_pool_checkout_wait_seconds Time spent waiting for a pooled connection",
+                  "# TYPE mongo_pool_checkout_wait_seconds histogram"]
+        with self._pool_lock:
+            render_histogram(lines, "mongo_pool_checkout_wait_seconds", self.pool_wait)
+        lines += ["# TYPE mongo_pool_checkout_failures_total counter",
+                  f"mongo_pool_checkout_failures_total {self.pool_checkout_failures}",
+                  "# HELP executor_queue_depth Work items waiting for a thread",
+                  "# TYPE executor_queue_depth gauge"]
+        for name, executor in metric_executors().items():
+            queue = getattr(executor, "_work_queue", None)
+            if queue is not None:
+                lines.append(f"executor_queue_depth{metric_labels(executor=name)} {queue.qsize()}")
+        lines += ["# HELP asyncio_tasks Tasks alive on the event loop (requests, streams, background work)",
+                  "# TYPE asyncio_tasks gauge",
+                  f"asyncio_tasks {len(asyncio.all_tasks())}"]
+        return "\n".join(lines) + "\n"
+
+def metric_executors() -> dict:
+    """The default executor (asyncio.to_thread: emails, Razorpay) and Motor's I/O executor"""
+    executors = {"default": getattr(asyncio.get_running_loop(), "_default_executor", None)}
+    try:
+        from motor.frameworks import asyncio as motor_asyncio
+        executors["motor"] = getattr(motor_asyncio, "_EXECUTOR", None)
+    except ImportError:
+        pass
+    return {name: executor for name, executor in executors.items() if executor is not None}
+
+metrics = Metrics()
+
+class PoolWaitListener(monitoring.ConnectionPoolListener):
+    """
+    Times connection checkouts. Motor runs each operation on an executor thread,
+    so the started/checked-out pair of one checkout is matched through a thread-local.
+    """
+    
+    def __init__(self):
+        self._local = threading.local()
+    
+    def connection_check_out_started(self, event):
+        self._local.started = time.perf_counter()
+    
+    def connection_checked_out(self, event):
+        started = getattr(self._local, "started", None)
+        if started is not None:
+            self._local.started = None
+            metrics.observe_pool_wait(time.perf_counter() - started)
+    
+    def connection_check_out_failed(self, event):
+        self._local.started = None
+        metrics.pool_checkout_failures += 1
+    
+    # The remaining pool events aren't measured
+    def pool_created(self, event): pass
+    def pool_ready(self, event): pass
+    def pool_cleared(self, event): pass
+    def pool_closed(self, event): pass
+    def connection_created(self, event): pass
+    def connection_ready(self, event): pass
+    def connection_closed(self, event): pass
+    def connection_checked_in(self, event): pass
+
+class MetricsMiddleware:
+    """Pure ASGI middleware (no BaseHTTPMiddleware task/stream overhead) recording every HTTP request"""
+    
+    def __init__(self, app):
+        self.app = app
+    
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+        
+        status = None
+        
+        async def send_with_status(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+        
+        metrics.in_flight += 1
+        query_stats = QueryStats()
+        token = current_query_stats.set(query_stats)
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            # An exception before the response started is a 500; a stream cut off later keeps its status
+            metrics.in_flight -= 1
+            current_query_stats.reset(token)
+            route = scope.get("route")
+            route = route.path if route is not None else "unmatched"
+            metrics.observe_request(scope["method"], route, status or 500, time.perf_counter() - started)
+            if query_stats.count:
+                check_query_budget(scope["method"], route, query_stats)
+
+async def sample_event_loop_lag():
+    """Sleep for a fixed interval and record how late the loop woke us"""
+    while True:
+        started = time.perf_counter()
+        await asyncio.sleep(METRICS_SAMPLE_SECONDS)
+        lag = max(0.0, time.perf_counter() - started - METRICS_SAMPLE_SECONDS)
+        metrics.loop_lag_last = lag
+        metrics.loop_lag.observe(lag)
+
+metrics_sampler = {"task": None}
+
+# ============ QUERY MONITORING ============
+# A pymongo CommandListener attributes every command to the request being served
+# through a contextvar (Motor copies the context onto its executor threads). Each
+# request gets a count and total time per route, slow commands are logged with
+# their filter, and requests over MONGO_QUERY_BUDGET commands - or repeating one
+# query shape MONGO_REPEAT_THRESHOLD times, the usual N+1 loop - are logged too.
+MONGO_QUERY_BUDGET = int(os.environ.get('MONGO_QUERY_BUDGET', '30'))
+MONGO_REPEAT_THRESHOLD = int(os.environ.get('MONGO_REPEAT_THRESHOLD', '10'))
+MONGO_SLOW_COMMAND_MS = float(os.environ.get('MONGO_SLOW_COMMAND_MS', '100'))
+UNMONITORED_COMMANDS = {"hello", "ismaster", "isMaster", "ping", "saslStart", "saslContinue", "endSessions", "killCursors"}
+
+class QueryStats:
+    """Mongo commands issued on behalf of one request (or one track_queries block)"""
+    
+    def __init__(self):
+        self.count = 0
+        self.total_ms = 0.0
+        self.shapes = {}  # (command, collection, filter keys) -> count
+        self._lock = threading.Lock()
+    
+    def record(self, shape: tuple, duration_ms: float):
+        with self._lock:
+            self.count += 1
+            self.total_ms += duration_ms
+            self.shapes[shape] = self.shapes.get(shape, 0) + 1
+    
+    def repeated(self, threshold: int) -> list:
+        return sorted(((shape, n) for shape, n in self.shapes.items() if n >= threshold), key=lambda item: -item[1])
+    
+    def summary(self) -> str:
+        top = sorted(self.shapes.items(), key=lambda item: -item[1])[:5]
+        shapes = ", ".join(f"{name} {collection} by {list(keys)} x{n}" for (name, collection, keys), n in top)
+        return f"{self.count} commands in {self.total_ms:.1f}ms ({shapes})"
+
+current_query_stats = contextvars.ContextVar("current_query_stats", default=None)
+
+@contextlib.contextmanager
+def track_queries():
+    """Attribute the commands issued inside the block to a fresh QueryStats (tests, scripts)"""
+    stats = QueryStats()
+    token = current_query_stats.set(stats)
+    try:
+        yield stats
+    finally:
+        current_query_stats.reset(token)
+
+def command_filter(command_name: str, command: dict):
+    """The query part of a command, for shapes and slow-command logs"""
+    if command_name == "find":
+        return command.get("filter")
+    if command_name in ("count", "distinct", "findAndModify"):
+        return command.get("query")
+    if command_name in ("update", "delete"):
+        statements = command.get("updates" if command_name == "update" else "deletes") or [{}]
+        return statements[0].get("q")
+    if command_name == "aggregate":
+        pipeline = command.get("pipeline") or [{}]
+        return pipeline[0].get("$match")
+    return None
+
+class QueryMonitor(monitoring.CommandListener):
+    def __init__(self):
+        self._pending = {}
+    
+    def started(self, event):
+        if event.command_name in UNMONITORED_COMMANDS:
+            return
+        collection = event.command.get(event.command_name)
+        query_filter = command_filter(event.command_name, event.command)
+        self._pending[(event.connection_id, event.request_id)] = (
+            current_query_stats.get(), event.command_name, collection, query_filter
+        )
+    
+    def succeeded(self, event):
+        self._finish(event)
+    
+    def failed(self, event):
+        self._finish(event)
+    
+    def _finish(self, event):
+        pending = self._pending.pop((event.connection_id, event.request_id), None)
+        if pending is None:
+            return
+        stats, command_name, collection, query_filter = pending
+        duration_ms = event.duration_micros / 1000
+        if stats is not None:
+            keys = tuple(sorted(query_filter)) if isinstance(query_filter, dict) else ()
+            stats.record((command_name, str(collection), keys), duration_ms)
+        if duration_ms >= MONGO_SLOW_COMMAND_MS:
+            logger.warning(
+                f"Slow Mongo command: {command_name} {collection} took {duration_ms:.1f}ms "
+                f"filter={json.dumps(query_filter, default=str)[:500]}"
+            )
+
+def check_query_budget(method: str, route: str, stats: QueryStats):
+    key = (method, route)
+    metrics.db_commands[key] = metrics.db_commands.get(key, 0) + stats.count
+    metrics.db_seconds[key] = metrics.db_seconds.get(key, 0.0) + stats.total_ms / 1000
+    if stats.count > MONGO_QUERY_BUDGET:
+        metrics.budget_exceeded[key] = metrics.budget_exceeded.get(key, 0) + 1
+        logger.warning(f"Query budget exceeded: {method} {route} issued {stats.summary()} (budget {MONGO_QUERY_BUDGET})")
+    for (command_name, collection, keys), n in stats.repeated(MONGO_REPEAT_THRESHOLD):
+        logger.warning(f"Possible N+1: {method} {route} ran {command_name} on {collection} by {list(keys)} {n} times")
+
 # MongoDB connection
 mongo_url = os.environ['MONGO_URL']
-client = AsyncIOMotorClient(mongo_url)
+client = AsyncIOMotorClient(mongo_url, event_listeners=[PoolWaitListener(), QueryMonitor()])
 db = client[os.environ['DB_NAME']]
 
 # JWT Config
 SECRET_KEY = os.environ.get('JWT_SECRET', 'codementee-secret-key-2025')
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_HOURS = 24
+STREAM_TOKEN_EXPIRE_SECONDS = 60
 
 # Razorpay Config
 RAZORPAY_KEY_ID = os.environ.get('RAZORPAY_KEY_ID')
@@ -172,6 +501,8 @@ class PricingPlan(BaseModel):
     duration_months: int
     features: List[str] = []
     limits: dict = {}  # Usage limits for the plan
+    interview_quota_total: Optional[int] = None  # Defaults to the built-in plan / starter tier
+    plan_features: Optional[dict] = None
     is_active: bool = True
     display_order: int = 1
     created_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
@@ -184,6 +515,8 @@ class PricingPlanCreate(BaseModel):
     duration_months: int
     features: List[str] = []
     limits: dict = {}
+    interview_quota_total: Optional[int] = None
+    plan_features: Optional[dict] = None
     is_active: bool = True
     display_order: int = 1
 
@@ -193,6 +526,8 @@ class PricingPlanUpdate(BaseModel):
     duration_months: Optional[int] = None
     features: Optional[List[str]] = None
     limits: Optional[dict] = None
+    interview_quota_total: Optional[int] = None
+    plan_features: Optional[dict] = None
     is_active: Optional[bool] = None
     display_order: Optional[int] = None
 
@@ -246,6 +581,19 @@ class MentorSlotUpdate(BaseModel):
     company_specializations: Optional[List[str]] = None
     preparation_notes: Optional[str] = None
 
+class AvailabilityTemplateCreate(BaseModel):
+    weekdays: List[int]  # 0 = Monday ... 6 = Sunday
+    start_time: str  # HH:MM - start of the daily window
+    end_time: str  # HH:MM - end of the daily window
+    slot_duration_minutes: int = Field(60, gt=0, le=24 * 60)  # Window is split into back-to-back slots of this length
+    start_date: Optional[str] = None  # YYYY-MM-DD, defaults to today
+    weeks: Optional[int] = None  # None = repeat indefinitely (rolling horizon)
+    meeting_link: str
+    interview_types: List[str]
+    experience_levels: List[str]
+    company_specializations: List[str] = []
+    preparation_notes: Optional[str] = None
+
 class MentorSlotResponse(BaseModel):
     id: str
     mentor_id: str
@@ -377,6 +725,25 @@ class BugReportCreate(BaseModel):
     user_email: Optional[str] = None
     user_role: Optional[str] = None
 
+# ============ SLOT INTEREST MODELS ============
+class SlotInterestUpdate(BaseModel):
+    # Empty lists match any value
+    interview_types: List[str] = []
+    experience_levels: List[str] = []
+    company_ids: List[str] = []
+    date_from: Optional[str] = None
+    date_to: Optional[str] = None
+    waitlist: bool = False  # hold a matching new slot for me if I'm first in line
+
+# ============ BROADCAST MODELS ============
+class BroadcastCreate(BaseModel):
+    title: str
+    message: str
+    # Audience filters; an empty list means everyone
+    roles: List[str] = []
+    plans: List[str] = []
+    statuses: List[str] = []
+
 # ============ HELPERS ============
 def hash_password(password: str) -> str:
     return pwd_context.hash(password)
@@ -384,14 +751,26 @@ def hash_password(password: str) -> str:
 def verify_password(plain: str, hashed: str) -> bool:
     return pwd_context.verify(plain, hashed)
 
+def is_paid_mentee(user: dict) -> bool:
+    """Mentee on a paid plan (payment verification sets status "Active" with the plan)"""
+    return bool(user.get("plan_id")) and (user.get("status") or "").lower() == "active"
+
 def create_token(user_id: str, role: str) -> str:
     expire = datetime.now(timezone.utc) + timedelta(hours=ACCESS_TOKEN_EXPIRE_HOURS)
     payload = {"sub": user_id, "role": role, "exp": expire}
     return jwt.encode(payload, SECRET_KEY, algorithm=ALGORITHM)
 
-async def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(security)):
+def create_stream_token(user_id: str, role: str) -> str:
+    """Short-lived token for opening event streams, which have to carry it in the URL"""
+    expire = datetime.now(timezone.utc) + timedelta(seconds=STREAM_TOKEN_EXPIRE_SECONDS)
+    payload = {"sub": user_id, "role": role, "exp": expire, "scope": "stream"}
+    return jwt.encode(payload, SECRET_KEY, algorithm=ALGORITHM)
+
+async def user_from_token(token: str, scope: Optional[str] = None):
     try:
-        payload = jwt.decode(credentials.credentials, SECRET_KEY, algorithms=[ALGORITHM])
+        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+        if payload.get("scope") != scope:
+            raise HTTPException(status_code=401, detail="Invalid token")
         user_id = payload.get("sub")
         user = await db.users.find_one({"id": user_id})
         if not user:
@@ -402,6 +781,16 @@ async def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(s
     except:
         raise HTTPException(status_code=401, detail="Invalid token")
 
+async def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(security)):
+    return await user_from_token(credentials.credentials)
+
+async def get_stream_user(token: str):
+    """
+    EventSource can't send headers, so streams take ?token=. Only stream tokens from
+    POST /auth/stream-token are accepted there, so access logs never hold a login token.
+    """
+    return await user_from_token(token, scope="stream")
+
 def serialize_doc(doc):
     if doc and '_id' in doc:
         del doc['_id']
@@ -409,6 +798,1084 @@ def serialize_doc(doc):
         del doc['password']
     return doc
 
+# ============ TRANSACTIONS ============
+_transactions_supported = None
+
+async def transactions_supported() -> bool:
+    """Multi-document transactions need a replica set or mongos (checked once)"""
+    global _transactions_supported
+    if _transactions_supported is None:
+        try:
+            hello = await client.admin.command("hello")
+            _transactions_supported = bool(hello.get("setName") or hello.get("msg") == "isdbgrid")
+        except Exception as e:
+            logger.warning(f"Could not determine MongoDB topology: {str(e)}")
+            _transactions_supported = False
+        if not _transactions_supported:
+            logger.warning("MongoDB is not a replica set - running transactional writes without a transaction")
+    return _transactions_supported
+
+async def run_in_transaction(callback):
+    """
+    Run `callback(session)` inside a multi-document transaction, retrying on
+    transient errors. On a standalone mongod (local dev) the callback is called
+    with session=None and is responsible for undoing partial writes.
+    """
+    if not await transactions_supported():
+        return await callback(None)
+    async with await client.start_session() as session:
+        return await session.with_transaction(callback)
+
+# ============ READ CACHES ============
+# Per-worker caches for hot, rarely-changing reads. Entries expire after a TTL,
+# the least recently used entry is evicted past maxsize, and concurrent misses
+# for the same key share one load. Write routes drop entries by tag; other
+# workers converge within the TTL.
+READ_CACHES = {}
+
+class AsyncTTLCache:
+    """TTL + LRU cache for async loaders with single-flight coalescing"""
+    
+    def __init__(self, name: str, ttl: float, maxsize: int = 256, tags=()):
+        self.name = name
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self.tags = set(tags)
+        self._entries = OrderedDict()  # key -> (expires_at, value)
+        self._inflight = {}            # key -> asyncio.Task
+        self._generation = 0
+        self.stats = {"hits": 0, "misses": 0, "coalesced": 0, "evictions": 0, "invalidations": 0, "errors": 0}
+    
+    async def get_or_load(self, key, loader):
+        entry = self._entries.get(key)
+        if entry and entry[0] > time.monotonic():
+            self._entries.move_to_end(key)
+            self.stats["hits"] += 1
+            return entry[1]
+        
+        task = self._inflight.get(key)
+        if task:
+            self.stats["coalesced"] += 1
+        else:
+            self.stats["misses"] += 1
+            task = asyncio.create_task(self._load(key, loader, self._generation))
+            self._inflight[key] = task
+        # Shielded so a disconnecting caller doesn't cancel the load for everyone waiting on it
+        return await asyncio.shield(task)
+    
+    async def _load(self, key, loader, generation):
+        try:
+            value = await loader()
+        except Exception:
+            self.stats["errors"] += 1
+            raise
+        finally:
+            if self._inflight.get(key) is asyncio.current_task():
+                del self._inflight[key]
+        # A write that landed while we were loading makes this result stale
+        if generation == self._generation:
+            self._entries[key] = (time.monotonic() + self.ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.stats["evictions"] += 1
+        return value
+    
+    def clear(self):
+        self._generation += 1
+        self._entries.clear()
+        self._inflight.clear()
+        self.stats["invalidations"] += 1
+    
+    def snapshot(self) -> dict:
+        lookups = self.stats["hits"] + self.stats["misses"] + self.stats["coalesced"]
+        return {
+            "name": self.name,
+            "ttl_seconds": self.ttl,
+            "maxsize": self.maxsize,
+            "size": len(self._entries),
+            "inflight": len(self._inflight),
+            "tags": sorted(self.tags),
+            **self.stats,
+            "hit_rate": round((self.stats["hits"] + self.stats["coalesced"]) / lookups, 3) if lookups else None
+        }
+
+def cached(name: str, ttl: float, maxsize: int = 256, tags=()):
+    """Cache an async loader's result per argument tuple (callers must not mutate it)"""
+    cache = AsyncTTLCache(name, ttl, maxsize, tags)
+    READ_CACHES[name] = cache
+    
+    def decorator(func):
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            key = (args, tuple(sorted(kwargs.items())))
+            return await cache.get_or_load(key, lambda: func(*args, **kwargs))
+        wrapper.cache = cache
+        return wrapper
+    return decorator
+
+def invalidate_cache_tags(*tags):
+    """Drop every cache tagged with any of the given tags"""
+    for cache in READ_CACHES.values():
+        if cache.tags.intersection(tags):
+            cache.clear()
+
+# ============ CONDITIONAL GET ============
+# Polled reads are versioned per scope in cache_versions ("companies",
+# "notifications:<user_id>", ...). Writers bump the scope after their write
+# lands; readers build a weak ETag from the current versions and answer 304
+# before running the real query.
+def notifications_scope(user_id: str) -> str:
+    return f"notifications:{user_id}"
+
+async def bump_version(scope: str) -> int:
+    doc = await db.cache_versions.find_one_and_update(
+        {"_id": scope},
+        {"$inc": {"version": 1}, "$set": {"updated_at": datetime.now(timezone.utc)}},
+        upsert=True,
+        return_document=ReturnDocument.AFTER
+    )
+    return doc["version"]
+
+async def current_versions(*scopes: str) -> dict:
+    docs = await db.cache_versions.find({"_id": {"$in": list(scopes)}}).to_list(len(scopes))
+    versions = {doc["_id"]: doc["version"] for doc in docs}
+    return {scope: versions.get(scope, 0) for scope in scopes}
+
+def version_etag(versions: dict, *extra) -> str:
+    tag = "|".join([f"{scope}={version}" for scope, version in sorted(versions.items())] + [str(x) for x in extra])
+    return f'W/"{hashlib.sha1(tag.encode()).hexdigest()[:20]}"'
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """Weak comparison against If-None-Match (which may list several tags)"""
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    bare = etag.removeprefix("W/")
+    return any(candidate.strip().removeprefix("W/") == bare for candidate in header.split(","))
+
+def not_modified(request: Request, response: Response, etag: str, cache_control: str = "private, no-cache") -> Optional[Response]:
+    """Return a 304 if the client's copy is current, otherwise stamp the ETag on `response`"""
+    headers = {"ETag": etag, "Cache-Control": cache_control}
+    if etag_matches(request, etag):
+        return Response(status_code=304, headers=headers)
+    response.headers.update(headers)
+    return None
+
+async def check_versions(request: Request, response: Response, scopes: list, *extra,
+                         cache_control: str = "private, no-cache") -> Optional[Response]:
+    """Conditional GET for a response that depends only on `scopes` (plus `extra` inputs)"""
+    versions = await current_versions(*scopes)
+    return not_modified(request, response, version_etag(versions, *extra), cache_control)
+
+# ============ LIVE STREAMS ============
+# Server-sent events. Each worker fans messages out to its own subscribers
+# through an in-process hub. On a replica set, publishers insert into
+# live_events and every worker's change stream feeds its hub; on a standalone
+# mongod the hub is the broker, which is only correct with a single worker.
+LIVE_QUEUE_SIZE = 100
+LIVE_HEARTBEAT_SECONDS = 15
+LIVE_EVENTS_TTL_SECONDS = 3600
+
+class LiveHub:
+    """In-process pub/sub: channel -> subscriber queues"""
+    
+    def __init__(self):
+        self._subscribers = {}
+        self._routers = {}
+        self.stats = {"published": 0, "delivered": 0, "dropped": 0}
+    
+    def subscribe(self, channel: str, queue: asyncio.Queue = None) -> asyncio.Queue:
+        """Subscribe a new queue, or add `channel` to an existing subscriber's queue"""
+        queue = queue or asyncio.Queue(maxsize=LIVE_QUEUE_SIZE)
+        self._subscribers.setdefault(channel, set()).add(queue)
+        return queue
+    
+    def unsubscribe(self, channel: str, queue: asyncio.Queue):
+        queues = self._subscribers.get(channel)
+        if queues:
+            queues.discard(queue)
+            if not queues:
+                del self._subscribers[channel]
+    
+    def route(self, channel: str, router):
+        """Hand every message on `channel` to `router(message)` instead of plain channel subscribers"""
+        self._routers[channel] = router
+    
+    def deliver(self, queue: asyncio.Queue, message: dict):
+        if queue.full():
+            # A stalled client loses its oldest message rather than blocking everyone else
+            queue.get_nowait()
+            self.stats["dropped"] += 1
+        queue.put_nowait(message)
+        self.stats["delivered"] += 1
+    
+    def publish(self, channel: str, message: dict):
+        self.stats["published"] += 1
+        router = self._routers.get(channel)
+        if router:
+            router(message)
+            return
+        for queue in self._subscribers.get(channel, ()):
+            self.deliver(queue, message)
+    
+    def snapshot(self) -> dict:
+        return {
+            "channels": len(self._subscribers),
+            "subscribers": sum(len(queues) for queues in self._subscribers.values()),
+            **self.stats
+        }
+
+live_hub = LiveHub()
+live_broker = {"mode": "local", "task": None}
+
+async def publish_live(channel: str, event: str, data: dict, event_id=None):
+    """Push a message to every subscriber of `channel` on every worker"""
+    message = {"event": event, "data": jsonable_encoder(data), "id": event_id}
+    if live_broker["mode"] == "change_stream":
+        await db.live_events.insert_one({"channel": channel, **message, "created_at": datetime.now(timezone.utc)})
+    else:
+        live_hub.publish(channel, message)
+
+async def watch_live_events():
+    """Feed live_events inserts from any worker into this worker's hub"""
+    while True:
+        try:
+            async with db.live_events.watch([{"$match": {"operationType": "insert"}}]) as stream:
+                async for change in stream:
+                    doc = change["fullDocument"]
+                    live_hub.publish(doc["channel"], {"event": doc["event"], "data": doc["data"], "id": doc.get("id")})
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error(f"Live event change stream failed, reconnecting: {str(e)}")
+            await asyncio.sleep(5)
+
+async def start_live_broker():
+    if await transactions_supported():
+        live_broker["mode"] = "change_stream"
+        live_broker["task"] = asyncio.create_task(watch_live_events())
+        logger.info("Live streams fan out across workers via change streams")
+    else:
+        logger.warning("Live streams are in-process only (no replica set); run a single worker")
+
+def sse_message(event: str, data, event_id=None) -> str:
+    lines = [f"id: {event_id}"] if event_id is not None else []
+    lines += [f"event: {event}", f"data: {json.dumps(jsonable_encoder(data), separators=(',', ':'))}"]
+    return "\n".join(lines) + "\n\n"
+
+def sse_response(request: Request, channel: str, replay=None) -> StreamingResponse:
+    """
+    Stream `channel` to the client. `replay` is an optional async callable returning
+    messages to send first (e.g. what a reconnecting client missed); live messages
+    carrying an id it already sent are skipped.
+    """
+    # Subscribe before replaying, so nothing published in between is lost
+    queue = live_hub.subscribe(channel)
+    return sse_stream(request, queue, lambda: live_hub.unsubscribe(channel, queue), replay)
+
+def sse_stream(request: Request, queue: asyncio.Queue, close, replay=None) -> StreamingResponse:
+    """Stream messages from an already-subscribed `queue`; `close()` runs when the client goes away"""
+    async def stream():
+        try:
+            yield "retry: 5000\n\n"
+            # Only exact ids: live ids can arrive out of order, so a lower one may not have been
+            # replayed. sync/reset only carry a position, so the event with that id still goes out
+            replayed = set()
+            for message in (await replay() if replay else []):
+                if message.get("id") is not None and message["event"] not in ("sync", "reset"):
+                    replayed.add(message["id"])
+                yield sse_message(message["event"], message["data"], message.get("id"))
+            while not await request.is_disconnected():
+                try:
+                    message = await asyncio.wait_for(queue.get(), LIVE_HEARTBEAT_SECONDS)
+                except asyncio.TimeoutError:
+                    yield ": ping\n\n"
+                    continue
+                if message.get("id") is not None and message["id"] in replayed:
+                    continue
+                yield sse_message(message["event"], message["data"], message.get("id"))
+        finally:
+            close()
+    
+    return StreamingResponse(stream(), media_type="text/event-stream", headers={
+        "Cache-Control": "no-cache",
+        "X-Accel-Buffering": "no"
+    })
+
+def user_channel(user_id: str) -> str:
+    return f"user:{user_id}"
+
+# ============ SLOT AVAILABILITY STREAM ============
+# Mentees on the slot browser subscribe with the same filters as
+# /mentee/slots/browse. Every mentor_slots write that changes what browse would
+# return publishes a delta (slot_added, slot_booked, slot_released, slot_removed)
+# carrying the public view of the slot. Each worker routes deltas through an index
+# keyed by interview type, so a delta only visits subscribers filtering on one of
+# the slot's types (or on none) before the remaining filters are checked.
+SLOTS_CHANNEL = "slots"
+
+def public_slot(slot: dict) -> dict:
+    """The mentee-facing view of a slot (mentor identity hidden)"""
+    return {
+        "id": slot["id"],
+        "date": slot["date"],
+        "start_time": slot["start_time"],
+        "end_time": slot["end_time"],
+        "interview_types": slot["interview_types"],
+        "experience_levels": slot["experience_levels"],
+        "company_specializations": slot["company_specializations"],
+        "preparation_notes": slot.get("preparation_notes")
+    }
+
+class SlotSubscription:
+    """One slot browser's filters and its message queue"""
+    __slots__ = ("queue", "interview_type", "experience_level", "company_id", "date_from", "date_to")
+    
+    def __init__(self, interview_type=None, experience_level=None, company_id=None, date_from=None, date_to=None):
+        self.queue = asyncio.Queue(maxsize=LIVE_QUEUE_SIZE)
+        self.interview_type = interview_type
+        self.experience_level = experience_level
+        self.company_id = company_id
+        self.date_from = date_from
+        self.date_to = date_to
+    
+    def matches(self, slot: dict, today: str) -> bool:
+        """Same rules as the browse query; the interview type is already settled by the index"""
+        if slot["date"] < (self.date_from or today):
+            return False
+        if self.date_to and slot["date"] > self.date_to:
+            return False
+        if self.experience_level and self.experience_level not in slot["experience_levels"]:
+            return False
+        if self.company_id and self.company_id not in (slot["company_specializations"] or []):
+            return False
+        return True
+
+class SlotSubscriptionIndex:
+    """interview type (None = any type) -> subscriptions"""
+    
+    def __init__(self):
+        self._by_type = {}
+        self.stats = {"deltas": 0, "candidates": 0, "delivered": 0}
+    
+    def add(self, subscription: SlotSubscription):
+        self._by_type.setdefault(subscription.interview_type, set()).add(subscription)
+    
+    def remove(self, subscription: SlotSubscription):
+        subscriptions = self._by_type.get(subscription.interview_type)
+        if subscriptions:
+            subscriptions.discard(subscription)
+            if not subscriptions:
+                del self._by_type[subscription.interview_type]
+    
+    def route(self, message: dict):
+        slot = message["data"]["slot"]
+        today = datetime.now(timezone.utc).date().isoformat()
+        buckets = [self._by_type.get(None, ())] + [self._by_type.get(t, ()) for t in set(slot["interview_types"])]
+        self.stats["deltas"] += 1
+        for subscriptions in buckets:
+            self.stats["candidates"] += len(subscriptions)
+            for subscription in subscriptions:
+                if subscription.matches(slot, today):
+                    live_hub.deliver(subscription.queue, message)
+                    self.stats["delivered"] += 1
+    
+    def snapshot(self) -> dict:
+        return {
+            "subscribers": sum(len(subscriptions) for subscriptions in self._by_type.values()),
+            "interview_types": len(self._by_type),
+            **self.stats
+        }
+
+slot_index = SlotSubscriptionIndex()
+live_hub.route(SLOTS_CHANNEL, slot_index.route)
+
+async def publish_slot_changes(event: str, slots: list):
+    """Push an availability delta for each slot to matching slot-browser subscribers"""
+    for slot in slots:
+        await publish_live(SLOTS_CHANNEL, event, {"slot": public_slot(slot)})
+
+# ============ QUOTA LEDGER ============
+# Every quota change is an append-only entry in `quota_ledger` (opening, grant,
+# consume, refund, adjust) with a unique idempotency key. The user document
+# holds the materialized balance for each quota type and is updated in the same
+# transaction, so quota checks stay a single field read and the balances can be
+# audited and rebuilt from the ledger with one aggregation.
+QUOTA_BALANCE_FIELDS = {
+    "interview": "interview_quota_remaining",
+    "resume_review": "resume_review_quota"
+}
+
+class QuotaExhausted(Exception):
+    """Raised when a consume entry would drive a balance below zero"""
+    def __init__(self, quota_type: str):
+        super().__init__(f"{quota_type} quota exhausted")
+        self.quota_type = quota_type
+
+async def record_quota_entry(
+    user_id: str,
+    quota_type: str,
+    kind: str,
+    amount: int,
+    idempotency_key: str,
+    reason: str,
+    ref_id: str = None,
+    actor_id: str = None,
+    session=None
+) -> bool:
+    """
+    Append a ledger entry and apply `amount` to the cached balance.
+    Negative amounts only apply while the balance covers them (QuotaExhausted otherwise).
+    Returns False if an entry with the same idempotency key was already recorded.
+    Pass `session` to join an enclosing transaction.
+    """
+    field = QUOTA_BALANCE_FIELDS[quota_type]
+    now = datetime.now(timezone.utc)
+    entry = {
+        "id": str(uuid.uuid4()),
+        "user_id": user_id,
+        "quota_type": quota_type,
+        "kind": kind,  # opening, grant, consume, refund, adjust
+        "amount": amount,
+        "idempotency_key": idempotency_key,
+        "reason": reason,
+        "ref_id": ref_id,
+        "actor_id": actor_id,
+        "created_at": now
+    }
+    
+    async def apply(s):
+        if await db.quota_ledger.find_one({"idempotency_key": idempotency_key}, {"_id": 1}, session=s):
+            return False
+        
+        balance_filter = {"id": user_id}
+        if amount < 0:
+            balance_filter[field] = {"$gte": -amount}
+        result = await db.users.update_one(
+            balance_filter,
+            {"$inc": {field: amount}, "$set": {"updated_at": now}},
+            session=s
+        )
+        if result.matched_count == 0:
+            if await db.users.count_documents({"id": user_id}, session=s) == 0:
+                raise HTTPException(status_code=404, detail="User not found")
+            raise QuotaExhausted(quota_type)
+        
+        try:
+            await db.quota_ledger.insert_one(entry, session=s)
+        except DuplicateKeyError:
+            if s is not None:
+                raise
+            # Lost a race with an identical request - undo our balance change
+            await db.users.update_one({"id": user_id}, {"$inc": {field: -amount}})
+            return False
+        return True
+    
+    if session is not None:
+        return await apply(session)
+    return await run_in_transaction(apply)
+
+async def set_quota_balance(user_id: str, quota_type: str, target: int, idempotency_key: str, reason: str, ref_id: str = None, actor_id: str = None):
+    """Move a balance to an absolute value by recording the difference as an adjust entry"""
+    field = QUOTA_BALANCE_FIELDS[quota_type]
+    
+    async def apply(s):
+        user = await db.users.find_one({"id": user_id}, {"_id": 0, field: 1}, session=s)
+        if not user:
+            raise HTTPException(status_code=404, detail="User not found")
+        delta = target - (user.get(field) or 0)
+        if delta == 0:
+            return False
+        return await record_quota_entry(user_id, quota_type, "adjust", delta, idempotency_key, reason, ref_id, actor_id, session=s)
+    
+    return await run_in_transaction(apply)
+
+async def open_quota_ledger(user: dict, interview_balance: int = None):
+    """
+    Record opening entries for a user whose balances predate the ledger, so that
+    the ledger sum matches the cached balances. Resume-review usage used to be
+    counted from resume_requests on every submission; it is counted once here.
+    """
+    if user.get("quota_ledger_opened"):
+        return
+    
+    if interview_balance is None:
+        interview_balance = user.get("interview_quota_remaining") or 0
+    plan_reviews = (user.get("plan_features") or {}).get("resume_reviews", 0) or 0
+    used_reviews = await db.resume_requests.count_documents({
+        "mentee_id": user["id"],
+        "status": {"$ne": "cancelled"}
+    })
+    resume_balance = max(user.get("resume_review_quota") or 0, plan_reviews - used_reviews, 0)
+    now = datetime.now(timezone.utc)
+    
+    async def apply(s):
+        opened = await db.users.update_one(
+            {"id": user["id"], "quota_ledger_opened": {"$ne": True}},
+            {"$set": {
+                "interview_quota_remaining": interview_balance,
+                "resume_review_quota": resume_balance,
+                "quota_ledger_opened": True
+            }},
+            session=s
+        )
+        if opened.matched_count == 0:
+            return
+        await db.quota_ledger.insert_many([{
+            "id": str(uuid.uuid4()),
+            "user_id": user["id"],
+            "quota_type": quota_type,
+            "kind": "opening",
+            "amount": balance,
+            "idempotency_key": f"opening:{user['id']}:{quota_type}",
+            "reason": "Opening balance",
+            "ref_id": None,
+            "actor_id": None,
+            "created_at": now
+        } for quota_type, balance in [("interview", interview_balance), ("resume_review", resume_balance)]], session=s)
+    
+    await run_in_transaction(apply)
+    user["interview_quota_remaining"] = interview_balance
+    user["resume_review_quota"] = resume_balance
+    user["quota_ledger_opened"] = True
+
+async def backfill_quota_ledger():
+    """Open the ledger for mentees whose quota fields were set before it existed"""
+    users = db.users.find({
+        "role": "mentee",
+        "interview_quota_total": {"$exists": True},
+        "quota_ledger_opened": {"$ne": True}
+    })
+    opened = 0
+    async for user in users:
+        try:
+            await open_quota_ledger(user)
+            opened += 1
+        except Exception as e:
+            logger.error(f"Failed to open quota ledger for user {user.get('id')}: {str(e)}")
+    if opened:
+        logger.info(f"Opened quota ledger for {opened} users")
+
+def quota_balance_pipeline(user_id: str = None) -> list:
+    """Aggregation that sums the ledger into per-user balances for every quota type"""
+    pipeline = [{"$match": {"user_id": user_id}}] if user_id else []
+    pipeline.append({"$group": {
+        "_id": "$user_id",
+        **{
+            field: {"$sum": {"$cond": [{"$eq": ["$quota_type", quota_type]}, "$amount", 0]}}
+            for quota_type, field in QUOTA_BALANCE_FIELDS.items()
+        },
+        "entries": {"$sum": 1}
+    }})
+    return pipeline
+
+async def rebuild_quota_balances(user_id: str = None):
+    """Recompute cached balances from the ledger and write them back to users in one aggregation"""
+    pipeline = quota_balance_pipeline(user_id) + [
+        {"$project": {"_id": 0, "id": "$_id", **{field: 1 for field in QUOTA_BALANCE_FIELDS.values()}}},
+        {"$merge": {"into": "users", "on": "id", "whenMatched": "merge", "whenNotMatched": "discard"}}
+    ]
+    await db.quota_ledger.aggregate(pipeline).to_list(None)
+
+# ============ DOMAIN EVENTS ============
+# Request handlers commit state and record one event in the append-only
+# `domain_events` collection (inside the same transaction when there is one).
+# Subscribers - notifications, emails, job timers - run after the commit as
+# background tasks with bounded concurrency. Each event tracks which subscribers
+# have completed, and a sweeper re-dispatches events that didn't finish (crash,
+# restart, failing subscriber), so every subscriber sees each event at least once.
+# A dispatch holds a lease on the event (taken when it is recorded, and by the
+# sweeper's atomic claim), so a slow dispatch or a second worker's sweeper never
+# runs the same event twice at the same time.
+EVENT_DISPATCH_CONCURRENCY = 8
+EVENT_REDISPATCH_INTERVAL_SECONDS = 60
+EVENT_REDISPATCH_AFTER_SECONDS = 30
+EVENT_LEASE_SECONDS = 300
+EVENT_MAX_ATTEMPTS = 5
+
+EVENT_SUBSCRIBERS = {}
+_event_semaphore = None
+_event_tasks = set()
+
+def subscribe(event_type: str):
+    """Register an async `handler(event)` for an event type"""
+    def register(handler):
+        EVENT_SUBSCRIBERS.setdefault(event_type, []).append(handler)
+        return handler
+    return register
+
+async def next_sequence(name: str) -> int:
+    """Monotonic counter (allocated outside transactions so it never becomes a write hotspot inside one)"""
+    counter = await db.counters.find_one_and_update(
+        {"_id": name},
+        {"$inc": {"seq": 1}},
+        upsert=True,
+        return_document=ReturnDocument.AFTER
+    )
+    return counter["seq"]
+
+async def record_event(event_type: str, aggregate_id: str, payload: dict, session=None) -> dict:
+    """Append an event; pass `session` to write it in the same transaction as the state change"""
+    now = datetime.now(timezone.utc)
+    event = {
+        "id": str(uuid.uuid4()),
+        "seq": await next_sequence("domain_events"),
+        "type": event_type,
+        "aggregate_id": aggregate_id,
+        "payload": payload,
+        "status": "pending",  # pending -> dispatched / failed
+        "completed_subscribers": [],
+        # The recording worker dispatches right after the commit; it holds the first lease
+        "attempts": 1,
+        "lease_until": now + timedelta(seconds=EVENT_LEASE_SECONDS),
+        "created_at": now
+    }
+    await db.domain_events.insert_one(dict(event), session=session)
+    return event
+
+def dispatch_event_soon(event: dict):
+    """Run the event's subscribers in the background (call after the transaction committed)"""
+    task = asyncio.create_task(dispatch_event(event))
+    _event_tasks.add(task)
+    task.add_done_callback(_event_tasks.discard)
+
+async def publish_event(event_type: str, aggregate_id: str, payload: dict) -> dict:
+    """Record an event and dispatch it - for state changes that don't use a transaction"""
+    event = await record_event(event_type, aggregate_id, payload)
+    dispatch_event_soon(event)
+    return event
+
+async def dispatch_event(event: dict):
+    """Run every subscriber that hasn't completed for this event yet"""
+    global _event_semaphore
+    if _event_semaphore is None:
+        _event_semaphore = asyncio.Semaphore(EVENT_DISPATCH_CONCURRENCY)
+    
+    done = set(event.get("completed_subscribers", []))
+    failed = []
+    for handler in EVENT_SUBSCRIBERS.get(event["type"], []):
+        name = handler.__name__
+        if name in done:
+            continue
+        try:
+            async with _event_semaphore:
+                await handler(event)
+            # Progress renews the lease, so a long dispatch isn't mistaken for a stalled one
+            await db.domain_events.update_one(
+                {"id": event["id"]},
+                {
+                    "$addToSet": {"completed_subscribers": name},
+                    "$set": {"lease_until": datetime.now(timezone.utc) + timedelta(seconds=EVENT_LEASE_SECONDS)}
+                }
+            )
+        except Exception as e:
+            failed.append(name)
+            logger.error(f"Subscriber {name} failed for event {event['type']} {event['id']}: {str(e)}")
+    
+    now = datetime.now(timezone.utc)
+    if not failed:
+        await db.domain_events.update_one({"id": event["id"]}, {"$set": {"status": "dispatched", "dispatched_at": now}})
+        return
+    # Attempts are counted when the lease is taken; release it for a retry after the back-off
+    attempts = event.get("attempts", 1)
+    await db.domain_events.update_one(
+        {"id": event["id"]},
+        {"$set": {
+            "status": "failed" if attempts >= EVENT_MAX_ATTEMPTS else "pending",
+            "lease_until": now + timedelta(seconds=EVENT_REDISPATCH_AFTER_SECONDS),
+            "last_error": f"Failed subscribers: {', '.join(failed)}",
+            "updated_at": now
+        }}
+    )
+
+async def claim_pending_event():
+    """Atomically lease the oldest pending event whose previous lease ran out"""
+    now = datetime.now(timezone.utc)
+    return await db.domain_events.find_one_and_update(
+        {"status": "pending", "$or": [
+            {"lease_until": {"$lt": now}},
+            # Recorded before events carried a lease
+            {"lease_until": {"$exists": False}, "created_at": {"$lte": now - timedelta(seconds=EVENT_REDISPATCH_AFTER_SECONDS)}}
+        ]},
+        {
+            "$set": {"lease_until": now + timedelta(seconds=EVENT_LEASE_SECONDS), "updated_at": now},
+            "$inc": {"attempts": 1}
+        },
+        projection={"_id": 0},
+        sort=[("seq", ASCENDING)],
+        return_document=ReturnDocument.AFTER
+    )
+
+async def redispatch_pending_events():
+    """Scheduled job: retry events whose dispatch never finished"""
+    try:
+        redispatched = 0
+        while redispatched < 100:
+            event = await claim_pending_event()
+            if not event:
+                break
+            await dispatch_event(event)
+            redispatched += 1
+        if redispatched:
+            logger.info(f"Re-dispatched {redispatched} pending domain events")
+    except Exception as e:
+        logger.error(f"Error re-dispatching domain events: {str(e)}")
+
+async def create_notification(user_id: str, type: str, title: str, message: str, event_id: str = None, **extra):
+    """
+    Insert an in-app notification. With `event_id` the insert is idempotent per
+    (event, user), so re-dispatched events don't notify twice.
+    """
+    notification = {
+        "id": str(uuid.uuid4()),
+        "user_id": user_id,
+        "type": type,
+        "title": title,
+        "message": message,
+        "read": False,
+        "created_at": datetime.now(timezone.utc).isoformat(),
+        **extra
+    }
+    if event_id is None:
+        await db.notifications.insert_one(notification)
+        inserted = True
+    else:
+        notification["event_id"] = event_id
+        result = await db.notifications.update_one(
+            {"event_id": event_id, "user_id": user_id},
+            {"$setOnInsert": notification},
+            upsert=True
+        )
+        inserted = result.upserted_id is not None
+    if inserted:
+        counter = await db.notification_counters.find_one_and_update(
+            {"_id": user_id}, {"$inc": {"unread": 1, "total": 1}},
+            upsert=True, return_document=ReturnDocument.AFTER
+        )
+        if counter["total"] > NOTIFICATION_USER_CAP + NOTIFICATION_PRUNE_SLACK:
+            schedule_notification_prune(user_id)
+    await bump_version(notifications_scope(user_id))
+    if inserted:
+        await publish_live(user_channel(user_id), "notification", serialize_doc(dict(notification)))
+    return notification
+
+# ============ UNREAD NOTIFICATION COUNTERS ============
+# notification_counters holds one {_id: user_id, unread, total} document per user,
+# moved by the notification write paths so the bell's badge is a point read and
+# the retention cap can be checked without counting. Bulk zeroing and TTL expiry
+# can race with or bypass the counters; the reconciliation job heals drift.
+UNREAD_RECONCILE_INTERVAL_MINUTES = 15
+
+async def adjust_unread_count(user_id: str, delta: int):
+    await db.notification_counters.update_one({"_id": user_id}, {"$inc": {"unread": delta}}, upsert=True)
+
+async def reset_unread_count(user_id: str, total: int = None):
+    fields = {"unread": 0} if total is None else {"unread": 0, "total": total}
+    await db.notification_counters.update_one({"_id": user_id}, {"$set": fields}, upsert=True)
+
+async def seed_notification_counter(user_id: str) -> int:
+    """Count the user's notifications into a missing (or count-less) counter document; returns unread"""
+    unread = await db.notifications.count_documents({"user_id": user_id, "read": False})
+    total = await db.notifications.count_documents({"user_id": user_id})
+    try:
+        await db.notification_counters.update_one(
+            {"_id": user_id, "unread": {"$exists": False}},
+            {"$set": {"unread": unread, "total": total}},
+            upsert=True
+        )
+    except DuplicateKeyError:
+        pass  # Already seeded, or counting since it was created
+    return unread
+
+async def get_unread_count_for(user_id: str) -> int:
+    counter = await db.notification_counters.find_one({"_id": user_id})
+    if counter is None or "unread" not in counter:
+        # First read for this user: seed the counter from the notifications themselves
+        return await seed_notification_counter(user_id)
+    return max(0, counter.get("unread", 0))
+
+async def reconcile_unread_counts():
+    """
+    Recount unread and total notifications and correct any counter that drifted.
+    Notification writes insert the document before moving the counter, so a
+    mismatch seen in one snapshot may just be a write in flight: a counter is only
+    corrected when a fresh per-user recount, taken after re-reading the counter,
+    shows the same drift, and the compare-and-set then skips it if it moved since.
+    Users with no counter yet are left to the lazy seeding in get_unread_count_for.
+    """
+    try:
+        # The retention cap keeps the hot collection small enough to recount in one pass
+        actual = {
+            row["_id"]: {"unread": row["unread"], "total": row["total"]}
+            async for row in db.notifications.aggregate([
+                {"$group": {
+                    "_id": "$user_id",
+                    "unread": {"$sum": {"$cond": [{"$eq": ["$read", False]}, 1, 0]}},
+                    "total": {"$sum": 1}
+                }}
+            ])
+        }
+        fixed = 0
+        async for counter in db.notification_counters.find({"unread": {"$exists": True}}):
+            expected = actual.get(counter["_id"], {"unread": 0, "total": 0})
+            observed = {"unread": counter.get("unread"), "total": counter.get("total")}
+            if observed == expected:
+                continue
+            current = await db.notification_counters.find_one({"_id": counter["_id"]})
+            if not current or {"unread": current.get("unread"), "total": current.get("total")} != observed:
+                continue  # Moved since the snapshot: a write is in flight
+            recount = {
+                "unread": await db.notifications.count_documents({"user_id": counter["_id"], "read": False}),
+                "total": await db.notifications.count_documents({"user_id": counter["_id"]})
+            }
+            if recount != expected:
+                continue  # Notifications changed since the snapshot; look again next run
+            result = await db.notification_counters.update_one(
+                {"_id": counter["_id"], **observed}, {"$set": recount}
+            )
+            fixed += result.modified_count
+        if fixed:
+            logger.warning(f"Reconciled {fixed} drifted unread notification counters")
+        return {"fixed": fixed}
+    except Exception as e:
+        logger.error(f"Unread counter reconciliation failed: {str(e)}")
+
+# ============ NOTIFICATION RETENTION ============
+# The notifications collection is the hot working set behind the bell: read
+# notifications expire after NOTIFICATION_READ_TTL_DAYS (deleted by the retention
+# job, which also moves counters and list versions; a TTL index on read_at a day
+# later is the backstop), each user keeps at most
+# NOTIFICATION_USER_CAP, and anything past the cap or older than
+# NOTIFICATION_ARCHIVE_AFTER_DAYS moves to notification_archive as compact
+# entries (no message body) bucketed per user and month.
+NOTIFICATION_USER_CAP = int(os.environ.get('NOTIFICATION_USER_CAP', '200'))
+NOTIFICATION_PRUNE_SLACK = max(1, NOTIFICATION_USER_CAP // 10)  # prune in batches, not on every insert
+NOTIFICATION_READ_TTL_DAYS = int(os.environ.get('NOTIFICATION_READ_TTL_DAYS', '30'))
+NOTIFICATION_TTL_BACKSTOP_DAYS = 1
+NOTIFICATION_ARCHIVE_AFTER_DAYS = int(os.environ.get('NOTIFICATION_ARCHIVE_AFTER_DAYS', '90'))
+NOTIFICATION_ARCHIVE_BATCH = 1000
+NOTIFICATION_RETENTION_INTERVAL_MINUTES = 60
+
+_prune_tasks = {}  # user_id -> running prune task (one per user per worker)
+
+async def archive_notifications(notifications: list) -> int:
+    """
+    Copy notifications into their user/month archive buckets, then delete them
+    from the hot collection and take them off the owners' counters.
+    $addToSet keeps a retry after a partial failure (or a concurrent prune)
+    from archiving twice; counters only move by what this call's deletes removed.
+    """
+    if not notifications:
+        return 0
+    buckets = {}
+    for n in notifications:
+        month = str(n.get("created_at", ""))[:7] or "unknown"
+        buckets.setdefault((n["user_id"], month), []).append({
+            "id": n["id"],
+            "type": n.get("type"),
+            "title": n.get("title"),
+            "read": n.get("read", False),
+            "created_at": n.get("created_at")
+        })
+    for (user_id, month), entries in buckets.items():
+        await db.notification_archive.update_one(
+            {"_id": f"{user_id}:{month}"},
+            {"$setOnInsert": {"user_id": user_id, "month": month}, "$addToSet": {"entries": {"$each": entries}}},
+            upsert=True
+        )
+    
+    ids_by_user = {}
+    for n in notifications:
+        ids_by_user.setdefault(n["user_id"], []).append(n["id"])
+    deleted = 0
+    for user_id, ids in ids_by_user.items():
+        # deleted_count only covers what this call removed, so two archivers racing
+        # over the same ids can't both decrement; split by read state for unread
+        unread = await db.notifications.delete_many({"id": {"$in": ids}, "user_id": user_id, "read": False})
+        read = await db.notifications.delete_many({"id": {"$in": ids}, "user_id": user_id, "read": True})
+        removed = unread.deleted_count + read.deleted_count
+        if not removed:
+            continue
+        deleted += removed
+        await db.notification_counters.update_one(
+            {"_id": user_id, "unread": {"$exists": True}},
+            {"$inc": {"unread": -unread.deleted_count, "total": -removed}}
+        )
+        await bump_version(notifications_scope(user_id))
+    return deleted
+
+async def expire_read_notifications() -> int:
+    """
+    Delete read notifications older than NOTIFICATION_READ_TTL_DAYS. Done here rather
+    than left to the TTL index so counters and list versions move with the deletes
+    (clients would otherwise keep getting 304s for lists showing expired entries).
+    """
+    cutoff = datetime.now(timezone.utc) - timedelta(days=NOTIFICATION_READ_TTL_DAYS)
+    expired = 0
+    while True:
+        batch = await db.notifications.find(
+            {"read": True, "read_at": {"$lt": cutoff}}, {"_id": 0, "id": 1, "user_id": 1}
+        ).limit(NOTIFICATION_ARCHIVE_BATCH).to_list(NOTIFICATION_ARCHIVE_BATCH)
+        if not batch:
+            return expired
+        ids_by_user = {}
+        for n in batch:
+            ids_by_user.setdefault(n["user_id"], []).append(n["id"])
+        for user_id, ids in ids_by_user.items():
+            result = await db.notifications.delete_many({"id": {"$in": ids}, "read": True})
+            if not result.deleted_count:
+                continue
+            expired += result.deleted_count
+            await db.notification_counters.update_one(
+                {"_id": user_id, "unread": {"$exists": True}}, {"$inc": {"total": -result.deleted_count}}
+            )
+            await bump_version(notifications_scope(user_id))
+
+async def prune_user_notifications(user_id: str):
+    """Archive whatever is past the user's newest NOTIFICATION_USER_CAP notifications"""
+    try:
+        overflow = await db.notifications.find(
+            {"user_id": user_id}, {"_id": 0, "message": 0}
+        ).sort("created_at", DESCENDING).skip(NOTIFICATION_USER_CAP).to_list(None)
+        if overflow:
+            archived = await archive_notifications(overflow)
+            logger.info(f"Archived {archived} notifications past the cap for user {user_id}")
+        else:
+            # TTL expiry shrank the set without touching the counter
+            total = await db.notifications.count_documents({"user_id": user_id})
+            await db.notification_counters.update_one({"_id": user_id}, {"$set": {"total": total}})
+    except Exception as e:
+        logger.error(f"Failed to prune notifications for user {user_id}: {str(e)}")
+
+def schedule_notification_prune(user_id: str):
+    """Start a background prune for the user unless one is already running on this worker"""
+    if user_id in _prune_tasks:
+        return
+    task = asyncio.create_task(prune_user_notifications(user_id))
+    _prune_tasks[user_id] = task
+    task.add_done_callback(lambda _: _prune_tasks.pop(user_id, None))
+
+async def archive_old_notifications():
+    """Scheduled job: expire old read notifications, then archive those older than NOTIFICATION_ARCHIVE_AFTER_DAYS"""
+    cutoff = (datetime.now(timezone.utc) - timedelta(days=NOTIFICATION_ARCHIVE_AFTER_DAYS)).isoformat()
+    archived = 0
+    try:
+        expired = await expire_read_notifications()
+        if expired:
+            logger.info(f"Expired {expired} read notifications older than {NOTIFICATION_READ_TTL_DAYS} days")
+        while True:
+            batch = await db.notifications.find(
+                {"created_at": {"$lt": cutoff}}, {"_id": 0, "message": 0}
+            ).limit(NOTIFICATION_ARCHIVE_BATCH).to_list(NOTIFICATION_ARCHIVE_BATCH)
+            if not batch:
+                break
+            archived += await archive_notifications(batch)
+        if archived:
+            logger.info(f"Archived {archived} notifications older than {NOTIFICATION_ARCHIVE_AFTER_DAYS} days")
+        return {"archived": archived}
+    except Exception as e:
+        logger.error(f"Notification archiving failed: {str(e)}")
+
+async def ensure_notification_ttl():
+    """
+    Backstop TTL on read_at, NOTIFICATION_TTL_BACKSTOP_DAYS behind expire_read_notifications;
+    changing NOTIFICATION_READ_TTL_DAYS updates the existing index in place
+    """
+    expire_after = (NOTIFICATION_READ_TTL_DAYS + NOTIFICATION_TTL_BACKSTOP_DAYS) * 86400
+    try:
+        await db.notifications.create_index("read_at", expireAfterSeconds=expire_after)
+    except OperationFailure:
+        try:
+            await db.command("collMod", "notifications", index={"keyPattern": {"read_at": 1}, "expireAfterSeconds": expire_after})
+        except Exception as e:
+            logger.error(f"Failed to update the notifications read_at TTL index: {str(e)}")
+
+# ============ BROADCAST NOTIFICATIONS ============
+# Announcements are stored once in `broadcasts` with an audience filter and
+# merged into each user's notifications at read time. Read state is a per-user
+# watermark on the notification counter document: broadcasts created at or
+# before broadcast_read_at count as read, and those at or before
+# broadcast_cleared_at are hidden. Each worker keeps the recent broadcasts in
+# memory and reloads them when the shared version moves.
+BROADCAST_VERSION_ID = "broadcasts"
+BROADCAST_CHANNEL = "broadcasts"
+BROADCAST_CHECK_SECONDS = 5
+BROADCAST_LIMIT = 200
+
+broadcast_state = {"version": None, "checked_at": 0.0, "items": []}
+_broadcast_lock = asyncio.Lock()
+
+async def load_broadcasts(version: int):
+    cutoff = (datetime.now(timezone.utc) - timedelta(days=NOTIFICATION_ARCHIVE_AFTER_DAYS)).isoformat()
+    items = await db.broadcasts.find(
+        {"created_at": {"$gte": cutoff}}, {"_id": 0}
+    ).sort("created_at", DESCENDING).limit(BROADCAST_LIMIT).to_list(BROADCAST_LIMIT)
+    broadcast_state.update({"version": version, "checked_at": time.monotonic(), "items": items})
+
+async def get_broadcasts() -> dict:
+    """Recent broadcasts (newest first), reloaded if another worker bumped the version"""
+    if time.monotonic() - broadcast_state["checked_at"] < BROADCAST_CHECK_SECONDS:
+        return broadcast_state
+    async with _broadcast_lock:
+        if time.monotonic() - broadcast_state["checked_at"] < BROADCAST_CHECK_SECONDS:
+            return broadcast_state
+        version = (await current_versions(BROADCAST_VERSION_ID))[BROADCAST_VERSION_ID]
+        if version != broadcast_state["version"]:
+            await load_broadcasts(version)
+        else:
+            broadcast_state["checked_at"] = time.monotonic()
+    return broadcast_state
+
+async def invalidate_broadcasts():
+    version = await bump_version(BROADCAST_VERSION_ID)
+    async with _broadcast_lock:
+        await load_broadcasts(version)
+    await publish_live(BROADCAST_CHANNEL, "broadcast", {"version": version})
+
+def broadcast_reaches(broadcast: dict, user: dict) -> bool:
+    audience = broadcast.get("audience", {})
+    for field, value in (("roles", user.get("role")), ("plans", user.get("plan_id")), ("statuses", user.get("status"))):
+        if audience.get(field) and value not in audience[field]:
+            return False
+    return True
+
+async def get_broadcast_watermarks(user_id: str) -> dict:
+    counter = await db.notification_counters.find_one(
+        {"_id": user_id}, {"broadcast_read_at": 1, "broadcast_cleared_at": 1}
+    ) or {}
+    return {"read_at": counter.get("broadcast_read_at") or "", "cleared_at": counter.get("broadcast_cleared_at") or ""}
+
+async def advance_broadcast_watermarks(user_id: str, read_at: str = None, cleared_at: str = None):
+    """Move the watermarks forward only ($max), so an older mark-read can't un-read newer broadcasts"""
+    fields = {}
+    if read_at:
+        fields["broadcast_read_at"] = read_at
+    if cleared_at:
+        fields["broadcast_cleared_at"] = cleared_at
+    result = await db.notification_counters.update_one({"_id": user_id}, {"$max": fields})
+    if result.matched_count == 0:
+        # No counter yet: create it with the real counts rather than a watermark-only document
+        await seed_notification_counter(user_id)
+        await db.notification_counters.update_one({"_id": user_id}, {"$max": fields})
+
+def user_broadcasts(user: dict, broadcasts: list, watermarks: dict) -> list:
+    """The user's view of the broadcasts they are in the audience for, shaped like notifications"""
+    cutoff = (datetime.now(timezone.utc) - timedelta(days=NOTIFICATION_ARCHIVE_AFTER_DAYS)).isoformat()
+    return [{
+        "id": b["id"],
+        "user_id": user["id"],
+        "type": "broadcast",
+        "title": b["title"],
+        "message": b["message"],
+        "read": b["created_at"] <= watermarks["read_at"],
+        "created_at": b["created_at"],
+        "broadcast": True
+    } for b in broadcasts
+        if b["created_at"] > watermarks["cleared_at"] and b["created_at"] >= cutoff and broadcast_reaches(b, user)]
+
 # ============ EMAIL FUNCTIONS ============
 async def send_welcome_email(name: str, email: str, plan_name: str, amount: int):
     """Send welcome email to new mentee after successful payment"""
@@ -1266,23 +2733,11 @@ async def send_resume_feedback_email(request: dict, feedback: str, is_update: bo
 
 # ============ NEW MENTOR-CONTROLLED SLOT EMAIL FUNCTIONS ============
 
-async def send_new_booking_confirmation_emails(booking: dict):
-    """
-    Send booking confirmation emails to both mentor and mentee.
-    Includes appropriate details for each recipient, preparation instructions if provided,
-    and calendar invite attachment.
-    Requirements: 6.10, 13.1, 13.2, 13.3, 13.4, 13.5
-    """
-    try:
-        # Format date and time for display
-        slot_datetime = f"{booking['date']} at {booking['start_time']} - {booking['end_time']}"
-        
-        # Generate calendar invite (iCal format)
-        start_datetime = datetime.fromisoformat(f"{booking['date']}T{booking['start_time']}:00")
-        end_datetime = datetime.fromisoformat(f"{booking['date']}T{booking['end_time']}:00")
-        
-        # Create iCal content
-        ical_content = f"""BEGIN:VCALENDAR
+def build_booking_ical(booking: dict) -> str:
+    """Calendar invite (iCal) attached to the booking confirmation emails"""
+    start_datetime = datetime.fromisoformat(f"{booking['date']}T{booking['start_time']}:00")
+    end_datetime = datetime.fromisoformat(f"{booking['date']}T{booking['end_time']}:00")
+    return f"""BEGIN:VCALENDAR
 VERSION:2.0
 PRODID:-//Codementee//Mock Interview//EN
 BEGIN:VEVENT
@@ -1297,6 +2752,20 @@ STATUS:CONFIRMED
 SEQUENCE:0
 END:VEVENT
 END:VCALENDAR"""
+
+async def send_new_booking_confirmation_emails(booking: dict):
+    """
+    Send booking confirmation emails to both mentor and mentee.
+    Includes appropriate details for each recipient, preparation instructions if provided,
+    and calendar invite attachment.
+    Requirements: 6.10, 13.1, 13.2, 13.3, 13.4, 13.5
+    """
+    try:
+        # Format date and time for display
+        slot_datetime = f"{booking['date']} at {booking['start_time']} - {booking['end_time']}"
+        
+        # Generate calendar invite (iCal format)
+        ical_content = build_booking_ical(booking)
         
         # Prepare preparation notes section if available
         prep_notes_section = ""
@@ -2084,44 +3553,6 @@ async def send_reminder_emails(booking: dict):
         logger.error(f"Failed to send reminder emails: {str(e)}")
         return None
 
-async def check_and_send_reminder_emails():
-    """
-    Background job to check for sessions 24 hours away and queue reminder emails.
-    This should be called by a scheduler (cron job or background task).
-    Requirements: 14.1-14.5
-    """
-    try:
-        # Calculate the target date (24 hours from now)
-        target_datetime = datetime.now(timezone.utc) + timedelta(hours=24)
-        target_date = target_datetime.date().isoformat()
-        target_hour = target_datetime.hour
-        
-        # Find bookings scheduled for approximately 24 hours from now
-        # We'll check bookings on the target date within a 2-hour window
-        bookings = await db.bookings.find({
-            "date": target_date,
-            "status": "confirmed"  # Only send reminders for confirmed bookings
-        }).to_list(1000)
-        
-        reminders_sent = 0
-        for booking in bookings:
-            # Parse the booking time
-            booking_hour = int(booking['start_time'].split(':')[0])
-            
-            # Check if this booking is within our 2-hour window
-            if abs(booking_hour - target_hour) <= 1:
-                # Send reminder emails
-                result = await send_reminder_emails(dict(booking))
-                if result:
-                    reminders_sent += 1
-        
-        logger.info(f"Reminder email check complete. Sent {reminders_sent} reminders.")
-        return {"reminders_sent": reminders_sent}
-        
-    except Exception as e:
-        logger.error(f"Failed to check and send reminder emails: {str(e)}")
-        return None
-
 async def send_feedback_request_emails(booking: dict):
     """
     Send feedback request emails 1 hour after session end time.
@@ -2133,8 +3564,8 @@ async def send_feedback_request_emails(booking: dict):
         mentor_name = booking.get("mentor_name", "Mentor")
         mentor_email = booking.get("mentor_email")
         company_name = booking.get("company_name", "Company")
-        slot_date = booking.get("slot_date")
-        slot_time = f"{booking.get('slot_start_time')} - {booking.get('slot_end_time')}"
+        slot_date = booking.get("slot_date") or booking.get("date")
+        slot_time = f"{booking.get('slot_start_time') or booking.get('start_time')} - {booking.get('slot_end_time') or booking.get('end_time')}"
         
         if not mentee_email or not mentor_email:
             logger.error("Missing email addresses for feedback request")
@@ -2294,60 +3725,194 @@ async def send_feedback_request_emails(booking: dict):
         logger.error(f"Failed to send feedback request emails: {str(e)}")
         return None
 
-async def send_new_slot_notification_emails(slot: dict):
+# Styles only the single-slot announcement uses, on top of render_slot_email's
+SLOT_NOTIFICATION_EXTRA_CSS = """
+            .badge { display: inline-block; background: rgba(255, 255, 255, 0.2); color: white; padding: 6px 12px; border-radius: 20px; font-size: 12px; font-weight: 600; margin-top: 8px; }
+            .slot-details p { margin: 10px 0; }
+            .slot-details strong { color: #075985; }
+            .slot-details .highlight { background: white; padding: 12px; border-radius: 6px; margin-top: 12px; }
+            .cta-button { transition: transform 0.2s; box-shadow: 0 4px 12px rgba(6, 182, 212, 0.3); }
+            .cta-button:hover { transform: translateY(-2px); box-shadow: 0 6px 16px rgba(6, 182, 212, 0.4); }
+            .urgency { background: #fef3c7; border-left: 4px solid #f59e0b; padding: 16px; margin: 20px 0; border-radius: 8px; }
+            .urgency p { color: #92400e; margin: 0; font-size: 14px; font-weight: 500; }
+"""
+
+def render_slot_email(header: str, content: str, extra_css: str = "", pricing_link: bool = False) -> str:
+    """Wrap the header and content of a new-slot email in the shared layout and styles"""
+    pricing = '<a href="https://codementee.io/pricing">View Pricing</a> |' if pricing_link else ""
+    return f"""
+    <!DOCTYPE html>
+    <html>
+    <head>
+        <style>
+            body {{ font-family: 'Inter', -apple-system, BlinkMacSystemFont, 'Segoe UI', sans-serif; line-height: 1.6; color: #1a202c; margin: 0; padding: 0; background-color: #f7fafc; }}
+            .container {{ max-width: 600px; margin: 40px auto; background: white; border-radius: 12px; overflow: hidden; box-shadow: 0 4px 6px rgba(0, 0, 0, 0.1); }}
+            .header {{ background: linear-gradient(135deg, #06b6d4 0%, #0891b2 100%); padding: 40px 30px; text-align: center; }}
+            .header h1 {{ color: white; margin: 0; font-size: 28px; font-weight: 700; }}
+            .content {{ padding: 40px 30px; }}
+            .content h2 {{ color: #2d3748; font-size: 22px; margin-bottom: 20px; }}
+            .content p {{ color: #4a5568; margin-bottom: 16px; font-size: 16px; }}
+            .slot-details {{ background: linear-gradient(135deg, #f0f9ff 0%, #e0f2fe 100%); border-left: 4px solid #06b6d4; padding: 24px; margin: 24px 0; border-radius: 8px; }}
+            .slot-details p {{ margin: 8px 0; color: #0c4a6e; font-size: 15px; }}
+            .cta-button {{ display: inline-block; background: linear-gradient(135deg, #06b6d4 0%, #0891b2 100%); color: white; padding: 16px 40px; text-decoration: none; border-radius: 8px; font-weight: 600; margin: 24px 0; }}
+            .footer {{ background: #f7fafc; padding: 30px; text-align: center; color: #718096; font-size: 14px; }}
+            .footer a {{ color: #06b6d4; text-decoration: none; }}
+            {extra_css}
+        </style>
+    </head>
+    <body>
+        <div class="container">
+            <div class="header">
+                {header}
+            </div>
+            <div class="content">
+                {content}
+            </div>
+            <div class="footer">
+                <p>Best regards,<br><strong>Team Codementee</strong></p>
+                <p style="margin-top: 16px;">
+                    <a href="https://codementee.io">Visit Dashboard</a> | 
+                    {pricing}
+                    <a href="mailto:support@codementee.io">Contact Support</a>
+                </p>
+            </div>
+        </div>
+    </body>
+    </html>
     """
-    Send notification emails to all users (free and paid) when a new slot is created.
-    This helps drive engagement and conversions.
+
+async def send_slot_digest_emails(mentor_name: str, slots: list, all_mentees: list):
+    """
+    Send one aggregated email per mentee for a batch of new slots (e.g. a recurring
+    availability template), instead of one email per slot.
+    `all_mentees` are the recipients (the mentees whose interests match).
     """
     try:
-        logger.info(f"📧 Starting slot notification email process for slot {slot.get('id')}")
+        if not slots:
+            return None
         
-        mentor_name = slot.get("mentor_name", "Mentor")
-        slot_date = slot.get("date")
-        slot_time = f"{slot.get('start_time')} - {slot.get('end_time')}"
-        interview_types = ", ".join([t.replace("_", " ").title() for t in slot.get("interview_types", [])])
-        experience_levels = ", ".join([l.replace("_", " ").title() for l in slot.get("experience_levels", [])])
+        slots = sorted(slots, key=lambda s: (s["date"], s["start_time"]))
+        days = {}
+        for slot in slots:
+            days.setdefault(slot["date"], []).append(f"{slot['start_time']} - {slot['end_time']}")
         
-        # Format date nicely
-        try:
-            date_obj = datetime.strptime(slot_date, "%Y-%m-%d")
-            formatted_date = date_obj.strftime("%B %d, %Y")
-            day_of_week = date_obj.strftime("%A")
-        except Exception as e:
-            logger.warning(f"Date parsing error: {e}, using raw date")
-            formatted_date = slot_date
-            day_of_week = ""
+        rows = ""
+        for slot_date, times in days.items():
+            try:
+                label = datetime.strptime(slot_date, "%Y-%m-%d").strftime("%A, %B %d")
+            except ValueError:
+                label = slot_date
+            rows += f'<p><strong>📅 {label}:</strong> {", ".join(times)}</p>'
         
-        # Get all mentee users (both free and paid)
-        all_mentees = await db.users.find({"role": "mentee"}).to_list(1000)
+        interview_types = ", ".join(sorted({t.replace("_", " ").title() for s in slots for t in s.get("interview_types", [])}))
         
         if not all_mentees:
-            logger.warning("⚠️ No mentees found in database to notify")
+            logger.info("No mentees with matching slot interests to notify")
             return None
         
-        logger.info(f"📨 Found {len(all_mentees)} mentees to notify")
-        
-        # Send emails in batches to avoid overwhelming the email service
         batch_size = 50
         sent_count = 0
         failed_count = 0
         
         for i in range(0, len(all_mentees), batch_size):
-            batch = all_mentees[i:i + batch_size]
-            logger.info(f"Processing batch {i//batch_size + 1} ({len(batch)} mentees)")
-            
-            for mentee in batch:
-                mentee_name = mentee.get("name", "there")
+            for mentee in all_mentees[i:i + batch_size]:
                 mentee_email = mentee.get("email")
-                is_paid = mentee.get("status") == "Active" and mentee.get("plan_id")
-                
                 if not mentee_email:
-                    logger.warning(f"Skipping mentee {mentee.get('id')} - no email")
                     continue
                 
-                # Customize message based on user status
-                if is_paid:
-                    cta_text = "Book This Slot Now"
+                is_paid = is_paid_mentee(mentee)
+                cta_text = "Book a Slot Now" if is_paid else "Upgrade & Book a Slot"
+                cta_url = "https://codementee.io/mentee/slots" if is_paid else "https://codementee.io/register"
+                
+                html = render_slot_email(
+                    header=f"<h1>🎯 {len(slots)} New Slots Available!</h1>",
+                    content=f"""
+                    <h2>Hi {mentee.get("name", "there")},</h2>
+                    <p>{mentor_name} just opened {len(slots)} mock interview slots ({interview_types}).</p>
+                    <div class="slot-details">
+                        {rows}
+                    </div>
+                    <center>
+                        <a href="{cta_url}" class="cta-button">{cta_text}</a>
+                    </center>
+                    """
+                )
+                
+                params = {
+                    "from": f"Codementee <{SENDER_EMAIL}>",
+                    "to": [mentee_email],
+                    "subject": f"🎯 {len(slots)} New Mock Interview Slots Available",
+                    "html": html
+                }
+                
+                try:
+                    await asyncio.to_thread(resend.Emails.send, params)
+                    sent_count += 1
+                except Exception as e:
+                    failed_count += 1
+                    logger.error(f"❌ Failed to send slot digest to {mentee_email}: {str(e)}")
+            
+            # Small delay between batches to avoid rate limiting
+            if i + batch_size < len(all_mentees):
+                await asyncio.sleep(1)
+        
+        logger.info(f"✅ Slot digest complete ({len(slots)} slots): {sent_count} sent, {failed_count} failed")
+        return {"sent_count": sent_count, "failed_count": failed_count, "total": len(all_mentees)}
+    except Exception as e:
+        logger.error(f"❌ Critical error in send_slot_digest_emails: {str(e)}")
+        return None
+
+async def send_new_slot_notification_emails(slot: dict, all_mentees: list):
+    """
+    Send notification emails to the given mentees (free and paid) when a new slot is created.
+    This helps drive engagement and conversions.
+    """
+    try:
+        logger.info(f"📧 Starting slot notification email process for slot {slot.get('id')}")
+        
+        mentor_name = slot.get("mentor_name", "Mentor")
+        slot_date = slot.get("date")
+        slot_time = f"{slot.get('start_time')} - {slot.get('end_time')}"
+        interview_types = ", ".join([t.replace("_", " ").title() for t in slot.get("interview_types", [])])
+        experience_levels = ", ".join([l.replace("_", " ").title() for l in slot.get("experience_levels", [])])
+        
+        # Format date nicely
+        try:
+            date_obj = datetime.strptime(slot_date, "%Y-%m-%d")
+            formatted_date = date_obj.strftime("%B %d, %Y")
+            day_of_week = date_obj.strftime("%A")
+        except Exception as e:
+            logger.warning(f"Date parsing error: {e}, using raw date")
+            formatted_date = slot_date
+            day_of_week = ""
+        
+        if not all_mentees:
+            logger.info("No mentees with matching slot interests to notify")
+            return None
+        
+        logger.info(f"📨 Found {len(all_mentees)} mentees to notify")
+        
+        # Send emails in batches to avoid overwhelming the email service
+        batch_size = 50
+        sent_count = 0
+        failed_count = 0
+        
+        for i in range(0, len(all_mentees), batch_size):
+            batch = all_mentees[i:i + batch_size]
+            logger.info(f"Processing batch {i//batch_size + 1} ({len(batch)} mentees)")
+            
+            for mentee in batch:
+                mentee_name = mentee.get("name", "there")
+                mentee_email = mentee.get("email")
+                is_paid = is_paid_mentee(mentee)
+                
+                if not mentee_email:
+                    logger.warning(f"Skipping mentee {mentee.get('id')} - no email")
+                    continue
+                
+                # Customize message based on user status
+                if is_paid:
+                    cta_text = "Book This Slot Now"
                     cta_url = "https://codementee.io/mentee/slots"
                     message = "A new mock interview slot is now available! Book it before it fills up."
                 else:
@@ -2355,73 +3920,38 @@ async def send_new_slot_notification_emails(slot: dict):
                     cta_url = "https://codementee.io/register"
                     message = "A new mock interview slot is available! Upgrade to a paid plan to book your session with expert mentors."
                 
-                html = f"""
-                <!DOCTYPE html>
-                <html>
-                <head>
-                    <style>
-                        body {{ font-family: 'Inter', -apple-system, BlinkMacSystemFont, 'Segoe UI', sans-serif; line-height: 1.6; color: #1a202c; margin: 0; padding: 0; background-color: #f7fafc; }}
-                        .container {{ max-width: 600px; margin: 40px auto; background: white; border-radius: 12px; overflow: hidden; box-shadow: 0 4px 6px rgba(0, 0, 0, 0.1); }}
-                        .header {{ background: linear-gradient(135deg, #06b6d4 0%, #0891b2 100%); padding: 40px 30px; text-align: center; }}
-                        .header h1 {{ color: white; margin: 0; font-size: 28px; font-weight: 700; }}
-                        .badge {{ display: inline-block; background: rgba(255, 255, 255, 0.2); color: white; padding: 6px 12px; border-radius: 20px; font-size: 12px; font-weight: 600; margin-top: 8px; }}
-                        .content {{ padding: 40px 30px; }}
-                        .content h2 {{ color: #2d3748; font-size: 22px; margin-bottom: 20px; }}
-                        .content p {{ color: #4a5568; margin-bottom: 16px; font-size: 16px; }}
-                        .slot-details {{ background: linear-gradient(135deg, #f0f9ff 0%, #e0f2fe 100%); border-left: 4px solid #06b6d4; padding: 24px; margin: 24px 0; border-radius: 8px; }}
-                        .slot-details p {{ margin: 10px 0; color: #0c4a6e; font-size: 15px; }}
-                        .slot-details strong {{ color: #075985; }}
-                        .slot-details .highlight {{ background: white; padding: 12px; border-radius: 6px; margin-top: 12px; }}
-                        .cta-button {{ display: inline-block; background: linear-gradient(135deg, #06b6d4 0%, #0891b2 100%); color: white; padding: 16px 40px; text-decoration: none; border-radius: 8px; font-weight: 600; margin: 24px 0; transition: transform 0.2s; box-shadow: 0 4px 12px rgba(6, 182, 212, 0.3); }}
-                        .cta-button:hover {{ transform: translateY(-2px); box-shadow: 0 6px 16px rgba(6, 182, 212, 0.4); }}
-                        .urgency {{ background: #fef3c7; border-left: 4px solid #f59e0b; padding: 16px; margin: 20px 0; border-radius: 8px; }}
-                        .urgency p {{ color: #92400e; margin: 0; font-size: 14px; font-weight: 500; }}
-                        .footer {{ background: #f7fafc; padding: 30px; text-align: center; color: #718096; font-size: 14px; }}
-                        .footer a {{ color: #06b6d4; text-decoration: none; }}
-                    </style>
-                </head>
-                <body>
-                    <div class="container">
-                        <div class="header">
-                            <h1>🎯 New Slot Available!</h1>
-                            <span class="badge">LIMITED AVAILABILITY</span>
-                        </div>
-                        <div class="content">
-                            <h2>Hi {mentee_name},</h2>
-                            <p>{message}</p>
-                            
-                            <div class="slot-details">
-                                <p><strong>📅 Date:</strong> {day_of_week}, {formatted_date}</p>
-                                <p><strong>🕐 Time:</strong> {slot_time}</p>
-                                <p><strong>👨‍💼 Mentor:</strong> {mentor_name}</p>
-                                <div class="highlight">
-                                    <p><strong>💼 Interview Types:</strong> {interview_types}</p>
-                                    <p><strong>📊 Experience Levels:</strong> {experience_levels}</p>
-                                </div>
-                            </div>
-                            
-                            <div class="urgency">
-                                <p>⚡ Slots fill up fast! Book now to secure your spot with an expert mentor.</p>
-                            </div>
-                            
-                            <center>
-                                <a href="{cta_url}" class="cta-button">{cta_text}</a>
-                            </center>
-                            
-                            <p style="margin-top: 24px; font-size: 14px; color: #718096;">Don't miss this opportunity to practice with industry experts and ace your interviews!</p>
-                        </div>
-                        <div class="footer">
-                            <p>Best regards,<br><strong>Team Codementee</strong></p>
-                            <p style="margin-top: 16px;">
-                                <a href="https://codementee.io">Visit Dashboard</a> | 
-                                <a href="https://codementee.io/pricing">View Pricing</a> |
-                                <a href="mailto:support@codementee.io">Contact Support</a>
-                            </p>
+                html = render_slot_email(
+                    header="""
+                    <h1>🎯 New Slot Available!</h1>
+                    <span class="badge">LIMITED AVAILABILITY</span>
+                    """,
+                    content=f"""
+                    <h2>Hi {mentee_name},</h2>
+                    <p>{message}</p>
+                    
+                    <div class="slot-details">
+                        <p><strong>📅 Date:</strong> {day_of_week}, {formatted_date}</p>
+                        <p><strong>🕐 Time:</strong> {slot_time}</p>
+                        <p><strong>👨‍💼 Mentor:</strong> {mentor_name}</p>
+                        <div class="highlight">
+                            <p><strong>💼 Interview Types:</strong> {interview_types}</p>
+                            <p><strong>📊 Experience Levels:</strong> {experience_levels}</p>
                         </div>
                     </div>
-                </body>
-                </html>
-                """
+                    
+                    <div class="urgency">
+                        <p>⚡ Slots fill up fast! Book now to secure your spot with an expert mentor.</p>
+                    </div>
+                    
+                    <center>
+                        <a href="{cta_url}" class="cta-button">{cta_text}</a>
+                    </center>
+                    
+                    <p style="margin-top: 24px; font-size: 14px; color: #718096;">Don't miss this opportunity to practice with industry experts and ace your interviews!</p>
+                    """,
+                    extra_css=SLOT_NOTIFICATION_EXTRA_CSS,
+                    pricing_link=True
+                )
                 
                 params = {
                     "from": f"Codementee <{SENDER_EMAIL}>",
@@ -2699,44 +4229,6 @@ async def send_new_slot_notification_emails(slot: dict):
         logger.error(f"Failed to send feedback request emails: {str(e)}")
         return None
 
-async def check_and_send_feedback_requests():
-    """
-    Background job to check for completed sessions and send feedback requests 1 hour after end time.
-    This should be called by a scheduler (cron job or background task).
-    Requirements: 15.1-15.5
-    """
-    try:
-        # Calculate the target time (1 hour ago)
-        target_datetime = datetime.now(timezone.utc) - timedelta(hours=1)
-        target_date = target_datetime.date().isoformat()
-        target_hour = target_datetime.hour
-        
-        # Find bookings that ended approximately 1 hour ago
-        bookings = await db.bookings.find({
-            "date": target_date,
-            "status": "confirmed",
-            "feedback_submitted": False
-        }).to_list(1000)
-        
-        feedback_requests_sent = 0
-        for booking in bookings:
-            # Parse the booking end time
-            end_hour = int(booking['end_time'].split(':')[0])
-            
-            # Check if this booking ended within our 2-hour window
-            if abs(end_hour - target_hour) <= 1:
-                # Send feedback request emails
-                result = await send_feedback_request_emails(dict(booking))
-                if result:
-                    feedback_requests_sent += 1
-        
-        logger.info(f"Feedback request check complete. Sent {feedback_requests_sent} requests.")
-        return {"feedback_requests_sent": feedback_requests_sent}
-        
-    except Exception as e:
-        logger.error(f"Failed to check and send feedback requests: {str(e)}")
-        return None
-
 async def update_completed_slot_statuses():
     """
     Background job to check for past sessions and update slot status to "completed".
@@ -2789,6 +4281,334 @@ async def update_completed_slot_statuses():
         logger.error(f"Failed to update completed slot statuses: {str(e)}")
         return None
 
+# ============ DELAYED JOB QUEUE ============
+# Booking-driven emails are stored as timers in `scheduled_jobs`, keyed by
+# (job_type, booking_id) and indexed by `due_at`. The poller claims due jobs
+# atomically, so only one worker runs a given job, and anything that fell due
+# while the server was down is picked up on the next poll.
+JOB_POLL_INTERVAL_SECONDS = 60
+JOB_LEASE_SECONDS = 300  # A claimed job is re-claimable if its worker dies mid-run
+JOB_MAX_ATTEMPTS = 5
+JOB_BATCH_SIZE = 100
+REMINDER_LEAD_TIME = timedelta(hours=24)
+FEEDBACK_REQUEST_DELAY = timedelta(hours=1)
+
+def parse_session_datetime(date_str: str, time_str: str) -> datetime:
+    """Session dates and times are stored as strings and interpreted as UTC"""
+    return datetime.fromisoformat(f"{date_str}T{time_str}:00").replace(tzinfo=timezone.utc)
+
+async def schedule_job(job_type: str, booking_id: str, due_at: datetime):
+    """Create a timer unless one already exists for this booking and job type"""
+    now = datetime.now(timezone.utc)
+    try:
+        await db.scheduled_jobs.update_one(
+            {"job_type": job_type, "booking_id": booking_id},
+            {"$setOnInsert": {
+                "id": str(uuid.uuid4()),
+                "job_type": job_type,
+                "booking_id": booking_id,
+                "due_at": due_at,
+                "status": "pending",  # pending, running, done, skipped, failed, cancelled
+                "attempts": 0,
+                "locked_until": None,
+                "last_error": None,
+                "created_at": now,
+                "updated_at": now
+            }},
+            upsert=True
+        )
+    except DuplicateKeyError:
+        # Another worker scheduled the same job concurrently
+        pass
+
+async def schedule_booking_jobs(booking: dict):
+    """Schedule the 24h reminder and the post-session feedback request for a booking"""
+    now = datetime.now(timezone.utc)
+    start_at = parse_session_datetime(booking["date"], booking["start_time"])
+    end_at = parse_session_datetime(booking["date"], booking["end_time"])
+    
+    # Sessions booked less than 24h ahead already got a confirmation email
+    reminder_due = start_at - REMINDER_LEAD_TIME
+    if reminder_due > now:
+        await schedule_job("booking_reminder", booking["id"], reminder_due)
+    
+    await schedule_job("feedback_request", booking["id"], end_at + FEEDBACK_REQUEST_DELAY)
+
+async def cancel_booking_jobs(booking_id: str):
+    """Cancel any timers that have not fired yet for a booking"""
+    result = await db.scheduled_jobs.update_many(
+        {"booking_id": booking_id, "status": "pending"},
+        {"$set": {"status": "cancelled", "updated_at": datetime.now(timezone.utc)}}
+    )
+    return result.modified_count
+
+async def claim_due_job():
+    """Atomically claim the oldest due job, including jobs whose lease expired"""
+    now = datetime.now(timezone.utc)
+    return await db.scheduled_jobs.find_one_and_update(
+        {"$or": [
+            {"status": "pending", "due_at": {"$lte": now}},
+            {"status": "running", "locked_until": {"$lte": now}}
+        ]},
+        {
+            "$set": {
+                "status": "running",
+                "locked_until": now + timedelta(seconds=JOB_LEASE_SECONDS),
+                "updated_at": now
+            },
+            "$inc": {"attempts": 1}
+        },
+        sort=[("due_at", ASCENDING)],
+        return_document=ReturnDocument.AFTER
+    )
+
+async def run_booking_reminder_job(job: dict) -> str:
+    booking = await db.bookings.find_one({"id": job["booking_id"]})
+    if not booking or booking.get("status") != "confirmed":
+        return "skipped"
+    
+    # Don't send a "tomorrow" reminder after the session has started (e.g. after a long outage)
+    if parse_session_datetime(booking["date"], booking["start_time"]) <= datetime.now(timezone.utc):
+        return "skipped"
+    
+    if not await send_reminder_emails(dict(booking)):
+        raise RuntimeError("Reminder email delivery failed")
+    return "done"
+
+async def run_feedback_request_job(job: dict) -> str:
+    booking = await db.bookings.find_one({"id": job["booking_id"]})
+    if not booking or booking.get("status") not in ["confirmed", "completed"]:
+        return "skipped"
+    
+    if booking.get("feedback_submitted"):
+        return "skipped"
+    
+    if not await send_feedback_request_emails(dict(booking)):
+        raise RuntimeError("Feedback request email delivery failed")
+    return "done"
+
+JOB_HANDLERS = {
+    "booking_reminder": run_booking_reminder_job,
+    "feedback_request": run_feedback_request_job
+}
+
+async def process_due_jobs():
+    """
+    Background job that drains due timers from `scheduled_jobs`.
+    Failed jobs are retried with exponential backoff up to JOB_MAX_ATTEMPTS.
+    """
+    processed = 0
+    try:
+        while processed < JOB_BATCH_SIZE:
+            job = await claim_due_job()
+            if not job:
+                break
+            processed += 1
+            
+            handler = JOB_HANDLERS.get(job["job_type"])
+            now = datetime.now(timezone.utc)
+            try:
+                if not handler:
+                    raise RuntimeError(f"Unknown job type: {job['job_type']}")
+                status = await handler(job)
+                await db.scheduled_jobs.update_one(
+                    {"id": job["id"]},
+                    {"$set": {"status": status, "locked_until": None, "completed_at": now, "updated_at": now}}
+                )
+            except Exception as e:
+                logger.error(f"Job {job['id']} ({job['job_type']}) failed on attempt {job['attempts']}: {str(e)}")
+                retry = job["attempts"] < JOB_MAX_ATTEMPTS
+                await db.scheduled_jobs.update_one(
+                    {"id": job["id"]},
+                    {"$set": {
+                        "status": "pending" if retry else "failed",
+                        "due_at": now + timedelta(minutes=2 ** job["attempts"]) if retry else job["due_at"],
+                        "locked_until": None,
+                        "last_error": str(e),
+                        "updated_at": now
+                    }}
+                )
+        
+        if processed:
+            logger.info(f"Job queue poll complete. Processed {processed} jobs.")
+        return {"jobs_processed": processed}
+    
+    except Exception as e:
+        logger.error(f"Failed to process scheduled jobs: {str(e)}")
+        return None
+
+async def backfill_booking_jobs():
+    """Schedule timers for confirmed upcoming bookings created before the job queue existed"""
+    yesterday = (datetime.now(timezone.utc) - timedelta(days=1)).date().isoformat()
+    bookings = await db.bookings.find(
+        {"status": "confirmed", "date": {"$gte": yesterday}},
+        {"_id": 0, "id": 1, "date": 1, "start_time": 1, "end_time": 1}
+    ).to_list(None)
+    
+    for booking in bookings:
+        try:
+            await schedule_booking_jobs(booking)
+        except Exception as e:
+            logger.error(f"Failed to backfill jobs for booking {booking.get('id')}: {str(e)}")
+
+# ============ EVENT SUBSCRIBERS ============
+@subscribe("booking.created")
+async def notify_booking_created(event: dict):
+    booking = event["payload"]
+    await create_notification(
+        booking["mentee_id"], "booking_confirmed", "Mock Interview Booked!",
+        f"Your mock interview with {booking['mentor_name']} for {booking['company_name']} is confirmed on {booking['date']} at {booking['start_time']}",
+        event_id=event["id"]
+    )
+    await create_notification(
+        booking["mentor_id"], "new_booking", "New Booking Received",
+        f"{booking['mentee_name']} booked your slot for {booking['company_name']} on {booking['date']} at {booking['start_time']}",
+        event_id=event["id"]
+    )
+
+@subscribe("booking.created")
+async def schedule_booking_created_jobs(event: dict):
+    await schedule_booking_jobs(event["payload"])
+
+@subscribe("booking.created")
+async def email_booking_created(event: dict):
+    await send_new_booking_confirmation_emails(event["payload"])
+
+@subscribe("booking.cancelled")
+async def cancel_booking_cancelled_jobs(event: dict):
+    await cancel_booking_jobs(event["aggregate_id"])
+
+@subscribe("booking.cancelled")
+async def promote_booking_cancelled_slot(event: dict):
+    await promote_slot_queue(event["payload"]["booking"]["slot_id"])
+
+@subscribe("booking.cancelled")
+async def email_booking_cancelled(event: dict):
+    payload = event["payload"]
+    await send_cancellation_notification_emails(
+        booking=payload["booking"],
+        cancelled_by_role=payload["cancelled_by_role"],
+        cancellation_reason=payload.get("cancellation_reason")
+    )
+
+@subscribe("booking.confirmed")
+async def email_booking_confirmed(event: dict):
+    """Booking-request flow: tell the mentee and mentor about the confirmed slot"""
+    payload = event["payload"]
+    if payload.get("mentee_email"):
+        await send_booking_confirmed_email(
+            recipient_name=payload["mentee_name"],
+            recipient_email=payload["mentee_email"],
+            company_name=payload["company_name"],
+            slot_time=payload["slot_time"],
+            meeting_link=payload["meeting_link"],
+            is_mentor=False,
+            mentor_name=payload["mentor_name"],
+            mentor_email=payload["mentor_email"]
+        )
+    await send_booking_confirmed_email(
+        recipient_name=payload["mentor_name"],
+        recipient_email=payload["mentor_email"],
+        company_name=payload["company_name"],
+        slot_time=payload["slot_time"],
+        meeting_link=payload["meeting_link"],
+        is_mentor=True
+    )
+
+@subscribe("booking.created")
+async def social_proof_booking_created(event: dict):
+    booking = event["payload"]
+    await record_social_proof(social_proof_entry(
+        event["id"], booking.get("mentee_name"), booking.get("interview_type"),
+        booking.get("company_name"), event["created_at"]
+    ))
+
+@subscribe("booking.confirmed")
+async def social_proof_booking_confirmed(event: dict):
+    payload = event["payload"]
+    await record_social_proof(social_proof_entry(
+        event["id"], payload.get("mentee_name"), payload.get("interview_type"),
+        payload.get("company_name"), event["created_at"]
+    ))
+
+@subscribe("bug_report.created")
+@subscribe("bug_report.updated")
+async def stream_bug_report_change(event: dict):
+    await publish_live(BUG_REPORT_CHANNEL, BUG_REPORT_STREAM_EVENTS[event["type"]], event["payload"], event["seq"])
+
+@subscribe("payment.verified")
+async def email_payment_verified(event: dict):
+    payload = event["payload"]
+    send = send_upgrade_email if payload["is_upgrade"] else send_welcome_email
+    await send(
+        name=payload["name"],
+        email=payload["email"],
+        plan_name=payload["plan_name"],
+        amount=payload["amount"]
+    )
+
+@subscribe("feedback.submitted")
+async def notify_feedback_submitted(event: dict):
+    feedback = event["payload"]
+    rating = f" Rating: {feedback['rating']}/5 stars" if feedback.get("rating") else ""
+    await create_notification(
+        feedback["mentee_id"], "feedback_received", "Feedback Received",
+        f"{feedback['mentor_name']} has submitted feedback for your mock interview.{rating}",
+        event_id=event["id"]
+    )
+
+# ============ DATABASE INDEXES ============
+async def ensure_indexes():
+    """
+    Create the indexes the background jobs and hot queries rely on (idempotent).
+    Unique indexes back the exactly-once guarantees (quota ledger, slot holds and
+    queues, event sequence, notification dedupe), so startup fails if one of them
+    can't be built rather than running without it.
+    """
+    indexes = [
+        ("scheduled_jobs", [("job_type", ASCENDING), ("booking_id", ASCENDING)], {"unique": True}),
+        ("scheduled_jobs", [("status", ASCENDING), ("due_at", ASCENDING)], {}),
+        ("scheduled_jobs", [("status", ASCENDING), ("locked_until", ASCENDING)], {}),
+        ("scheduled_jobs", "booking_id", {}),
+        ("users", "id", {"unique": True}),
+        ("quota_ledger", "idempotency_key", {"unique": True}),
+        ("quota_ledger", [("user_id", ASCENDING), ("created_at", ASCENDING)], {}),
+        ("meet_links", [("status", ASCENDING), ("lease_expires_at", ASCENDING)], {}),
+        ("meet_link_claims", "created_at", {}),
+        ("slot_holds", "slot_id", {"unique": True}),
+        ("slot_holds", "expires_at", {"expireAfterSeconds": 0}),
+        ("slot_queue", [("slot_id", ASCENDING), ("mentee_id", ASCENDING)], {"unique": True}),
+        ("slot_queue", [("slot_id", ASCENDING), ("queued_at", ASCENDING)], {}),
+        ("availability_templates", [("mentor_id", ASCENDING), ("created_at", ASCENDING)], {}),
+        ("mentor_slots", "template_id", {"sparse": True}),
+        *[(name, [("mentor_id", ASCENDING), ("date", ASCENDING), ("start_time", ASCENDING)], {}) for name in MENTOR_SCHEDULE_COLLECTIONS],
+        ("domain_events", "seq", {"unique": True}),
+        ("domain_events", [("status", ASCENDING), ("created_at", ASCENDING)], {}),
+        ("domain_events", [("status", ASCENDING), ("lease_until", ASCENDING)], {}),
+        ("domain_events", [("type", ASCENDING), ("aggregate_id", ASCENDING)], {}),
+        ("domain_events", [("type", ASCENDING), ("seq", ASCENDING)], {}),
+        ("notifications", [("event_id", ASCENDING), ("user_id", ASCENDING)], {"unique": True, "partialFilterExpression": {"event_id": {"$exists": True}}}),
+        ("notifications", [("read", ASCENDING), ("user_id", ASCENDING)], {}),
+        ("notifications", [("user_id", ASCENDING), ("created_at", DESCENDING)], {}),
+        ("notifications", "created_at", {}),
+        ("notification_archive", [("user_id", ASCENDING), ("month", DESCENDING)], {}),
+        ("broadcasts", "created_at", {}),
+        ("slot_interests", "mentee_id", {"unique": True}),
+        *[("slot_interests", [(field, ASCENDING), ("date_to", ASCENDING)], {}) for field in INTEREST_FIELDS],
+        ("live_events", "created_at", {"expireAfterSeconds": LIVE_EVENTS_TTL_SECONDS}),
+    ]
+    missing = []
+    for collection, keys, options in indexes:
+        try:
+            await db[collection].create_index(keys, **options)
+        except Exception as e:
+            logger.error(f"Failed to create index {keys} on {collection}: {str(e)}")
+            if options.get("unique"):
+                missing.append(f"{collection} {keys}")
+    await ensure_notification_ttl()
+    if missing:
+        raise RuntimeError(f"Required unique indexes could not be built: {'; '.join(missing)}")
+
 # ============ SCHEDULER SETUP ============
 scheduler = AsyncIOScheduler()
 
@@ -2797,8 +4617,13 @@ def start_scheduler():
     Start the background scheduler for automated tasks.
     Runs:
     - Slot status updates every hour
-    - Reminder emails every hour
-    - Feedback requests every hour
+    - Delayed job queue (reminders, feedback requests) every minute
+    - Meet link lease release every 5 minutes
+    - Slot queue promotion after hold expiry every 15 seconds
+    - Availability template extension daily at 00:30
+    - Domain event re-dispatch every minute
+    - Unread notification counter reconciliation every 15 minutes
+    - Read notification expiry and archiving every hour
     """
     try:
         # Update completed slot statuses every hour
@@ -2810,30 +4635,94 @@ def start_scheduler():
             replace_existing=True
         )
         
-        # Send reminder emails every hour
+        # Drain due reminder / feedback request timers every minute
         scheduler.add_job(
-            check_and_send_reminder_emails,
-            CronTrigger(minute=15),  # Run at 15 minutes past every hour
-            id='send_reminder_emails',
-            name='Send reminder emails for sessions 24h away',
-            replace_existing=True
+            process_due_jobs,
+            IntervalTrigger(seconds=JOB_POLL_INTERVAL_SECONDS),
+            id='process_due_jobs',
+            name='Send due reminder and feedback request emails',
+            replace_existing=True,
+            max_instances=1,
+            coalesce=True
         )
         
-        # Send feedback requests every hour
+        # Retry domain events whose subscribers didn't all complete
         scheduler.add_job(
-            check_and_send_feedback_requests,
-            CronTrigger(minute=30),  # Run at 30 minutes past every hour
-            id='send_feedback_requests',
-            name='Send feedback requests for completed sessions',
-            replace_existing=True
+            redispatch_pending_events,
+            IntervalTrigger(seconds=EVENT_REDISPATCH_INTERVAL_SECONDS),
+            id='redispatch_events',
+            name='Re-dispatch pending domain events',
+            replace_existing=True,
+            max_instances=1,
+            coalesce=True
+        )
+        
+        # Keep recurring availability materialized up to the rolling horizon
+        scheduler.add_job(
+            extend_availability_templates,
+            CronTrigger(hour=0, minute=30),
+            id='extend_availability_templates',
+            name='Extend recurring availability templates',
+            replace_existing=True,
+            max_instances=1,
+            coalesce=True
+        )
+        
+        # Hand slots whose hold lapsed to the next mentee in the queue
+        scheduler.add_job(
+            promote_expired_slot_holds,
+            IntervalTrigger(seconds=SLOT_HOLD_SWEEP_SECONDS),
+            id='promote_slot_queues',
+            name='Promote slot queues after hold expiry',
+            replace_existing=True,
+            max_instances=1,
+            coalesce=True
+        )
+        
+        # Correct unread notification counters that drifted
+        scheduler.add_job(
+            reconcile_unread_counts,
+            IntervalTrigger(minutes=UNREAD_RECONCILE_INTERVAL_MINUTES),
+            id='reconcile_unread_counts',
+            name='Reconcile unread notification counters',
+            replace_existing=True,
+            max_instances=1,
+            coalesce=True
+        )
+        
+        # Move aged-out notifications to the archive
+        scheduler.add_job(
+            archive_old_notifications,
+            IntervalTrigger(minutes=NOTIFICATION_RETENTION_INTERVAL_MINUTES),
+            id='archive_old_notifications',
+            name='Archive old notifications',
+            replace_existing=True,
+            max_instances=1,
+            coalesce=True
+        )
+        
+        # Return meet links whose lease has ended to the pool
+        scheduler.add_job(
+            release_expired_meet_links,
+            IntervalTrigger(minutes=MEET_LINK_RELEASE_INTERVAL_MINUTES),
+            id='release_meet_links',
+            name='Release expired meet link leases',
+            replace_existing=True,
+            max_instances=1,
+            coalesce=True
         )
         
         scheduler.start()
         logger.info("Background scheduler started successfully")
         logger.info("Scheduled jobs:")
         logger.info("  - Update slot statuses: Every hour at :00")
-        logger.info("  - Send reminder emails: Every hour at :15")
-        logger.info("  - Send feedback requests: Every hour at :30")
+        logger.info(f"  - Process due jobs: Every {JOB_POLL_INTERVAL_SECONDS}s")
+        logger.info(f"  - Release meet links: Every {MEET_LINK_RELEASE_INTERVAL_MINUTES} minutes")
+        logger.info(f"  - Promote slot queues: Every {SLOT_HOLD_SWEEP_SECONDS}s")
+        logger.info("  - Extend availability templates: Daily at 00:30")
+        logger.info(f"  - Re-dispatch domain events: Every {EVENT_REDISPATCH_INTERVAL_SECONDS}s")
+        logger.info(f"  - Reconcile unread counters: Every {UNREAD_RECONCILE_INTERVAL_MINUTES} minutes")
+        logger.info(f"  - Archive old notifications: Every {NOTIFICATION_RETENTION_INTERVAL_MINUTES} minutes")
         
     except Exception as e:
         logger.error(f"Failed to start scheduler: {str(e)}")
@@ -2856,6 +4745,10 @@ async def register(user: UserCreate):
         "created_at": datetime.now(timezone.utc).isoformat()
     }
     await db.users.insert_one(user_doc)
+    if user.role == "mentor":
+        invalidate_cache_tags("mentors")
+    elif user.role == "mentee":
+        await register_default_slot_interest(user_doc["id"])
     return {"message": "User created successfully"}
 
 @api_router.post("/auth/register-free")
@@ -2882,21 +4775,14 @@ async def register_free_user(data: FreeUserCreate):
         "target_role": data.target_role,
         "interview_quota_total": 0,
         "interview_quota_remaining": 0,
-        "plan_features": {
-            "mock_interviews": 0,
-            "resume_reviews": 0,
-            "resume_review_type": "none",
-            "offline_profile_creation": 0,
-            "ai_tools_access": "none",
-            "community_access": False,
-            "priority_support": False,
-            "strategy_calls": 0,
-            "referral_guidance": False
-        },
+        "resume_review_quota": 0,
+        "quota_ledger_opened": True,
+        "plan_features": dict(FREE_PLAN_FEATURES),
         "created_at": datetime.now(timezone.utc).isoformat()
     }
     
     await db.users.insert_one(user_doc)
+    await register_default_slot_interest(user_doc["id"])
     
     # Generate token for auto-login
     token = create_token(user_doc["id"], user_doc["role"])
@@ -2925,63 +4811,41 @@ async def login(credentials: UserLogin):
     # Ensure user has quota fields (for users created before migration)
     if "interview_quota_total" not in user:
         # Determine quota based on plan
-        plan_configs = {
-            "starter": {"quota": 1, "features": {
-                "mock_interviews": 1, "resume_reviews": 1, "resume_review_type": "email", "offline_profile_creation": 0,
-                "ai_tools_access": "limited", "community_access": False, "priority_support": False,
-                "strategy_calls": 0, "referral_guidance": False
-            }},
-            "pro": {"quota": 3, "features": {
-                "mock_interviews": 3, "resume_reviews": 1, "resume_review_type": "call", "offline_profile_creation": 0,
-                "ai_tools_access": "full", "community_access": True, "priority_support": False,
-                "strategy_calls": 1, "referral_guidance": False
-            }},
-            "elite": {"quota": 6, "features": {
-                "mock_interviews": 6, "resume_reviews": 1, "resume_review_type": "call", "offline_profile_creation": 1,
-                "ai_tools_access": "full", "community_access": True, "priority_support": True,
-                "strategy_calls": 0, "referral_guidance": True
-            }}
-        }
-        
-        plan_id = user.get("plan_id")
-        if plan_id and plan_id in plan_configs:
-            config = plan_configs[plan_id]
+        config = await plan_entitlements(user.get("plan_id"), fallback=False)
+        if config:
             # Count existing bookings
             bookings_count = await db.bookings.count_documents({
                 "mentee_id": user["id"],
                 "status": {"$in": ["confirmed", "completed"]}
             })
-            remaining = max(0, config["quota"] - bookings_count)
+            remaining = max(0, config["interview_quota_total"] - bookings_count)
             
-            # Update user with quota fields
+            # Update user with plan fields; the remaining balance opens the quota ledger
             await db.users.update_one(
                 {"id": user["id"]},
                 {"$set": {
-                    "interview_quota_total": config["quota"],
-                    "interview_quota_remaining": remaining,
-                    "plan_features": config["features"]
+                    "interview_quota_total": config["interview_quota_total"],
+                    "plan_features": config["plan_features"]
                 }}
             )
-            user["interview_quota_total"] = config["quota"]
-            user["interview_quota_remaining"] = remaining
-            user["plan_features"] = config["features"]
+            user["interview_quota_total"] = config["interview_quota_total"]
+            user["plan_features"] = config["plan_features"]
+            await open_quota_ledger(user, interview_balance=remaining)
         else:
             # Free user or unknown plan
             user["interview_quota_total"] = 0
             user["interview_quota_remaining"] = 0
-            user["plan_features"] = {
-                "mock_interviews": 0, "resume_reviews": 0, "resume_review_type": "none", "offline_profile_creation": 0,
-                "ai_tools_access": "none", "community_access": False, "priority_support": False,
-                "strategy_calls": 0, "referral_guidance": False
-            }
+            user["plan_features"] = dict(FREE_PLAN_FEATURES)
             await db.users.update_one(
                 {"id": user["id"]},
                 {"$set": {
                     "interview_quota_total": 0,
-                    "interview_quota_remaining": 0,
                     "plan_features": user["plan_features"]
                 }}
             )
+            await open_quota_ledger(user, interview_balance=0)
+    elif user.get("role") == "mentee" and not user.get("quota_ledger_opened"):
+        await open_quota_ledger(user)
     
     logger.info(f"Login successful for user: {credentials.email}")
     token = create_token(user["id"], user["role"])
@@ -2994,6 +4858,11 @@ async def login(credentials: UserLogin):
 async def get_me(user=Depends(get_current_user)):
     return serialize_doc(dict(user))
 
+@api_router.post("/auth/stream-token")
+async def issue_stream_token(user=Depends(get_current_user)):
+    """Mint a token for opening one event stream; it is only checked when the stream connects"""
+    return {"token": create_stream_token(user["id"], user["role"]), "expires_in": STREAM_TOKEN_EXPIRE_SECONDS}
+
 # ============ ADMIN ROUTES ============
 
 # Admin User Management
@@ -3022,13 +4891,20 @@ async def update_user(user_id: str, updates: dict, user=Depends(get_current_user
     
     # Auto-update plan_name when plan_id changes
     if "plan_id" in update_data and update_data["plan_id"]:
-        plan = await db.pricing_plans.find_one({"plan_id": update_data["plan_id"]})
-        if plan:
-            update_data["plan_name"] = plan["name"]
+        plan_name = (await get_plan_catalog())["names"].get(update_data["plan_id"])
+        if plan_name:
+            update_data["plan_name"] = plan_name
     elif "plan_id" in update_data and not update_data["plan_id"]:
         # If plan_id is None/null, clear plan_name too
         update_data["plan_name"] = None
     
+    # Quota balances are changed through the ledger, not overwritten
+    quota_targets = {
+        quota_type: update_data.pop(field)
+        for quota_type, field in QUOTA_BALANCE_FIELDS.items()
+        if field in update_data
+    }
+    
     update_data["updated_at"] = datetime.now(timezone.utc).isoformat()
     
     result = await db.users.update_one(
@@ -3036,8 +4912,17 @@ async def update_user(user_id: str, updates: dict, user=Depends(get_current_user
         {"$set": update_data}
     )
     
-    if result.modified_count == 0:
+    if result.matched_count == 0:
         raise HTTPException(status_code=404, detail="User not found")
+    invalidate_cache_tags("mentors")
+    
+    for quota_type, target in quota_targets.items():
+        await set_quota_balance(
+            user_id, quota_type, int(target or 0),
+            idempotency_key=f"admin-set:{uuid.uuid4()}",
+            reason="Set by admin",
+            actor_id=user["id"]
+        )
     
     updated_user = await db.users.find_one({"id": user_id})
     return serialize_doc(updated_user)
@@ -3048,23 +4933,62 @@ async def increase_user_quota(user_id: str, data: dict, user=Depends(get_current
     if user["role"] != "admin":
         raise HTTPException(status_code=403, detail="Admin only")
     
-    quota_type = data.get("quota_type")  # "interview_quota_remaining" or "resume_review_quota"
-    amount = data.get("amount", 0)
+    quota_field = data.get("quota_type")  # "interview_quota_remaining" or "resume_review_quota"
+    amount = int(data.get("amount", 0))
     
-    if quota_type not in ["interview_quota_remaining", "resume_review_quota"]:
+    quota_type = next((t for t, field in QUOTA_BALANCE_FIELDS.items() if field == quota_field), None)
+    if not quota_type:
         raise HTTPException(status_code=400, detail="Invalid quota type")
     
-    result = await db.users.update_one(
-        {"id": user_id},
-        {"$inc": {quota_type: amount}}
-    )
+    if amount == 0:
+        raise HTTPException(status_code=400, detail="Amount must be non-zero")
     
-    if result.modified_count == 0:
-        raise HTTPException(status_code=404, detail="User not found")
+    try:
+        await record_quota_entry(
+            user_id, quota_type, "grant" if amount > 0 else "adjust", amount,
+            idempotency_key=data.get("idempotency_key") or f"admin-grant:{uuid.uuid4()}",
+            reason=data.get("reason") or "Granted by admin",
+            actor_id=user["id"]
+        )
+    except QuotaExhausted:
+        raise HTTPException(status_code=400, detail="Quota cannot go below zero")
     
     updated_user = await db.users.find_one({"id": user_id})
     return serialize_doc(updated_user)
 
+@api_router.get("/admin/users/{user_id}/quota-ledger")
+async def get_user_quota_ledger(user_id: str, user=Depends(get_current_user)):
+    """Audit a user's quota: ledger entries, ledger totals and cached balances"""
+    if user["role"] != "admin":
+        raise HTTPException(status_code=403, detail="Admin only")
+    
+    target = await db.users.find_one({"id": user_id})
+    if not target:
+        raise HTTPException(status_code=404, detail="User not found")
+    
+    entries = await db.quota_ledger.find({"user_id": user_id}).sort("created_at", 1).to_list(1000)
+    totals = await db.quota_ledger.aggregate(quota_balance_pipeline(user_id)).to_list(1)
+    ledger_balances = {field: (totals[0][field] if totals else 0) for field in QUOTA_BALANCE_FIELDS.values()}
+    cached_balances = {field: target.get(field) or 0 for field in QUOTA_BALANCE_FIELDS.values()}
+    
+    return {
+        "user_id": user_id,
+        "ledger_opened": bool(target.get("quota_ledger_opened")),
+        "ledger_balances": ledger_balances,
+        "cached_balances": cached_balances,
+        "in_sync": ledger_balances == cached_balances,
+        "entries": [serialize_doc(dict(e)) for e in entries]
+    }
+
+@api_router.post("/admin/quota/rebuild")
+async def rebuild_quota(data: dict, user=Depends(get_current_user)):
+    """Rebuild cached quota balances from the ledger (one user, or everyone if user_id is omitted)"""
+    if user["role"] != "admin":
+        raise HTTPException(status_code=403, detail="Admin only")
+    
+    await rebuild_quota_balances(data.get("user_id"))
+    return {"message": "Quota balances rebuilt from ledger"}
+
 # Admin Slot Management
 @api_router.get("/admin/all-slots")
 async def get_all_slots(user=Depends(get_current_user)):
@@ -3115,6 +5039,7 @@ async def admin_update_slot(slot_id: str, data: dict, user=Depends(get_current_u
         {"id": slot_id},
         {"$set": update_data}
     )
+    invalidate_cache_tags("time_slots")
     
     if result.modified_count == 0:
         raise HTTPException(status_code=404, detail="Slot not found")
@@ -3164,6 +5089,10 @@ async def admin_create_slot(data: dict, user=Depends(get_current_user)):
     if not mentor:
         raise HTTPException(status_code=404, detail="Mentor not found")
     
+    if not all([data.get("date"), data.get("start_time"), data.get("end_time")]):
+        raise HTTPException(status_code=400, detail="Missing required fields")
+    await ensure_no_slot_overlap(mentor_id, data["date"], data["start_time"], data["end_time"])
+    
     slot_doc = {
         "id": str(uuid.uuid4()),
         "mentor_id": mentor_id,
@@ -3184,6 +5113,9 @@ async def admin_create_slot(data: dict, user=Depends(get_current_user)):
         slot_doc["company_specializations"] = data.get("company_specializations", [])
         slot_doc["preparation_notes"] = data.get("preparation_notes", "")
         await db.time_slots.insert_one(slot_doc)
+        invalidate_cache_tags("time_slots")
+        # Holds only exist for mentor_slots, so admin-created slots are announced without one
+        asyncio.create_task(announce_new_slot(slot_doc, waitlist=False))
     else:
         await db.resume_review_slots.insert_one(slot_doc)
     
@@ -3288,14 +5220,35 @@ async def get_revenue_stats(user=Depends(get_current_user)):
         "recent_orders": [serialize_doc(dict(o)) for o in recent_orders]
     }
 
-# ============ BOOKING SYSTEM - ADMIN ROUTES ============
-@api_router.get("/admin/companies")
-async def get_companies(user=Depends(get_current_user)):
+@api_router.get("/admin/cache-stats")
+async def get_cache_stats(user=Depends(get_current_user)):
+    """Hit/miss/size counters for this worker's read caches and live streams"""
     if user["role"] != "admin":
         raise HTTPException(status_code=403, detail="Admin only")
+    return {
+        "pid": os.getpid(),
+        "caches": [cache.snapshot() for cache in READ_CACHES.values()],
+        "plan_catalog": {
+            "version": plan_catalog["version"],
+            "plans": len(plan_catalog["plans"]),
+            "etag": plan_catalog["etag"]
+        },
+        "live": live_hub.snapshot(),
+        "slot_stream": slot_index.snapshot()
+    }
+
+# ============ BOOKING SYSTEM - ADMIN ROUTES ============
+@cached("companies", ttl=300, maxsize=1, tags=("companies",))
+async def load_companies():
     companies = await db.companies.find().to_list(1000)
     return [serialize_doc(dict(c)) for c in companies]
 
+@api_router.get("/admin/companies")
+async def get_companies(request: Request, response: Response, user=Depends(get_current_user)):
+    if user["role"] != "admin":
+        raise HTTPException(status_code=403, detail="Admin only")
+    return await check_versions(request, response, ["companies"]) or await load_companies()
+
 @api_router.post("/admin/companies")
 async def create_company(data: CompanyCreate, user=Depends(get_current_user)):
     if user["role"] != "admin":
@@ -3308,6 +5261,8 @@ async def create_company(data: CompanyCreate, user=Depends(get_current_user)):
         "created_at": datetime.now(timezone.utc).isoformat()
     }
     await db.companies.insert_one(company_doc)
+    invalidate_cache_tags("companies")
+    await bump_version("companies")
     return serialize_doc(company_doc)
 
 @api_router.delete("/admin/companies/{company_id}")
@@ -3315,6 +5270,8 @@ async def delete_company(company_id: str, user=Depends(get_current_user)):
     if user["role"] != "admin":
         raise HTTPException(status_code=403, detail="Admin only")
     await db.companies.delete_one({"id": company_id})
+    invalidate_cache_tags("companies")
+    await bump_version("companies")
     return {"message": "Company deleted"}
 
 # ============ ADMIN BOOKING REQUESTS ============
@@ -3360,17 +5317,16 @@ async def admin_confirm_booking(data: AdminConfirmBookingRequest, user=Depends(g
     if not confirmed_slot:
         raise HTTPException(status_code=400, detail="Invalid slot selection")
     
-    # Auto-assign meeting link from pool
-    meet_link_doc = await get_available_meet_link()
+    # Auto-assign meeting link from pool (atomic lease)
+    meet_link_doc = await claim_meet_link(data.booking_request_id, confirmed_slot)
     if not meet_link_doc:
         raise HTTPException(status_code=400, detail="No available meeting links. Please add more meeting links first.")
     
     meeting_link = meet_link_doc["link"]
-    await assign_meet_link(meet_link_doc["id"], data.booking_request_id)
     
     # Update booking request with mentor assignment and confirmation
-    await db.booking_requests.update_one(
-        {"id": data.booking_request_id},
+    confirmed = await db.booking_requests.update_one(
+        {"id": data.booking_request_id, "status": "pending"},
         {"$set": {
             "status": "confirmed",
             "mentor_id": mentor["id"],
@@ -3383,9 +5339,14 @@ async def admin_confirm_booking(data: AdminConfirmBookingRequest, user=Depends(g
             "confirmed_by": user["id"]
         }}
     )
+    if confirmed.modified_count == 0:
+        # Confirmed concurrently by someone else - hand the link back
+        await release_meet_link_claim(meet_link_doc["id"], data.booking_request_id)
+        raise HTTPException(status_code=400, detail="Booking already processed")
     
     # Mark the slot as booked
     await db.time_slots.update_one({"id": data.confirmed_slot_id}, {"$set": {"status": "booked"}})
+    invalidate_cache_tags("time_slots")
     
     # Create a mock interview record
     mock_doc = {
@@ -3404,31 +5365,20 @@ async def admin_confirm_booking(data: AdminConfirmBookingRequest, user=Depends(g
     # Get mentee details
     mentee = await db.users.find_one({"id": request["mentee_id"]})
     
-    # Send confirmation emails
-    slot_time_str = f"{confirmed_slot['date']} at {confirmed_slot['start_time']} - {confirmed_slot['end_time']}"
-    
-    # Email to mentee with mentor details
-    if mentee:
-        asyncio.create_task(send_booking_confirmed_email(
-            recipient_name=mentee["name"],
-            recipient_email=mentee["email"],
-            company_name=request["company_name"],
-            slot_time=slot_time_str,
-            meeting_link=meeting_link,
-            is_mentor=False,
-            mentor_name=mentor["name"],
-            mentor_email=mentor["email"]
-        ))
-    
-    # Email to mentor
-    asyncio.create_task(send_booking_confirmed_email(
-        recipient_name=mentor["name"],
-        recipient_email=mentor["email"],
-        company_name=request["company_name"],
-        slot_time=slot_time_str,
-        meeting_link=meeting_link,
-        is_mentor=True
-    ))
+    # Confirmation emails run as event subscribers
+    await publish_event("booking.confirmed", data.booking_request_id, {
+        "mock_id": mock_doc["id"],
+        "mentee_id": request["mentee_id"],
+        "mentee_name": mentee["name"] if mentee else None,
+        "mentee_email": mentee["email"] if mentee else None,
+        "mentor_id": mentor["id"],
+        "mentor_name": mentor["name"],
+        "mentor_email": mentor["email"],
+        "company_name": request["company_name"],
+        "interview_type": request.get("interview_type"),
+        "slot_time": f"{confirmed_slot['date']} at {confirmed_slot['start_time']} - {confirmed_slot['end_time']}",
+        "meeting_link": meeting_link
+    })
     
     return {
         "message": "Booking confirmed successfully", 
@@ -3437,23 +5387,179 @@ async def admin_confirm_booking(data: AdminConfirmBookingRequest, user=Depends(g
         "mentor_name": mentor["name"]
     }
 
-# ============ ADMIN PRICING MANAGEMENT ============
-@api_router.get("/admin/pricing-plans")
-async def get_pricing_plans(user=Depends(get_current_user)):
-    if user["role"] != "admin":
-        raise HTTPException(status_code=403, detail="Admin only")
-    plans = await db.pricing_plans.find().sort("display_order", 1).to_list(100)
-    return [serialize_doc(dict(p)) for p in plans]
+# ============ PLAN CATALOG ============
+# Prices, durations, quotas and feature flags for every purchasable plan live in
+# one in-memory catalog. It is rebuilt from pricing_plans at startup and whenever
+# the admin pricing routes bump the shared version in cache_versions, so every
+# worker picks up a change within PLAN_CATALOG_CHECK_SECONDS.
+PLAN_CATALOG_VERSION_ID = "plan_catalog"
+PLAN_CATALOG_CHECK_SECONDS = 5
+
+FREE_PLAN_FEATURES = {
+    "mock_interviews": 0, "resume_reviews": 0, "resume_review_type": "none", "offline_profile_creation": 0,
+    "ai_tools_access": "none", "community_access": False, "priority_support": False,
+    "strategy_calls": 0, "referral_guidance": False
+}
 
-@api_router.post("/admin/pricing-plans")
-async def create_pricing_plan(data: PricingPlanCreate, user=Depends(get_current_user)):
-    if user["role"] != "admin":
-        raise HTTPException(status_code=403, detail="Admin only")
-    
-    # Check if plan_id already exists
-    existing = await db.pricing_plans.find_one({"plan_id": data.plan_id})
-    if existing:
-        raise HTTPException(status_code=400, detail="Plan ID already exists")
+# Quota and feature flags of each plan tier, shared by the tier's current and legacy plans
+STARTER_TIER = {
+    "interview_quota_total": 1,
+    "plan_features": {
+        "mock_interviews": 1, "resume_reviews": 1, "resume_review_type": "email", "offline_profile_creation": 0,
+        "ai_tools_access": "limited", "community_access": False, "priority_support": False,
+        "strategy_calls": 0, "referral_guidance": False
+    }
+}
+PRO_TIER = {
+    "interview_quota_total": 3,
+    "plan_features": {
+        "mock_interviews": 3, "resume_reviews": 1, "resume_review_type": "call", "offline_profile_creation": 0,
+        "ai_tools_access": "full", "community_access": True, "priority_support": False,
+        "strategy_calls": 1, "referral_guidance": False
+    }
+}
+ELITE_TIER = {
+    "interview_quota_total": 6,
+    "plan_features": {
+        "mock_interviews": 6, "resume_reviews": 1, "resume_review_type": "call", "offline_profile_creation": 1,
+        "ai_tools_access": "full", "community_access": True, "priority_support": True,
+        "strategy_calls": 0, "referral_guidance": True
+    }
+}
+
+def mock_addon_tier(mocks: int) -> dict:
+    return {"mock_interviews": mocks, "interview_quota_total": mocks, "plan_features": {**FREE_PLAN_FEATURES, "mock_interviews": mocks}}
+
+# Plans that exist without a pricing_plans document: the launch plans (and legacy
+# ids still referenced by old orders) plus the mock interview add-ons
+BUILTIN_PLANS = {
+    # New minimal launch plans
+    "foundation": {"price": 199900, "name": "Foundation Plan", "duration_months": 1, **STARTER_TIER},     # ₹1,999
+    "growth": {"price": 499900, "name": "Growth Plan", "duration_months": 3, **PRO_TIER},                 # ₹4,999
+    "accelerator": {"price": 899900, "name": "Accelerator Plan", "duration_months": 6, **ELITE_TIER},     # ₹8,999
+    # Legacy support for old plan IDs - DEPRECATED: Use dynamic pricing
+    "starter": {"price": 199900, "name": "Starter Plan", "duration_months": 1, **STARTER_TIER},
+    "professional": {"price": 499900, "name": "Professional Plan", "duration_months": 3, **PRO_TIER},
+    "premium": {"price": 899900, "name": "Premium Plan", "duration_months": 6, **ELITE_TIER},
+    "monthly": {"price": 199900, "name": "Monthly Plan", "duration_months": 1, **STARTER_TIER},
+    "quarterly": {"price": 499900, "name": "3 Months Plan", "duration_months": 3, **PRO_TIER},
+    "biannual": {"price": 899900, "name": "6 Months Plan", "duration_months": 6, **ELITE_TIER},
+    # Mock add-on plans
+    "mock_1": {"price": 249900, "name": "1 Mock Interview", "duration_months": 0, **mock_addon_tier(1)},
+    "mock_3": {"price": 699900, "name": "3 Mock Interviews", "duration_months": 0, **mock_addon_tier(3)},
+    "mock_5": {"price": 1099900, "name": "5 Mock Interviews", "duration_months": 0, **mock_addon_tier(5)}
+}
+
+# Tier ids older users may still carry as plan_id; they were never sold under these ids
+LEGACY_TIER_PLANS = {"pro": "professional", "elite": "premium"}
+
+plan_catalog = {
+    "version": None,
+    "checked_at": 0.0,
+    "plans": {},         # plan_id -> purchasable plan (active DB plans override built-ins)
+    "names": {},         # plan_id -> display name, including inactive DB plans
+    "public_body": b"[]",
+    "etag": None
+}
+_plan_catalog_lock = asyncio.Lock()
+
+async def load_plan_catalog(version: Optional[int] = None):
+    """Rebuild the catalog from pricing_plans and the built-in plans"""
+    if version is None:
+        version = (await current_versions(PLAN_CATALOG_VERSION_ID))[PLAN_CATALOG_VERSION_ID]
+    db_plans = await db.pricing_plans.find().sort("display_order", 1).to_list(100)
+    
+    plans = {}
+    for plan_id, plan in BUILTIN_PLANS.items():
+        plans[plan_id] = {"plan_id": plan_id, "features": [], **plan}
+    names = {plan_id: plan["name"] for plan_id, plan in plans.items()}
+    public = []
+    for plan in db_plans:
+        names[plan["plan_id"]] = plan["name"]
+        if not plan.get("is_active"):
+            continue
+        # Quota and feature flags come from the document, else the built-in plan it
+        # overrides, else the starter tier
+        base = plans.get(plan["plan_id"], STARTER_TIER)
+        plans[plan["plan_id"]] = {
+            **plans.get(plan["plan_id"], {}),
+            "plan_id": plan["plan_id"],
+            "price": plan["price"],
+            "name": plan["name"],
+            "duration_months": plan["duration_months"],
+            "features": plan.get("features", []),
+            "interview_quota_total": plan.get("interview_quota_total", base["interview_quota_total"]),
+            "plan_features": plan.get("plan_features") or base["plan_features"]
+        }
+        public.append(serialize_doc(dict(plan)))
+    
+    # The landing page payload is encoded once per catalog version, not per view
+    public_body = json.dumps(jsonable_encoder(public), separators=(",", ":")).encode()
+    plan_catalog.update({
+        "version": version,
+        "checked_at": time.monotonic(),
+        "plans": plans,
+        "names": names,
+        "public_body": public_body,
+        "etag": f'"{hashlib.sha1(public_body).hexdigest()}"'
+    })
+    logger.info(f"Plan catalog loaded: version {version}, {len(plans)} plans, {len(public)} public")
+
+async def get_plan_catalog() -> dict:
+    """Return the catalog, reloading it if another worker bumped the version"""
+    if time.monotonic() - plan_catalog["checked_at"] < PLAN_CATALOG_CHECK_SECONDS:
+        return plan_catalog
+    async with _plan_catalog_lock:
+        # Another request may have refreshed it while we waited for the lock
+        if time.monotonic() - plan_catalog["checked_at"] < PLAN_CATALOG_CHECK_SECONDS:
+            return plan_catalog
+        version = (await current_versions(PLAN_CATALOG_VERSION_ID))[PLAN_CATALOG_VERSION_ID]
+        if version != plan_catalog["version"]:
+            await load_plan_catalog(version)
+        else:
+            plan_catalog["checked_at"] = time.monotonic()
+    return plan_catalog
+
+async def invalidate_plan_catalog():
+    """Bump the shared version so every worker reloads, then reload this one"""
+    version = await bump_version(PLAN_CATALOG_VERSION_ID)
+    async with _plan_catalog_lock:
+        await load_plan_catalog(version)
+
+async def get_pricing_plan(plan_id: str):
+    """Get a purchasable plan (price, name, duration, features) from the catalog"""
+    plan = (await get_plan_catalog())["plans"].get(plan_id)
+    return dict(plan) if plan else None
+
+async def plan_entitlements(plan_id: Optional[str], fallback: bool = True) -> Optional[dict]:
+    """Quota and feature flags of a catalog plan; unknown plans get the starter allowance"""
+    plan = (await get_plan_catalog())["plans"].get(LEGACY_TIER_PLANS.get(plan_id, plan_id))
+    if plan is None and fallback:
+        plan = STARTER_TIER
+    if plan is None:
+        return None
+    return {
+        "interview_quota_total": plan["interview_quota_total"],
+        "plan_features": dict(plan["plan_features"])
+    }
+
+# ============ ADMIN PRICING MANAGEMENT ============
+@api_router.get("/admin/pricing-plans")
+async def get_pricing_plans(user=Depends(get_current_user)):
+    if user["role"] != "admin":
+        raise HTTPException(status_code=403, detail="Admin only")
+    plans = await db.pricing_plans.find().sort("display_order", 1).to_list(100)
+    return [serialize_doc(dict(p)) for p in plans]
+
+@api_router.post("/admin/pricing-plans")
+async def create_pricing_plan(data: PricingPlanCreate, user=Depends(get_current_user)):
+    if user["role"] != "admin":
+        raise HTTPException(status_code=403, detail="Admin only")
+    
+    # Check if plan_id already exists
+    existing = await db.pricing_plans.find_one({"plan_id": data.plan_id})
+    if existing:
+        raise HTTPException(status_code=400, detail="Plan ID already exists")
     
     plan_doc = {
         "id": str(uuid.uuid4()),
@@ -3468,7 +5574,12 @@ async def create_pricing_plan(data: PricingPlanCreate, user=Depends(get_current_
         "created_at": datetime.now(timezone.utc).isoformat(),
         "updated_at": datetime.now(timezone.utc).isoformat()
     }
+    if data.interview_quota_total is not None:
+        plan_doc["interview_quota_total"] = data.interview_quota_total
+    if data.plan_features is not None:
+        plan_doc["plan_features"] = data.plan_features
     await db.pricing_plans.insert_one(plan_doc)
+    await invalidate_plan_catalog()
     return serialize_doc(plan_doc)
 
 @api_router.put("/admin/pricing-plans/{plan_id}")
@@ -3484,6 +5595,7 @@ async def update_pricing_plan(plan_id: str, data: PricingPlanUpdate, user=Depend
     if update_data:
         update_data["updated_at"] = datetime.now(timezone.utc).isoformat()
         await db.pricing_plans.update_one({"plan_id": plan_id}, {"$set": update_data})
+        await invalidate_plan_catalog()
     
     updated_plan = await db.pricing_plans.find_one({"plan_id": plan_id})
     return serialize_doc(dict(updated_plan))
@@ -3497,20 +5609,17 @@ async def delete_pricing_plan(plan_id: str, user=Depends(get_current_user)):
     if result.deleted_count == 0:
         raise HTTPException(status_code=404, detail="Pricing plan not found")
     
+    await invalidate_plan_catalog()
     return {"message": "Pricing plan deleted successfully"}
 
 # ============ PUBLIC PRICING ROUTES ============
 @api_router.get("/pricing-plans")
-async def get_public_pricing_plans(response: Response):
-    """Get active pricing plans for public display"""
-    # Prevent caching to ensure fresh data
-    response.headers["Cache-Control"] = "no-cache, no-store, must-revalidate, max-age=0"
-    response.headers["Pragma"] = "no-cache"
-    response.headers["Expires"] = "0"
-    
-    plans = await db.pricing_plans.find({"is_active": True}).sort("display_order", 1).to_list(100)
-    result = [serialize_doc(dict(p)) for p in plans]
-    return result
+async def get_public_pricing_plans(request: Request):
+    """Get active pricing plans for public display (served from the plan catalog)"""
+    catalog = await get_plan_catalog()
+    # Browsers revalidate on every view; an unchanged catalog costs a 304 and no body
+    response = Response(content=catalog["public_body"], media_type="application/json")
+    return not_modified(request, response, catalog["etag"], "public, no-cache") or response
 
 # ============ MEET LINKS MANAGEMENT ============
 @api_router.get("/admin/meet-links")
@@ -3560,23 +5669,215 @@ async def release_meet_link(link_id: str, user=Depends(get_current_user)):
     
     await db.meet_links.update_one(
         {"id": link_id},
-        {"$set": {"status": "available", "current_booking_id": None}}
+        {"$set": {
+            "status": "available",
+            "current_booking_id": None,
+            "lease_expires_at": None,
+            "released_at": datetime.now(timezone.utc)
+        }}
     )
     return {"message": "Meet link released"}
 
-async def get_available_meet_link():
-    """Get an available meet link from the pool"""
-    link = await db.meet_links.find_one({"status": "available"})
+@api_router.get("/admin/meet-links/pool-stats")
+async def get_meet_link_pool_stats(days: int = 30, user=Depends(get_current_user)):
+    """
+    Pool utilization and an exhaustion forecast from the claim history.
+    Uses the trailing claim rate and the scheduled lease releases to project
+    free links per day, and Little's law (claim rate x average hold time) for
+    the steady-state pool size.
+    """
+    if user["role"] != "admin":
+        raise HTTPException(status_code=403, detail="Admin only")
+    
+    days = max(1, min(days, 90))
+    now = datetime.now(timezone.utc)
+    
+    status_counts = await db.meet_links.aggregate([
+        {"$group": {"_id": "$status", "count": {"$sum": 1}}}
+    ]).to_list(None)
+    counts = {c["_id"]: c["count"] for c in status_counts}
+    total = sum(counts.values())
+    in_use = counts.get("in_use", 0)
+    
+    # Leases already running, bucketed by the day they will be released
+    leases = await db.meet_links.find(
+        {"status": "in_use", "lease_expires_at": {"$ne": None}},
+        {"_id": 0, "lease_expires_at": 1}
+    ).to_list(1000)
+    releases_by_day = {}
+    for lease in leases:
+        expires = lease["lease_expires_at"].replace(tzinfo=timezone.utc)  # Mongo returns naive UTC
+        day = max(0, (expires - now).days)
+        releases_by_day[day] = releases_by_day.get(day, 0) + 1
+    
+    history = await db.meet_link_claims.aggregate([
+        {"$match": {"created_at": {"$gte": now - timedelta(days=days)}}},
+        {"$group": {
+            "_id": "$outcome",
+            "count": {"$sum": 1},
+            "avg_hold_ms": {"$avg": {"$subtract": ["$lease_expires_at", "$created_at"]}}
+        }}
+    ]).to_list(None)
+    outcomes = {h["_id"]: h for h in history}
+    claims = outcomes.get("claimed", {}).get("count", 0)
+    exhausted = outcomes.get("exhausted", {}).get("count", 0)
+    daily_claim_rate = (claims + exhausted) / days
+    avg_hold_days = (outcomes.get("claimed", {}).get("avg_hold_ms") or 0) / 86400000
+    
+    # Project free links day by day; new claims are assumed to outlast the horizon
+    free = total - in_use
+    days_until_exhaustion = None
+    for day in range(days):
+        free += releases_by_day.get(day, 0) - daily_claim_rate
+        if free < 0:
+            days_until_exhaustion = day
+            break
+    
+    steady_state_in_use = daily_claim_rate * avg_hold_days
+    return {
+        "total": total,
+        "in_use": in_use,
+        "available": counts.get("available", 0),
+        "utilization": round(in_use / total, 3) if total else None,
+        "expired_unreleased": await db.meet_links.count_documents(
+            {"status": "in_use", "lease_expires_at": {"$lte": now}}
+        ),
+        "window_days": days,
+        "claims": claims,
+        "exhaustion_events": exhausted,
+        "daily_claim_rate": round(daily_claim_rate, 2),
+        "avg_hold_days": round(avg_hold_days, 2),
+        "scheduled_releases": [
+            {"days_out": day, "count": count} for day, count in sorted(releases_by_day.items())
+        ],
+        "forecast": {
+            "days_until_exhaustion": days_until_exhaustion,
+            "steady_state_in_use": round(steady_state_in_use, 1),
+            "recommended_pool_size": max(in_use, math.ceil(steady_state_in_use * 1.2))
+        }
+    }
+
+# A link is leased from confirmation until the session ends plus a grace period
+# for overruns. Claims are a single find_one_and_update, so two confirmations can
+# never receive the same link; expired leases are released in bulk by the scheduler.
+MEET_LINK_LEASE_GRACE = timedelta(minutes=30)
+MEET_LINK_RELEASE_INTERVAL_MINUTES = 5
+
+def meet_link_lease_expiry(confirmed_slot: dict) -> datetime:
+    """Lease end for a confirmed slot: session end + grace period"""
+    return parse_session_datetime(confirmed_slot["date"], confirmed_slot["end_time"]) + MEET_LINK_LEASE_GRACE
+
+async def claim_meet_link(booking_request_id: str, confirmed_slot: dict):
+    """
+    Atomically lease a free link (available, or in use with an expired lease) for
+    a booking request. Every attempt is logged to meet_link_claims for pool sizing.
+    Returns None when the pool is exhausted.
+    """
+    now = datetime.now(timezone.utc)
+    lease_expires_at = meet_link_lease_expiry(confirmed_slot)
+    link = await db.meet_links.find_one_and_update(
+        {"$or": [
+            {"status": "available"},
+            {"status": "in_use", "lease_expires_at": {"$lte": now}}
+        ]},
+        {
+            "$set": {
+                "status": "in_use",
+                "current_booking_id": booking_request_id,
+                "claimed_at": now,
+                "lease_expires_at": lease_expires_at
+            },
+            "$inc": {"claim_count": 1}
+        },
+        sort=[("claimed_at", ASCENDING)],  # least recently used first
+        return_document=ReturnDocument.AFTER
+    )
+    
+    await db.meet_link_claims.insert_one({
+        "id": str(uuid.uuid4()),
+        "link_id": link["id"] if link else None,
+        "booking_request_id": booking_request_id,
+        "outcome": "claimed" if link else "exhausted",
+        "session_start": parse_session_datetime(confirmed_slot["date"], confirmed_slot["start_time"]),
+        "lease_expires_at": lease_expires_at,
+        "created_at": now
+    })
+    if not link:
+        logger.warning(f"Meet link pool exhausted while confirming booking request {booking_request_id}")
     return link
 
-async def assign_meet_link(link_id: str, booking_id: str):
-    """Mark a meet link as in use"""
+async def release_meet_link_claim(link_id: str, booking_request_id: str):
+    """Give a link back, but only if it is still leased to this booking request"""
     await db.meet_links.update_one(
-        {"id": link_id},
-        {"$set": {"status": "in_use", "current_booking_id": booking_id}}
+        {"id": link_id, "current_booking_id": booking_request_id},
+        {"$set": {
+            "status": "available",
+            "current_booking_id": None,
+            "lease_expires_at": None,
+            "released_at": datetime.now(timezone.utc)
+        }}
     )
 
+async def release_expired_meet_links():
+    """Scheduled job: return every link whose lease has ended to the pool in one update"""
+    now = datetime.now(timezone.utc)
+    try:
+        result = await db.meet_links.update_many(
+            {"status": "in_use", "lease_expires_at": {"$lte": now}},
+            {"$set": {
+                "status": "available",
+                "current_booking_id": None,
+                "lease_expires_at": None,
+                "released_at": now
+            }}
+        )
+        if result.modified_count:
+            logger.info(f"Released {result.modified_count} meet links with expired leases")
+    except Exception as e:
+        logger.error(f"Error releasing meet links: {str(e)}")
+
+async def backfill_meet_link_leases():
+    """Give links assigned before leases existed a lease derived from their booking request"""
+    links = await db.meet_links.find(
+        {"status": "in_use", "lease_expires_at": {"$exists": False}},
+        {"_id": 0, "id": 1, "current_booking_id": 1}
+    ).to_list(1000)
+    if not links:
+        return
+    
+    requests = await db.booking_requests.find(
+        {"id": {"$in": [l["current_booking_id"] for l in links if l.get("current_booking_id")]}},
+        {"_id": 0, "id": 1, "confirmed_slot": 1}
+    ).to_list(1000)
+    slots = {r["id"]: r.get("confirmed_slot") for r in requests}
+    
+    leased = 0
+    for link in links:
+        slot = slots.get(link.get("current_booking_id"))
+        if not slot:
+            continue  # No session to derive a lease from - leave for manual release
+        try:
+            lease_expires_at = meet_link_lease_expiry(slot)
+        except (KeyError, ValueError):
+            continue
+        await db.meet_links.update_one(
+            {"id": link["id"], "lease_expires_at": {"$exists": False}},
+            {"$set": {"lease_expires_at": lease_expires_at}}
+        )
+        leased += 1
+    if leased:
+        logger.info(f"Backfilled leases for {leased} meet links")
+
 # ============ BUG REPORT / SUPPORT REQUEST SYSTEM ============
+BUG_REPORT_CHANNEL = "admin:bug_reports"
+BUG_REPORT_STREAM_EVENTS = {"bug_report.created": "bug_report_created", "bug_report.updated": "bug_report_updated"}
+BUG_REPORT_REPLAY_LIMIT = 500
+# Sequence numbers are taken before the event is stored and events dispatch
+# concurrently, so a client can receive seq N+1 before N. Resuming replays this
+# many bug report events at or below Last-Event-ID too; the client applies them
+# idempotently.
+BUG_REPORT_REPLAY_OVERLAP = 20
+
 @api_router.post("/bug-reports")
 async def create_bug_report(data: BugReportCreate):
     """Create a bug report - accessible to all users (authenticated or not)"""
@@ -3599,6 +5900,8 @@ async def create_bug_report(data: BugReportCreate):
     }
     
     await db.bug_reports.insert_one(bug_report)
+    await bump_version("bug_reports")
+    await publish_event("bug_report.created", bug_report["id"], serialize_doc(dict(bug_report)))
     
     # Send email notification to admin
     try:
@@ -3615,14 +5918,56 @@ async def create_support_request(data: BugReportCreate):
     return await create_bug_report(data)
 
 @api_router.get("/admin/bug-reports")
-async def get_bug_reports(user=Depends(get_current_user)):
+async def get_bug_reports(request: Request, response: Response, user=Depends(get_current_user)):
     """Get all bug reports - admin only"""
     if user["role"] != "admin":
         raise HTTPException(status_code=403, detail="Admin only")
     
+    unchanged = await check_versions(request, response, ["bug_reports"])
+    if unchanged:
+        return unchanged
     bug_reports = await db.bug_reports.find().sort("created_at", -1).to_list(1000)
     return [serialize_doc(dict(b)) for b in bug_reports]
 
+@api_router.get("/admin/bug-reports/stream")
+async def stream_bug_reports(request: Request, last_event_id: Optional[int] = None, user=Depends(get_stream_user)):
+    """
+    Live feed of new and updated bug reports - admin only.
+    Event ids are domain event sequence numbers, so a reconnecting client
+    (Last-Event-ID header, or ?last_event_id=) gets what it missed replayed first.
+    A fresh connection starts with a `sync` event carrying the current sequence
+    number, so even a client that has seen no reports yet can resume.
+    """
+    if user["role"] != "admin":
+        raise HTTPException(status_code=403, detail="Admin only")
+    
+    header = request.headers.get("last-event-id")
+    if header and header.isdigit():
+        last_event_id = int(header)
+    
+    async def replay_missed():
+        if last_event_id is None:
+            # Fresh connection: the client loads the full list, so just hand it the
+            # current position to resume from if the connection drops
+            latest = await db.domain_events.find_one(sort=[("seq", -1)])
+            return [{"event": "sync", "data": {}, "id": latest["seq"] if latest else 0}]
+        overlap = await db.domain_events.find(
+            {"type": {"$in": list(BUG_REPORT_STREAM_EVENTS)}, "seq": {"$lte": last_event_id}}
+        ).sort("seq", -1).limit(BUG_REPORT_REPLAY_OVERLAP).to_list(BUG_REPORT_REPLAY_OVERLAP)
+        missed = await db.domain_events.find(
+            {"type": {"$in": list(BUG_REPORT_STREAM_EVENTS)}, "seq": {"$gt": last_event_id}}
+        ).sort("seq", 1).limit(BUG_REPORT_REPLAY_LIMIT + 1).to_list(BUG_REPORT_REPLAY_LIMIT + 1)
+        if len(missed) > BUG_REPORT_REPLAY_LIMIT:
+            # Too far behind to catch up event by event; the client refetches the list
+            latest = await db.domain_events.find_one(sort=[("seq", -1)])
+            return [{"event": "reset", "data": {}, "id": latest["seq"]}]
+        return [
+            {"event": BUG_REPORT_STREAM_EVENTS[event["type"]], "data": event["payload"], "id": event["seq"]}
+            for event in overlap[::-1] + missed
+        ]
+    
+    return sse_response(request, BUG_REPORT_CHANNEL, replay_missed)
+
 @api_router.get("/bug-reports/my")
 async def get_my_bug_reports(user=Depends(get_current_user)):
     """Get bug reports submitted by current user"""
@@ -3645,39 +5990,72 @@ async def update_bug_status(bug_id: str, data: dict, user=Depends(get_current_us
         raise HTTPException(status_code=404, detail="Bug report not found")
     
     # Update status
+    updated_at = datetime.now(timezone.utc).isoformat()
     await db.bug_reports.update_one(
         {"id": bug_id},
-        {"$set": {"status": status, "updated_at": datetime.now(timezone.utc).isoformat()}}
+        {"$set": {"status": status, "updated_at": updated_at}}
     )
+    await bump_version("bug_reports")
+    await publish_event("bug_report.updated", bug_id, {"id": bug_id, "status": status, "updated_at": updated_at})
     
     # Create notification for the reporter
-    notification = {
-        "id": str(uuid.uuid4()),
-        "user_id": bug_report["reporter_id"],
-        "type": "bug_status_update",
-        "title": "Bug Report Status Updated",
-        "message": f"Your bug report '{bug_report['title']}' has been marked as {status.replace('_', ' ')}",
-        "read": False,
-        "created_at": datetime.now(timezone.utc).isoformat()
-    }
-    await db.notifications.insert_one(notification)
+    await create_notification(
+        bug_report["reporter_id"], "bug_status_update", "Bug Report Status Updated",
+        f"Your bug report '{bug_report['title']}' has been marked as {status.replace('_', ' ')}"
+    )
     
     return {"message": "Bug report status updated"}
 
 # ============ NOTIFICATION SYSTEM ============
 @api_router.get("/notifications")
-async def get_notifications(user=Depends(get_current_user)):
-    """Get notifications for current user"""
+async def get_notifications(request: Request, response: Response, user=Depends(get_current_user)):
+    """Get notifications for current user, with the broadcasts addressed to them merged in"""
+    broadcasts = await get_broadcasts()
+    # The broadcast version in the ETag is the one this worker actually serves
+    unchanged = await check_versions(
+        request, response, [notifications_scope(user["id"])],
+        user["id"], broadcasts["version"], user.get("role"), user.get("plan_id"), user.get("status")
+    )
+    if unchanged:
+        return unchanged
     notifications = await db.notifications.find({"user_id": user["id"]}).sort("created_at", -1).limit(50).to_list(50)
-    return [serialize_doc(dict(n)) for n in notifications]
+    notifications = [serialize_doc(dict(n)) for n in notifications]
+    if broadcasts["items"]:
+        watermarks = await get_broadcast_watermarks(user["id"])
+        notifications += user_broadcasts(user, broadcasts["items"], watermarks)
+        notifications.sort(key=lambda n: n["created_at"], reverse=True)
+    return notifications[:50]
+
+@api_router.get("/notifications/stream")
+async def stream_notifications(request: Request, user=Depends(get_stream_user)):
+    """Push new notifications (and read/clear changes from other tabs) as server-sent events"""
+    channel = user_channel(user["id"])
+    queue = live_hub.subscribe(channel)
+    # New broadcasts only carry a version; clients refetch, which applies the audience filter
+    live_hub.subscribe(BROADCAST_CHANNEL, queue)
+    
+    def close():
+        live_hub.unsubscribe(channel, queue)
+        live_hub.unsubscribe(BROADCAST_CHANNEL, queue)
+    
+    return sse_stream(request, queue, close)
 
 @api_router.put("/notifications/{notification_id}/read")
 async def mark_notification_read(notification_id: str, user=Depends(get_current_user)):
     """Mark notification as read"""
-    await db.notifications.update_one(
-        {"id": notification_id, "user_id": user["id"]},
-        {"$set": {"read": True}}
+    result = await db.notifications.update_one(
+        {"id": notification_id, "user_id": user["id"], "read": False},
+        {"$set": {"read": True, "read_at": datetime.now(timezone.utc)}}
     )
+    if result.modified_count:
+        await adjust_unread_count(user["id"], -1)
+    elif result.matched_count == 0:
+        broadcast = next((b for b in (await get_broadcasts())["items"] if b["id"] == notification_id), None)
+        if broadcast:
+            # Watermark semantics: reading a broadcast also reads the older ones
+            await advance_broadcast_watermarks(user["id"], read_at=broadcast["created_at"])
+    await bump_version(notifications_scope(user["id"]))
+    await publish_live(user_channel(user["id"]), "notification_read", {"id": notification_id})
     return {"message": "Notification marked as read"}
 
 @api_router.put("/notifications/mark-all-read")
@@ -3685,22 +6063,81 @@ async def mark_all_notifications_read(user=Depends(get_current_user)):
     """Mark all notifications as read for current user"""
     result = await db.notifications.update_many(
         {"user_id": user["id"], "read": False},
-        {"$set": {"read": True}}
+        {"$set": {"read": True, "read_at": datetime.now(timezone.utc)}}
     )
+    await reset_unread_count(user["id"])
+    await advance_broadcast_watermarks(user["id"], read_at=datetime.now(timezone.utc).isoformat())
+    await bump_version(notifications_scope(user["id"]))
+    await publish_live(user_channel(user["id"]), "notifications_read_all", {})
     return {"message": f"Marked {result.modified_count} notifications as read"}
 
 @api_router.delete("/notifications/clear-all")
 async def clear_all_notifications(user=Depends(get_current_user)):
     """Delete all notifications for current user"""
     result = await db.notifications.delete_many({"user_id": user["id"]})
+    await reset_unread_count(user["id"], total=0)
+    now = datetime.now(timezone.utc).isoformat()
+    await advance_broadcast_watermarks(user["id"], read_at=now, cleared_at=now)
+    await bump_version(notifications_scope(user["id"]))
+    await publish_live(user_channel(user["id"]), "notifications_cleared", {})
     return {"message": f"Cleared {result.deleted_count} notifications"}
 
 @api_router.get("/notifications/unread/count")
 async def get_unread_count(user=Depends(get_current_user)):
     """Get count of unread notifications"""
-    count = await db.notifications.count_documents({"user_id": user["id"], "read": False})
+    count = await get_unread_count_for(user["id"])
+    broadcasts = (await get_broadcasts())["items"]
+    if broadcasts:
+        watermarks = await get_broadcast_watermarks(user["id"])
+        count += sum(1 for b in user_broadcasts(user, broadcasts, watermarks) if not b["read"])
     return {"count": count}
 
+@api_router.get("/notifications/archive")
+async def get_notification_archive(months: int = 3, user=Depends(get_current_user)):
+    """Archived notifications (title and type only), newest month first"""
+    buckets = await db.notification_archive.find(
+        {"user_id": user["id"]}, {"_id": 0}
+    ).sort("month", DESCENDING).limit(max(1, min(months, 24))).to_list(24)
+    for bucket in buckets:
+        bucket["entries"].sort(key=lambda entry: entry.get("created_at") or "", reverse=True)
+    return buckets
+
+@api_router.post("/admin/broadcasts")
+async def create_broadcast(data: BroadcastCreate, user=Depends(get_current_user)):
+    """Announce something to every user matching the audience filter (stored once)"""
+    if user["role"] != "admin":
+        raise HTTPException(status_code=403, detail="Admin only")
+    
+    broadcast = {
+        "id": str(uuid.uuid4()),
+        "title": data.title,
+        "message": data.message,
+        "audience": {"roles": data.roles, "plans": data.plans, "statuses": data.statuses},
+        "created_by": user["id"],
+        "created_at": datetime.now(timezone.utc).isoformat()
+    }
+    await db.broadcasts.insert_one(broadcast)
+    await invalidate_broadcasts()
+    return serialize_doc(broadcast)
+
+@api_router.get("/admin/broadcasts")
+async def get_broadcasts_admin(user=Depends(get_current_user)):
+    """List broadcasts, newest first"""
+    if user["role"] != "admin":
+        raise HTTPException(status_code=403, detail="Admin only")
+    return await db.broadcasts.find({}, {"_id": 0}).sort("created_at", -1).to_list(500)
+
+@api_router.delete("/admin/broadcasts/{broadcast_id}")
+async def delete_broadcast(broadcast_id: str, user=Depends(get_current_user)):
+    """Retract a broadcast from every user's notifications"""
+    if user["role"] != "admin":
+        raise HTTPException(status_code=403, detail="Admin only")
+    result = await db.broadcasts.delete_one({"id": broadcast_id})
+    if result.deleted_count == 0:
+        raise HTTPException(status_code=404, detail="Broadcast not found")
+    await invalidate_broadcasts()
+    return {"message": "Broadcast deleted"}
+
 # ============ ADMIN RESUME REVIEW MANAGEMENT ============
 @api_router.get("/admin/resume-requests")
 async def get_all_resume_requests(user=Depends(get_current_user)):
@@ -3748,10 +6185,37 @@ async def update_resume_status(request_id: str, data: dict, user=Depends(get_cur
     if not status or status not in ["pending", "in_review", "completed", "cancelled"]:
         raise HTTPException(status_code=400, detail="Invalid status")
     
-    await db.resume_requests.update_one(
-        {"id": request_id},
-        {"$set": {"status": status, "updated_at": datetime.now(timezone.utc).isoformat()}}
-    )
+    request = await db.resume_requests.find_one({"id": request_id}, {"_id": 0, "status": 1, "mentee_id": 1})
+    if not request:
+        raise HTTPException(status_code=404, detail="Resume request not found")
+    
+    async def commit_status(session):
+        updated = await db.resume_requests.update_one(
+            {"id": request_id, "status": request["status"]},
+            {"$set": {"status": status, "updated_at": datetime.now(timezone.utc).isoformat()}},
+            session=session
+        )
+        if updated.modified_count == 0:
+            return
+        
+        # Cancelling a request gives the review back; reopening it takes one again
+        cancelling = status == "cancelled" and request["status"] != "cancelled"
+        reopening = request["status"] == "cancelled" and status != "cancelled"
+        if cancelling or reopening:
+            await record_quota_entry(
+                request["mentee_id"], "resume_review",
+                "refund" if cancelling else "consume", 1 if cancelling else -1,
+                idempotency_key=f"resume_request:{request_id}:{status}:{uuid.uuid4()}",
+                reason=f"Resume request marked {status} by admin",
+                ref_id=request_id,
+                actor_id=user["id"],
+                session=session
+            )
+    
+    try:
+        await run_in_transaction(commit_status)
+    except QuotaExhausted:
+        raise HTTPException(status_code=400, detail="Mentee has no resume reviews left to reopen this request")
     return {"message": "Resume request status updated"}
 
 @api_router.post("/admin/resume-requests/{request_id}/feedback")
@@ -3875,32 +6339,57 @@ async def download_reference_resume(
 
 # ============ BOOKING SYSTEM - PUBLIC/MENTEE ROUTES ============
 @api_router.get("/companies")
-async def get_public_companies():
-    companies = await db.companies.find().to_list(1000)
-    return [serialize_doc(dict(c)) for c in companies]
+async def get_public_companies(request: Request, response: Response):
+    return await check_versions(request, response, ["companies"], cache_control="public, no-cache") or await load_companies()
 
 # ============ FOUNDING BATCH SLOTS ============
 FOUNDING_SLOTS_TOTAL = 25
+FOUNDING_COUNTER_ID = "founding_batch"
+FOUNDING_SLOTS_CACHE_SECONDS = 10
+
+async def claim_founding_slot() -> Optional[int]:
+    """Reserve the next founding seat; returns its number, or None once all seats are gone"""
+    try:
+        counter = await db.counters.find_one_and_update(
+            {"_id": FOUNDING_COUNTER_ID, "claimed": {"$lt": FOUNDING_SLOTS_TOTAL}},
+            {"$inc": {"claimed": 1}},
+            upsert=True,
+            return_document=ReturnDocument.AFTER
+        )
+    except DuplicateKeyError:
+        # The counter exists but is full, so the upsert tried to insert a second one
+        return None
+    invalidate_cache_tags("founding")
+    return counter["claimed"]
+
+async def backfill_founding_counter():
+    """Seed the counter from founding orders paid before it existed"""
+    if await db.counters.find_one({"_id": FOUNDING_COUNTER_ID}):
+        return
+    paid = await db.orders.count_documents({"status": {"$in": ["paid", "success"]}, "is_founding_batch": True})
+    try:
+        await db.counters.insert_one({"_id": FOUNDING_COUNTER_ID, "claimed": min(paid, FOUNDING_SLOTS_TOTAL)})
+        logger.info(f"Founding counter seeded with {min(paid, FOUNDING_SLOTS_TOTAL)} claimed seats")
+    except DuplicateKeyError:
+        pass  # Another worker seeded it first
+
+@cached("founding_slots", ttl=FOUNDING_SLOTS_CACHE_SECONDS, maxsize=1, tags=("founding",))
+async def load_founding_slots():
+    counter = await db.counters.find_one({"_id": FOUNDING_COUNTER_ID})
+    filled = min(counter["claimed"], FOUNDING_SLOTS_TOTAL) if counter else 0
+    remaining = FOUNDING_SLOTS_TOTAL - filled
+    return {
+        "total": FOUNDING_SLOTS_TOTAL,
+        "filled": filled,
+        "remaining": remaining,
+        "sold_out": remaining == 0
+    }
 
 @api_router.get("/founding-slots")
-async def get_founding_slots():
+async def get_founding_slots(request: Request, response: Response):
     """Get founding batch slot availability - public endpoint"""
     try:
-        # Count successful founding batch purchases
-        # Assuming founding batch is tracked via a specific plan or flag
-        founding_purchases = await db.orders.count_documents({
-            "status": "success",
-            "is_founding_batch": True
-        })
-        
-        remaining = max(0, FOUNDING_SLOTS_TOTAL - founding_purchases)
-        
-        return {
-            "total": FOUNDING_SLOTS_TOTAL,
-            "filled": founding_purchases,
-            "remaining": remaining,
-            "sold_out": remaining == 0
-        }
+        slots = await load_founding_slots()
     except Exception as e:
         logger.error(f"Error fetching founding slots: {str(e)}")
         # Return default values on error
@@ -3910,53 +6399,106 @@ async def get_founding_slots():
             "remaining": FOUNDING_SLOTS_TOTAL,
             "sold_out": False
         }
+    
+    etag = f'"founding-{slots["filled"]}-{slots["total"]}"'
+    return not_modified(request, response, etag, f"public, max-age={FOUNDING_SLOTS_CACHE_SECONDS}") or slots
+
+# ============ SOCIAL PROOF FEED ============
+# Anonymized recent bookings for the landing-page popup. Booking events append
+# to a capped collection; each worker keeps the newest entries in a ring buffer
+# and re-reads the collection at most every SOCIAL_PROOF_REFRESH_SECONDS.
+SOCIAL_PROOF_SIZE = 20
+SOCIAL_PROOF_WINDOW_HOURS = 24
+SOCIAL_PROOF_REFRESH_SECONDS = 30
+SOCIAL_PROOF_CAPPED_BYTES = 256 * 1024
+
+social_proof_feed = deque(maxlen=SOCIAL_PROOF_SIZE)
+_social_proof_refreshed_at = 0.0
+
+def social_proof_entry(event_id: str, mentee_name: Optional[str], interview_type: Optional[str],
+                       company_name: Optional[str], timestamp: datetime) -> dict:
+    """Only the first name leaves the server"""
+    first_name = mentee_name.split()[0] if mentee_name and mentee_name.strip() else "Someone"
+    if timestamp.tzinfo is None:
+        timestamp = timestamp.replace(tzinfo=timezone.utc)
+    return {
+        "_id": event_id,
+        "first_name": first_name,
+        "interview_type": (interview_type or "mock interview").replace("_", " ").title(),
+        "company_name": company_name or "",
+        "timestamp": timestamp.isoformat()
+    }
+
+async def record_social_proof(entry: dict):
+    try:
+        await db.social_proof_events.insert_one(dict(entry))
+    except DuplicateKeyError:
+        return  # Re-dispatched event, already in the feed
+    social_proof_feed.appendleft(entry)
+
+async def ensure_social_proof_collection():
+    """Create the capped collection and seed it from bookings confirmed in the last day"""
+    if "social_proof_events" in await db.list_collection_names():
+        return
+    try:
+        await db.create_collection(
+            "social_proof_events", capped=True, size=SOCIAL_PROOF_CAPPED_BYTES, max=SOCIAL_PROOF_SIZE * 10
+        )
+    except CollectionInvalid:
+        return  # Another worker created it
+    
+    since = datetime.now(timezone.utc) - timedelta(hours=SOCIAL_PROOF_WINDOW_HOURS)
+    entries = []
+    async for booking in db.bookings.find({"status": {"$in": ["confirmed", "completed"]}, "created_at": {"$gte": since}}):
+        entries.append(social_proof_entry(
+            booking["id"], booking.get("mentee_name"), booking.get("interview_type"),
+            booking.get("company_name"), booking["created_at"]
+        ))
+    async for request in db.booking_requests.find({"status": "confirmed", "confirmed_at": {"$gte": since.isoformat()}}):
+        entries.append(social_proof_entry(
+            request["id"], request.get("mentee_name"), request.get("interview_type"),
+            request.get("company_name"), datetime.fromisoformat(request["confirmed_at"])
+        ))
+    # Capped collections keep insertion order, so oldest goes in first
+    entries.sort(key=lambda entry: entry["timestamp"])
+    if entries:
+        await db.social_proof_events.insert_many(entries[-SOCIAL_PROOF_SIZE:])
+
+async def get_social_proof_feed() -> list:
+    global _social_proof_refreshed_at
+    if time.monotonic() - _social_proof_refreshed_at >= SOCIAL_PROOF_REFRESH_SECONDS:
+        _social_proof_refreshed_at = time.monotonic()
+        latest = await db.social_proof_events.find().sort("$natural", -1).limit(SOCIAL_PROOF_SIZE).to_list(SOCIAL_PROOF_SIZE)
+        social_proof_feed.clear()
+        social_proof_feed.extend(latest)
+    return list(social_proof_feed)
 
 @api_router.get("/recent-bookings")
-async def get_recent_bookings():
+async def get_recent_bookings(response: Response):
     """Get recent successful bookings for social proof - public endpoint"""
     try:
-        # Get recent confirmed bookings (last 24 hours)
-        from datetime import datetime, timedelta, timezone
-        
-        twenty_four_hours_ago = (datetime.now(timezone.utc) - timedelta(hours=24)).isoformat()
-        
-        # Get recent booking requests that were confirmed
-        recent_bookings = await db.booking_requests.find({
-            "status": "confirmed",
-            "confirmed_at": {"$gte": twenty_four_hours_ago}
-        }).sort("confirmed_at", -1).limit(20).to_list(20)
-        
-        # Format for social proof (anonymize data)
-        social_proof = []
-        for booking in recent_bookings:
-            # Extract first name only
-            mentee_name = booking.get("mentee_name", "Someone")
-            first_name = mentee_name.split()[0] if mentee_name else "Someone"
-            
-            # Get interview type
-            interview_type = booking.get("interview_type", "mock interview")
-            interview_type_display = interview_type.replace("_", " ").title()
-            
-            # Get company name
-            company_name = booking.get("company_name", "")
-            
-            social_proof.append({
-                "first_name": first_name,
-                "interview_type": interview_type_display,
-                "company_name": company_name,
-                "timestamp": booking.get("confirmed_at")
-            })
-        
-        return social_proof
+        entries = await get_social_proof_feed()
     except Exception as e:
         logger.error(f"Error fetching recent bookings: {str(e)}")
         return []
+    
+    cutoff = (datetime.now(timezone.utc) - timedelta(hours=SOCIAL_PROOF_WINDOW_HOURS)).isoformat()
+    response.headers["Cache-Control"] = f"public, max-age={SOCIAL_PROOF_REFRESH_SECONDS}"
+    return [
+        {key: entry[key] for key in ("first_name", "interview_type", "company_name", "timestamp")}
+        for entry in entries
+        if entry["timestamp"] >= cutoff
+    ]
 
-@api_router.get("/available-slots")
-async def get_available_slots(user=Depends(get_current_user)):
+@cached("available_time_slots", ttl=30, maxsize=1, tags=("time_slots",))
+async def load_available_time_slots():
     slots = await db.time_slots.find({"status": "available"}).sort("date", 1).to_list(1000)
     return [serialize_doc(dict(s)) for s in slots]
 
+@api_router.get("/available-slots")
+async def get_available_slots(user=Depends(get_current_user)):
+    return await load_available_time_slots()
+
 @api_router.post("/mentee/booking-request")
 async def create_booking_request(data: BookingRequestCreate, user=Depends(get_current_user)):
     if user["role"] != "mentee":
@@ -4060,17 +6602,16 @@ async def confirm_booking(data: ConfirmBookingRequest, user=Depends(get_current_
     if not confirmed_slot:
         raise HTTPException(status_code=400, detail="Invalid slot selection")
     
-    # Auto-assign meeting link from pool
-    meet_link_doc = await get_available_meet_link()
+    # Auto-assign meeting link from pool (atomic lease)
+    meet_link_doc = await claim_meet_link(data.booking_request_id, confirmed_slot)
     if not meet_link_doc:
         raise HTTPException(status_code=400, detail="No available meeting links. Please contact admin to add more.")
     
     meeting_link = meet_link_doc["link"]
-    await assign_meet_link(meet_link_doc["id"], data.booking_request_id)
     
     # Update booking request status
-    await db.booking_requests.update_one(
-        {"id": data.booking_request_id},
+    confirmed = await db.booking_requests.update_one(
+        {"id": data.booking_request_id, "status": "pending"},
         {"$set": {
             "status": "confirmed",
             "confirmed_slot": confirmed_slot,
@@ -4079,9 +6620,14 @@ async def confirm_booking(data: ConfirmBookingRequest, user=Depends(get_current_
             "confirmed_at": datetime.now(timezone.utc).isoformat()
         }}
     )
+    if confirmed.modified_count == 0:
+        # Confirmed concurrently by someone else - hand the link back
+        await release_meet_link_claim(meet_link_doc["id"], data.booking_request_id)
+        raise HTTPException(status_code=400, detail="Booking already processed")
     
     # Mark the slot as booked
     await db.time_slots.update_one({"id": data.confirmed_slot_id}, {"$set": {"status": "booked"}})
+    invalidate_cache_tags("time_slots")
     
     # Create a mock interview record
     mock_doc = {
@@ -4100,31 +6646,20 @@ async def confirm_booking(data: ConfirmBookingRequest, user=Depends(get_current_
     # Get mentee details
     mentee = await db.users.find_one({"id": request["mentee_id"]})
     
-    # Send confirmation emails
-    slot_time_str = f"{confirmed_slot['date']} at {confirmed_slot['start_time']} - {confirmed_slot['end_time']}"
-    
-    # Email to mentee
-    if mentee:
-        asyncio.create_task(send_booking_confirmed_email(
-            recipient_name=mentee["name"],
-            recipient_email=mentee["email"],
-            company_name=request["company_name"],
-            slot_time=slot_time_str,
-            meeting_link=meeting_link,
-            is_mentor=False,
-            mentor_name=user["name"],
-            mentor_email=user["email"]
-        ))
-    
-    # Email to mentor
-    asyncio.create_task(send_booking_confirmed_email(
-        recipient_name=user["name"],
-        recipient_email=user["email"],
-        company_name=request["company_name"],
-        slot_time=slot_time_str,
-        meeting_link=meeting_link,
-        is_mentor=True
-    ))
+    # Confirmation emails run as event subscribers
+    await publish_event("booking.confirmed", data.booking_request_id, {
+        "mock_id": mock_doc["id"],
+        "mentee_id": request["mentee_id"],
+        "mentee_name": mentee["name"] if mentee else None,
+        "mentee_email": mentee["email"] if mentee else None,
+        "mentor_id": user["id"],
+        "mentor_name": user["name"],
+        "mentor_email": user["email"],
+        "company_name": request["company_name"],
+        "interview_type": request.get("interview_type"),
+        "slot_time": f"{confirmed_slot['date']} at {confirmed_slot['start_time']} - {confirmed_slot['end_time']}",
+        "meeting_link": meeting_link
+    })
     
     return {"message": "Booking confirmed", "mock_id": mock_doc["id"], "meeting_link": meeting_link}
 
@@ -4185,6 +6720,13 @@ async def submit_feedback(feedback: FeedbackCreate, user=Depends(get_current_use
     }
     await db.feedbacks.insert_one(feedback_doc)
     await db.mocks.update_one({"id": feedback.mock_id}, {"$set": {"status": "completed"}})
+    await publish_event("feedback.submitted", feedback_doc["id"], {
+        "mock_id": feedback.mock_id,
+        "mentor_id": user["id"],
+        "mentor_name": user["name"],
+        "mentee_id": feedback.mentee_id,
+        "rating": None
+    })
     return serialize_doc(feedback_doc)
 
 @api_router.get("/mentor/feedbacks")
@@ -4240,17 +6782,14 @@ async def create_mentor_feedback(
         {"$set": {"feedback_submitted": True, "feedback_id": feedback_doc["id"]}}
     )
     
-    # Create notification for mentee
-    mentee_notification = {
-        "id": str(uuid.uuid4()),
-        "user_id": mentee_id,
-        "type": "feedback_received",
-        "title": "Feedback Received",
-        "message": f"{user['name']} has submitted feedback for your mock interview. Rating: {rating}/5 stars",
-        "read": False,
-        "created_at": datetime.now(timezone.utc).isoformat()
-    }
-    await db.notifications.insert_one(mentee_notification)
+    # Mentee notification runs as an event subscriber
+    await publish_event("feedback.submitted", feedback_doc["id"], {
+        "booking_id": booking_id,
+        "mentor_id": user["id"],
+        "mentor_name": user["name"],
+        "mentee_id": mentee_id,
+        "rating": rating
+    })
     
     return serialize_doc(feedback_doc)
 
@@ -4323,6 +6862,82 @@ def validate_meeting_link(link: str) -> bool:
     ]
     return any(re.match(pattern, link) for pattern in patterns)
 
+# Everything that occupies a mentor's calendar. Dates are YYYY-MM-DD and times
+# zero-padded HH:MM on the same day, so string comparison orders them correctly
+# and an overlap check is an indexed (mentor_id, date, start_time) range query.
+MENTOR_SCHEDULE_COLLECTIONS = ["mentor_slots", "time_slots", "resume_review_slots", "bookings"]
+
+def slot_overlap_detail(conflicts: list) -> dict:
+    return {
+        "error": "conflict",
+        "message": "This time overlaps an existing slot or booking",
+        "code": "SLOT_OVERLAP",
+        "conflicts": conflicts
+    }
+
+async def find_slot_overlaps(mentor_id: str, slots: list, exclude_ids: list = None) -> list:
+    """
+    Return every conflict for a batch of candidate slots ({date, start_time, end_time}):
+    against the mentor's existing slots/bookings in all schedule collections, and
+    between the candidates themselves. One indexed query per collection, then a
+    sorted sweep per day in memory.
+    """
+    if not slots:
+        return []
+    dates = sorted({s["date"] for s in slots})
+    query = {
+        "mentor_id": mentor_id,
+        "date": {"$in": dates},
+        "status": {"$ne": "cancelled"},
+        "id": {"$nin": exclude_ids or []}
+    }
+    projection = {"_id": 0, "id": 1, "date": 1, "start_time": 1, "end_time": 1}
+    results = await asyncio.gather(*(
+        db[name].find(query, projection).to_list(None) for name in MENTOR_SCHEDULE_COLLECTIONS
+    ))
+    
+    existing = {}
+    for name, docs in zip(MENTOR_SCHEDULE_COLLECTIONS, results):
+        for doc in docs:
+            if doc.get("start_time") and doc.get("end_time"):
+                existing.setdefault(doc["date"], []).append((doc["start_time"], doc["end_time"], name, doc["id"]))
+    
+    conflicts = []
+    candidates = {}
+    for slot in slots:
+        candidates.setdefault(slot["date"], []).append(slot)
+    
+    for day, day_slots in candidates.items():
+        taken = sorted(existing.get(day, []))
+        day_slots = sorted(day_slots, key=lambda s: s["start_time"])
+        for i, slot in enumerate(day_slots):
+            for start, end, source, other_id in taken:
+                if start >= slot["end_time"]:
+                    break
+                if end > slot["start_time"]:
+                    conflicts.append({
+                        "date": day, "start_time": slot["start_time"], "end_time": slot["end_time"],
+                        "conflicts_with": {"source": source, "id": other_id, "start_time": start, "end_time": end}
+                    })
+            # Candidates are sorted by start, so only the next one can be the first to collide
+            if i + 1 < len(day_slots) and day_slots[i + 1]["start_time"] < slot["end_time"]:
+                nxt = day_slots[i + 1]
+                conflicts.append({
+                    "date": day, "start_time": nxt["start_time"], "end_time": nxt["end_time"],
+                    "conflicts_with": {"source": "request", "id": nxt.get("id"), "start_time": slot["start_time"], "end_time": slot["end_time"]}
+                })
+    return conflicts
+
+async def ensure_no_slot_overlap(mentor_id: str, date: str, start_time: str, end_time: str, exclude_id: str = None):
+    """Raise 409 SLOT_OVERLAP if a single slot would overlap the mentor's schedule"""
+    conflicts = await find_slot_overlaps(
+        mentor_id,
+        [{"date": date, "start_time": start_time, "end_time": end_time}],
+        exclude_ids=[exclude_id] if exclude_id else None
+    )
+    if conflicts:
+        raise HTTPException(status_code=409, detail=slot_overlap_detail(conflicts))
+
 @api_router.post("/mentor/slots")
 async def create_mentor_slot(slot_data: MentorSlotCreate, user=Depends(get_current_user)):
     """Create a new availability slot for a mentor"""
@@ -4345,6 +6960,8 @@ async def create_mentor_slot(slot_data: MentorSlotCreate, user=Depends(get_curre
     if not validate_meeting_link(slot_data.meeting_link):
         raise HTTPException(status_code=400, detail="Invalid meeting link URL. Must be Google Meet, Zoom, or Microsoft Teams")
     
+    await ensure_no_slot_overlap(user["id"], slot_data.date, slot_data.start_time, slot_data.end_time)
+    
     # Create slot document
     slot_doc = {
         "id": str(uuid.uuid4()),
@@ -4365,13 +6982,15 @@ async def create_mentor_slot(slot_data: MentorSlotCreate, user=Depends(get_curre
     }
     
     await db.mentor_slots.insert_one(slot_doc)
+    await bump_version("mentor_slots")
+    await publish_slot_changes("slot_added", [slot_doc])
     
     logger.info(f"✅ Slot created: {slot_doc['id']} by mentor {user['id']}")
     logger.info(f"📧 Triggering slot notification emails...")
     
-    # Send notification emails to all mentees (both free and paid) in the background
+    # Notify mentees whose interests match (and hold it for a waitlisted one) in the background
     # This runs asynchronously without blocking the response
-    asyncio.create_task(send_new_slot_notification_emails(slot_doc))
+    asyncio.create_task(announce_new_slot(slot_doc))
     
     return serialize_doc(slot_doc)
 
@@ -4462,11 +7081,25 @@ async def update_mentor_slot(slot_id: str, updates: MentorSlotUpdate, user=Depen
     if not update_fields:
         raise HTTPException(status_code=400, detail="No valid fields to update")
     
+    if any(field in update_fields for field in ("date", "start_time", "end_time")):
+        await ensure_no_slot_overlap(
+            user["id"],
+            update_fields.get("date", slot["date"]),
+            update_fields.get("start_time", slot["start_time"]),
+            update_fields.get("end_time", slot["end_time"]),
+            exclude_id=slot_id
+        )
+    
     update_fields["updated_at"] = datetime.now(timezone.utc)
     
     await db.mentor_slots.update_one({"id": slot_id}, {"$set": update_fields})
+    await bump_version("mentor_slots")
     
     updated_slot = await db.mentor_slots.find_one({"id": slot_id})
+    if slot["status"] == "available":
+        # Browsers matching the old shape drop it, browsers matching the new one pick it up
+        await publish_slot_changes("slot_removed", [slot])
+        await publish_slot_changes("slot_added", [updated_slot])
     return serialize_doc(dict(updated_slot))
 
 @api_router.delete("/mentor/slots/{slot_id}")
@@ -4489,6 +7122,9 @@ async def delete_mentor_slot(slot_id: str, user=Depends(get_current_user)):
         raise HTTPException(status_code=400, detail="Cannot delete a booked slot. Please contact admin if you need to cancel.")
     
     await db.mentor_slots.delete_one({"id": slot_id})
+    await bump_version("mentor_slots")
+    if slot["status"] == "available":
+        await publish_slot_changes("slot_removed", [slot])
     return {"message": "Slot deleted successfully"}
 
 @api_router.patch("/mentor/slots/{slot_id}")
@@ -4514,9 +7150,21 @@ async def update_slot(slot_id: str, data: dict, user=Depends(get_current_user)):
     if "meeting_link" in data:
         update_data["meeting_link"] = data["meeting_link"]
     
+    if any(field in update_data for field in ("date", "start_time", "end_time")):
+        await ensure_no_slot_overlap(
+            user["id"],
+            update_data.get("date", slot["date"]),
+            update_data.get("start_time", slot["start_time"]),
+            update_data.get("end_time", slot["end_time"]),
+            exclude_id=slot_id
+        )
+    
     update_data["updated_at"] = datetime.now(timezone.utc).isoformat()
     
     await db.mentor_slots.update_one({"id": slot_id}, {"$set": update_data})
+    await bump_version("mentor_slots")
+    await publish_slot_changes("slot_removed", [slot])
+    await publish_slot_changes("slot_added", [{**slot, **update_data}])
     return {"message": "Slot updated successfully"}
 
 @api_router.patch("/mentor/slots/{slot_id}/availability")
@@ -4547,6 +7195,11 @@ async def toggle_slot_availability(slot_id: str, available: bool, user=Depends(g
         {"id": slot_id},
         {"$set": {"status": new_status, "updated_at": datetime.now(timezone.utc)}}
     )
+    await bump_version("mentor_slots")
+    if new_status == "available" and slot["status"] != "available":
+        await publish_slot_changes("slot_released", [slot])
+    elif new_status != "available" and slot["status"] == "available":
+        await publish_slot_changes("slot_removed", [slot])
     
     updated_slot = await db.mentor_slots.find_one({"id": slot_id})
     return serialize_doc(dict(updated_slot))
@@ -4581,10 +7234,565 @@ async def get_mentor_bookings(user=Depends(get_current_user)):
         "past": past
     }
 
+# ============ AVAILABILITY TEMPLATES ============
+# A template is a weekly rule ("Sat/Sun 10:00-13:00, 60 minute slots, 8 weeks").
+# It is expanded server-side into mentor_slots with one insert_many, and a daily
+# job keeps open-ended templates materialized up to a rolling horizon.
+TEMPLATE_HORIZON_DAYS = 28
+WEEKDAY_NAMES = ["Mon", "Tue", "Wed", "Thu", "Fri", "Sat", "Sun"]
+
+def expand_availability_template(template: dict, from_date, through_date) -> list:
+    """Build slot documents for every matching weekday and window between two dates (inclusive)"""
+    now = datetime.now(timezone.utc)
+    # A non-positive duration would never advance through the window
+    if not 0 < template["slot_duration_minutes"] <= 24 * 60:
+        raise ValueError(f"Invalid slot duration: {template['slot_duration_minutes']} minutes")
+    duration = timedelta(minutes=template["slot_duration_minutes"])
+    slots = []
+    day = from_date
+    while day <= through_date:
+        if day.weekday() in template["weekdays"]:
+            start = datetime.strptime(template["start_time"], "%H:%M")
+            window_end = datetime.strptime(template["end_time"], "%H:%M")
+            while start + duration <= window_end:
+                slots.append({
+                    "id": str(uuid.uuid4()),
+                    "template_id": template["id"],
+                    "mentor_id": template["mentor_id"],
+                    "mentor_name": template["mentor_name"],
+                    "mentor_email": template["mentor_email"],
+                    "date": day.isoformat(),
+                    "start_time": start.strftime("%H:%M"),
+                    "end_time": (start + duration).strftime("%H:%M"),
+                    "meeting_link": template["meeting_link"],
+                    "status": "available",
+                    "interview_types": template["interview_types"],
+                    "experience_levels": template["experience_levels"],
+                    "company_specializations": template["company_specializations"],
+                    "preparation_notes": template.get("preparation_notes"),
+                    "created_at": now,
+                    "updated_at": now
+                })
+                start += duration
+        day += timedelta(days=1)
+    return slots
+
+def validate_template_slots(template: dict, slots: list) -> list:
+    """Validate the rule and every expanded slot in one pass; returns all problems at once"""
+    errors = []
+    if not validate_meeting_link(template["meeting_link"]):
+        errors.append("Invalid meeting link URL. Must be Google Meet, Zoom, or Microsoft Teams")
+    if not template["weekdays"] or any(d not in range(7) for d in template["weekdays"]):
+        errors.append("weekdays must be a non-empty list of 0 (Mon) - 6 (Sun)")
+    try:
+        if not validate_time_range(template["start_time"], template["end_time"]):
+            errors.append("Time range must be at least 30 minutes")
+    except ValueError:
+        errors.append("start_time and end_time must be HH:MM")
+        return errors
+    for slot in slots:
+        if not validate_time_range(slot["start_time"], slot["end_time"]):
+            errors.append(f"Slot {slot['date']} {slot['start_time']}-{slot['end_time']} is shorter than 30 minutes")
+            break  # Every slot has the same duration
+    return errors
+
+async def materialize_availability_template(template: dict, notify: bool = True) -> list:
+    """
+    Insert the template's slots from where it last stopped up to its end date or
+    the rolling horizon. The materialized_through bump is conditional, so two
+    workers extending the same template can't both insert the same days.
+    """
+    today = datetime.now(timezone.utc).date()
+    start_date = datetime.strptime(template["start_date"], "%Y-%m-%d").date()
+    from_date = max(start_date, today)
+    if template.get("materialized_through"):
+        from_date = max(from_date, datetime.strptime(template["materialized_through"], "%Y-%m-%d").date() + timedelta(days=1))
+    through_date = today + timedelta(days=TEMPLATE_HORIZON_DAYS)
+    if template.get("end_date"):
+        end_date = datetime.strptime(template["end_date"], "%Y-%m-%d").date()
+        if from_date > end_date:
+            # Every day up to the end date is on the calendar; stop reloading it nightly
+            await db.availability_templates.update_one(
+                {"id": template["id"], "active": True},
+                {"$set": {"active": False, "updated_at": datetime.now(timezone.utc)}}
+            )
+            return []
+        through_date = min(through_date, end_date)
+    if from_date > through_date:
+        return []
+    
+    claimed = await db.availability_templates.update_one(
+        {"id": template["id"], "materialized_through": template.get("materialized_through")},
+        {"$set": {"materialized_through": through_date.isoformat(), "updated_at": datetime.now(timezone.utc)}}
+    )
+    if claimed.modified_count == 0:
+        return []
+    template["materialized_through"] = through_date.isoformat()
+    
+    slots = expand_availability_template(template, from_date, through_date)
+    
+    # Leave out slots that collide with anything already on the mentor's calendar
+    conflicts = await find_slot_overlaps(template["mentor_id"], slots)
+    if conflicts:
+        clashing = {(c["date"], c["start_time"]) for c in conflicts if c["conflicts_with"]["source"] != "request"}
+        slots = [slot for slot in slots if (slot["date"], slot["start_time"]) not in clashing]
+        logger.info(f"Skipped {len(clashing)} overlapping slots for availability template {template['id']}")
+    if not slots:
+        return []
+    try:
+        await db.mentor_slots.insert_many(slots)
+    except Exception:
+        # Give the days back so the next run retries them
+        await db.mentor_slots.delete_many({"id": {"$in": [slot["id"] for slot in slots]}})
+        await db.availability_templates.update_one(
+            {"id": template["id"], "materialized_through": through_date.isoformat()},
+            {"$set": {"materialized_through": (from_date - timedelta(days=1)).isoformat() if from_date > start_date else None}}
+        )
+        raise
+    finally:
+        await bump_version("mentor_slots")
+    await publish_slot_changes("slot_added", slots)
+    logger.info(f"Materialized {len(slots)} slots for availability template {template['id']} through {through_date}")
+    
+    if notify:
+        asyncio.create_task(announce_new_slots_digest(template["mentor_name"], slots))
+    return slots
+
+async def extend_availability_templates():
+    """Scheduled job: roll every active template forward to the horizon"""
+    try:
+        async for template in db.availability_templates.find({"active": True}, {"_id": 0}):
+            try:
+                # Rolling the horizon forward by a day isn't news; only creation announces
+                await materialize_availability_template(template, notify=False)
+            except Exception as e:
+                logger.error(f"Failed to extend availability template {template.get('id')}: {str(e)}")
+    except Exception as e:
+        logger.error(f"Error extending availability templates: {str(e)}")
+
+@api_router.post("/mentor/availability-templates")
+async def create_availability_template(data: AvailabilityTemplateCreate, user=Depends(get_current_user)):
+    """Create a weekly availability rule and materialize its slots"""
+    if user["role"] != "mentor":
+        raise HTTPException(status_code=403, detail="Mentor only")
+    
+    if data.weeks is not None and data.weeks < 1:
+        raise HTTPException(status_code=400, detail="weeks must be at least 1")
+    
+    today = datetime.now(timezone.utc).date()
+    start_date = today
+    if data.start_date:
+        if not validate_date_not_past(data.start_date):
+            raise HTTPException(status_code=400, detail="Date cannot be in the past")
+        start_date = datetime.strptime(data.start_date, "%Y-%m-%d").date()
+    
+    template = {
+        "id": str(uuid.uuid4()),
+        "mentor_id": user["id"],
+        "mentor_name": user["name"],
+        "mentor_email": user["email"],
+        "weekdays": sorted(set(data.weekdays)),
+        "start_time": data.start_time,
+        "end_time": data.end_time,
+        "slot_duration_minutes": data.slot_duration_minutes,
+        "start_date": start_date.isoformat(),
+        "end_date": (start_date + timedelta(weeks=data.weeks) - timedelta(days=1)).isoformat() if data.weeks else None,
+        "meeting_link": data.meeting_link,
+        "interview_types": data.interview_types,
+        "experience_levels": data.experience_levels,
+        "company_specializations": data.company_specializations,
+        "preparation_notes": data.preparation_notes,
+        "materialized_through": None,
+        "active": True,
+        "created_at": datetime.now(timezone.utc),
+        "updated_at": datetime.now(timezone.utc)
+    }
+    
+    # Validate against the first window the rule produces before storing anything
+    try:
+        preview = expand_availability_template(template, start_date, start_date + timedelta(days=6))
+    except ValueError:
+        raise HTTPException(status_code=400, detail="start_time and end_time must be HH:MM")
+    errors = validate_template_slots(template, preview)
+    if not errors and not preview:
+        errors.append("The rule does not produce any slots - check weekdays, times and slot duration")
+    if errors:
+        raise HTTPException(status_code=400, detail="; ".join(errors))
+    
+    await db.availability_templates.insert_one(dict(template))
+    slots = await materialize_availability_template(template)
+    
+    return {
+        "template": serialize_doc(template),
+        "slots_created": len(slots),
+        "materialized_through": template["materialized_through"]
+    }
+
+@api_router.get("/mentor/availability-templates")
+async def get_availability_templates(user=Depends(get_current_user)):
+    """List the mentor's availability rules"""
+    if user["role"] != "mentor":
+        raise HTTPException(status_code=403, detail="Mentor only")
+    templates = await db.availability_templates.find({"mentor_id": user["id"]}, {"_id": 0}).sort("created_at", -1).to_list(100)
+    return templates
+
+@api_router.delete("/mentor/availability-templates/{template_id}")
+async def delete_availability_template(template_id: str, remove_future_slots: bool = True, user=Depends(get_current_user)):
+    """Stop a rule; by default its future unbooked slots are removed too (booked slots are kept)"""
+    if user["role"] != "mentor":
+        raise HTTPException(status_code=403, detail="Mentor only")
+    
+    result = await db.availability_templates.update_one(
+        {"id": template_id, "mentor_id": user["id"]},
+        {"$set": {"active": False, "updated_at": datetime.now(timezone.utc)}}
+    )
+    if result.matched_count == 0:
+        raise HTTPException(status_code=404, detail="Template not found")
+    
+    removed = 0
+    if remove_future_slots:
+        removable = {"status": {"$in": ["available", "unavailable"]}}
+        slots = await db.mentor_slots.find({
+            "template_id": template_id,
+            "date": {"$gte": datetime.now(timezone.utc).date().isoformat()},
+            **removable
+        }, {"_id": 0}).to_list(None)
+        deleted = await db.mentor_slots.delete_many({"id": {"$in": [slot["id"] for slot in slots]}, **removable})
+        removed = deleted.deleted_count
+        await bump_version("mentor_slots")
+        await publish_slot_changes("slot_removed", [slot for slot in slots if slot["status"] == "available"])
+    return {"message": "Availability template stopped", "slots_removed": removed}
+
+# ============ SLOT HOLDS ============
+# Opening the booking modal puts a short hold on the slot (one per slot, enforced
+# by a unique index; a TTL index deletes expired holds). Mentees who lose the
+# race join a FIFO queue for the slot and are promoted, in arrival order, when
+# the hold expires or is released or when a booking on the slot is cancelled.
+SLOT_HOLD_SECONDS = 120
+SLOT_HOLD_SWEEP_SECONDS = 15
+
+slot_unavailable_detail = {
+    "error": "conflict",
+    "message": "This slot is no longer available or is being booked by another user",
+    "code": "SLOT_NOT_AVAILABLE"
+}
+
+async def get_live_hold(slot_id: str):
+    """The current hold on a slot; holds past expiry count as gone even before the TTL monitor runs"""
+    return await db.slot_holds.find_one(
+        {"slot_id": slot_id, "expires_at": {"$gt": datetime.now(timezone.utc)}},
+        {"_id": 0}
+    )
+
+def held_response(hold: dict) -> dict:
+    # Stored datetimes come back naive (UTC); mark them so browsers don't read local time
+    return {"status": "held", "slot_id": hold["slot_id"], "expires_at": hold["expires_at"].replace(tzinfo=timezone.utc)}
+
+async def queue_position(slot_id: str, mentee_id: str):
+    """1-based position of a mentee in a slot's queue, or None if not queued"""
+    entry = await db.slot_queue.find_one({"slot_id": slot_id, "mentee_id": mentee_id}, {"_id": 0, "queued_at": 1})
+    if not entry:
+        return None
+    ahead = await db.slot_queue.count_documents({"slot_id": slot_id, "queued_at": {"$lt": entry["queued_at"]}})
+    return ahead + 1
+
+async def grant_slot_hold(slot_id: str, mentee_id: str):
+    """Insert a hold; returns it, or None if someone else already holds the slot"""
+    now = datetime.now(timezone.utc)
+    hold = {
+        "id": str(uuid.uuid4()),
+        "slot_id": slot_id,
+        "mentee_id": mentee_id,
+        "expires_at": now + timedelta(seconds=SLOT_HOLD_SECONDS),
+        "created_at": now
+    }
+    # Clear an expired hold the TTL monitor hasn't removed yet
+    await db.slot_holds.delete_one({"slot_id": slot_id, "expires_at": {"$lte": now}})
+    try:
+        await db.slot_holds.insert_one(dict(hold))
+    except DuplicateKeyError:
+        return None
+    await db.slot_queue.delete_one({"slot_id": slot_id, "mentee_id": mentee_id})
+    return hold
+
+async def promote_slot_queue(slot_id: str):
+    """Hand a free, available slot to the head of its queue and notify them"""
+    if await get_live_hold(slot_id):
+        return None
+    slot = await db.mentor_slots.find_one({"id": slot_id}, {"_id": 0, "status": 1, "date": 1, "start_time": 1})
+    if (not slot or slot["status"] not in ("available", "booked")
+            or slot["date"] < datetime.now(timezone.utc).date().isoformat()):
+        # The slot can never be handed out again; drop its queue so the sweep stops revisiting it
+        await db.slot_queue.delete_many({"slot_id": slot_id})
+        return None
+    if slot["status"] != "available":
+        return None  # Booked: the queue waits for a cancellation to free it
+    
+    head = await db.slot_queue.find_one({"slot_id": slot_id}, {"_id": 0}, sort=[("queued_at", ASCENDING)])
+    if not head:
+        return None
+    hold = await grant_slot_hold(slot_id, head["mentee_id"])
+    if not hold:
+        return None  # Someone else got there first; they hold it now
+    
+    await create_notification(
+        head["mentee_id"], "slot_hold_granted", "Your Slot Is Ready",
+        f"The slot on {slot['date']} at {slot['start_time']} you were waiting for is held for you for {SLOT_HOLD_SECONDS // 60} minutes. Book it now!",
+        slot_id=slot_id
+    )
+    logger.info(f"Promoted mentee {head['mentee_id']} to hold slot {slot_id}")
+    return hold
+
+async def promote_expired_slot_holds():
+    """Scheduled job: promote queues whose hold expired or was removed by the TTL monitor"""
+    try:
+        now = datetime.now(timezone.utc)
+        expired = await db.slot_holds.distinct("slot_id", {"expires_at": {"$lte": now}})
+        queued = await db.slot_queue.distinct("slot_id")
+        for slot_id in set(expired) | set(queued):
+            await promote_slot_queue(slot_id)
+    except Exception as e:
+        logger.error(f"Error promoting slot queues: {str(e)}")
+
+async def clear_stale_slot_locks():
+    """Remove `lock` subdocuments left behind by the old 30-second booking lock"""
+    result = await db.mentor_slots.update_many({"lock": {"$exists": True}}, {"$unset": {"lock": ""}})
+    if result.modified_count:
+        logger.info(f"Cleared {result.modified_count} stale slot locks")
+
+@api_router.post("/mentee/slots/{slot_id}/hold")
+async def hold_slot(slot_id: str, user=Depends(get_current_user)):
+    """
+    Hold a slot while the booking modal is open.
+    Returns the hold, or the mentee's place in the queue if another mentee holds it
+    (queueing also works for booked slots, which free up if the booking is cancelled).
+    """
+    if user["role"] != "mentee":
+        raise HTTPException(status_code=403, detail="Mentee only")
+    
+    slot = await db.mentor_slots.find_one({"id": slot_id}, {"_id": 0, "status": 1, "date": 1})
+    if not slot or slot["status"] not in ("available", "booked") or slot["date"] < datetime.now(timezone.utc).date().isoformat():
+        raise HTTPException(status_code=409, detail=slot_unavailable_detail)
+    
+    hold = await get_live_hold(slot_id)
+    if hold and hold["mentee_id"] == user["id"]:
+        return held_response(hold)
+    
+    if not hold and slot["status"] == "available":
+        # Queue order wins: only the head of the queue (or anyone, if it's empty) may take a free slot
+        head = await db.slot_queue.find_one({"slot_id": slot_id}, {"_id": 0, "mentee_id": 1}, sort=[("queued_at", ASCENDING)])
+        if not head or head["mentee_id"] == user["id"]:
+            hold = await grant_slot_hold(slot_id, user["id"])
+            if hold:
+                return held_response(hold)
+    
+    await db.slot_queue.update_one(
+        {"slot_id": slot_id, "mentee_id": user["id"]},
+        {"$setOnInsert": {
+            "id": str(uuid.uuid4()),
+            "slot_id": slot_id,
+            "mentee_id": user["id"],
+            "queued_at": datetime.now(timezone.utc)
+        }},
+        upsert=True
+    )
+    return {"status": "queued", "slot_id": slot_id, "position": await queue_position(slot_id, user["id"])}
+
+@api_router.get("/mentee/slots/{slot_id}/hold")
+async def get_slot_hold(slot_id: str, user=Depends(get_current_user)):
+    """Current hold/queue state for the calling mentee (promotes the queue if the hold lapsed)"""
+    if user["role"] != "mentee":
+        raise HTTPException(status_code=403, detail="Mentee only")
+    
+    await promote_slot_queue(slot_id)
+    hold = await get_live_hold(slot_id)
+    if hold and hold["mentee_id"] == user["id"]:
+        return held_response(hold)
+    position = await queue_position(slot_id, user["id"])
+    if position:
+        return {"status": "queued", "slot_id": slot_id, "position": position}
+    return {"status": "none", "slot_id": slot_id}
+
+@api_router.delete("/mentee/slots/{slot_id}/hold")
+async def release_slot_hold(slot_id: str, user=Depends(get_current_user)):
+    """Release the caller's hold (or leave the queue) when the booking modal closes"""
+    if user["role"] != "mentee":
+        raise HTTPException(status_code=403, detail="Mentee only")
+    
+    released = await db.slot_holds.delete_one({"slot_id": slot_id, "mentee_id": user["id"]})
+    await db.slot_queue.delete_one({"slot_id": slot_id, "mentee_id": user["id"]})
+    if released.deleted_count:
+        await promote_slot_queue(slot_id)
+    return {"message": "Hold released"}
+
+# ============ SLOT INTERESTS ============
+# Mentees register what they are looking for in slot_interests (one document
+# each). An empty filter is stored as the "*" term, so matching a new slot is a
+# single $in query over multikey indexes - an inverted index from interview
+# type / level / company to mentees - rather than a scan of every mentee. Only
+# matching mentees hear about a new slot, and with waitlist on, the paid match
+# who registered first gets a SLOT_HOLD_SECONDS hold on it. Every mentee starts
+# with a match-anything interest, so they hear about all new slots until they
+# narrow their interests or remove them.
+INTEREST_ANY = "*"
+INTEREST_FIELDS = ("interview_types", "experience_levels", "company_ids")
+INTEREST_OPEN_END = "9999-12-31"
+
+def interest_response(interest: dict) -> dict:
+    interest = {key: value for key, value in interest.items() if key != "_id"}
+    for field in INTEREST_FIELDS:
+        interest[field] = [term for term in interest.get(field, []) if term != INTEREST_ANY]
+    interest["date_from"] = interest.get("date_from") or None
+    interest["date_to"] = None if interest.get("date_to") == INTEREST_OPEN_END else interest.get("date_to")
+    return interest
+
+def slot_interest_query(slot: dict) -> dict:
+    companies = [c.get("id") if isinstance(c, dict) else c for c in slot.get("company_specializations") or []]
+    return {
+        "interview_types": {"$in": list(slot.get("interview_types") or []) + [INTEREST_ANY]},
+        "experience_levels": {"$in": list(slot.get("experience_levels") or []) + [INTEREST_ANY]},
+        "company_ids": {"$in": companies + [INTEREST_ANY]},
+        "date_from": {"$lte": slot["date"]},
+        "date_to": {"$gte": slot["date"]}
+    }
+
+async def register_default_slot_interest(mentee_id: str):
+    """Give a mentee the match-anything interest, unless they already registered one"""
+    now = datetime.now(timezone.utc)
+    await db.slot_interests.update_one(
+        {"mentee_id": mentee_id},
+        {"$setOnInsert": {
+            "id": str(uuid.uuid4()),
+            "mentee_id": mentee_id,
+            **{field: [INTEREST_ANY] for field in INTEREST_FIELDS},
+            "date_from": "",
+            "date_to": INTEREST_OPEN_END,
+            "waitlist": False,
+            "created_at": now,
+            "updated_at": now
+        }},
+        upsert=True
+    )
+    await db.users.update_one({"id": mentee_id}, {"$set": {"slot_interests_defaulted": True}})
+
+async def backfill_slot_interests():
+    """Default interests for mentees who signed up before interests existed (once each, so removals stick)"""
+    mentees = db.users.find({"role": "mentee", "slot_interests_defaulted": {"$ne": True}}, {"_id": 0, "id": 1})
+    registered = 0
+    async for mentee in mentees:
+        try:
+            await register_default_slot_interest(mentee["id"])
+            registered += 1
+        except Exception as e:
+            logger.error(f"Failed to default slot interests for mentee {mentee.get('id')}: {str(e)}")
+    if registered:
+        logger.info(f"Defaulted slot interests for {registered} mentees")
+
+async def match_slot_interests(slot: dict) -> list:
+    """Interests matching a slot, earliest registration first"""
+    return await db.slot_interests.find(slot_interest_query(slot), {"_id": 0}).sort("created_at", ASCENDING).to_list(None)
+
+async def interested_mentees(interests: list) -> list:
+    return await db.users.find(
+        {"id": {"$in": [interest["mentee_id"] for interest in interests]}, "role": "mentee"},
+        {"_id": 0, "id": 1, "name": 1, "email": 1, "status": 1, "plan_id": 1, "interview_quota_remaining": 1}
+    ).to_list(None)
+
+async def hold_for_waitlist(slot: dict, interests: list, mentees: list):
+    """Give the first waitlisted paid match a hold on the new slot"""
+    paid = {mentee["id"] for mentee in mentees if is_paid_mentee(mentee) and mentee.get("interview_quota_remaining", 0) > 0}
+    for interest in interests:
+        if not interest.get("waitlist") or interest["mentee_id"] not in paid:
+            continue
+        hold = await grant_slot_hold(slot["id"], interest["mentee_id"])
+        if hold:
+            await create_notification(
+                interest["mentee_id"], "slot_hold_granted", "A Slot Matching Your Interests Is Held For You",
+                f"A new slot on {slot['date']} at {slot['start_time']} matches your interests and is held for you for {SLOT_HOLD_SECONDS // 60} minutes. Book it now!",
+                slot_id=slot["id"]
+            )
+            logger.info(f"Held new slot {slot['id']} for waitlisted mentee {interest['mentee_id']}")
+        return hold
+    return None
+
+async def announce_new_slot(slot: dict, waitlist: bool = True):
+    """Notify the mentees whose interests match a new slot"""
+    try:
+        interests = await match_slot_interests(slot)
+        mentees = await interested_mentees(interests) if interests else []
+        logger.info(f"Slot {slot['id']} matches {len(mentees)} mentee interests")
+        if waitlist and mentees:
+            await hold_for_waitlist(slot, interests, mentees)
+        await send_new_slot_notification_emails(slot, mentees)
+    except Exception as e:
+        logger.error(f"Failed to announce slot {slot.get('id')}: {str(e)}")
+
+async def announce_new_slots_digest(mentor_name: str, slots: list):
+    """One digest to each mentee matching any of a batch of new slots (no waitlist holds)"""
+    try:
+        mentee_ids = set()
+        for slot in slots:
+            mentee_ids.update(interest["mentee_id"] for interest in await match_slot_interests(slot))
+        mentees = await interested_mentees([{"mentee_id": mentee_id} for mentee_id in mentee_ids]) if mentee_ids else []
+        await send_slot_digest_emails(mentor_name, slots, mentees)
+    except Exception as e:
+        logger.error(f"Failed to announce slot digest for {mentor_name}: {str(e)}")
+
+@api_router.get("/mentee/slot-interests")
+async def get_slot_interests(user=Depends(get_current_user)):
+    """The caller's registered slot interests (null if none)"""
+    if user["role"] != "mentee":
+        raise HTTPException(status_code=403, detail="Mentee only")
+    interest = await db.slot_interests.find_one({"mentee_id": user["id"]})
+    return interest_response(interest) if interest else None
+
+@api_router.put("/mentee/slot-interests")
+async def update_slot_interests(data: SlotInterestUpdate, user=Depends(get_current_user)):
+    """Register (or replace) the kinds of slots the caller wants to hear about"""
+    if user["role"] != "mentee":
+        raise HTTPException(status_code=403, detail="Mentee only")
+    if data.date_from and data.date_to and data.date_from > data.date_to:
+        raise HTTPException(status_code=400, detail="date_from must be on or before date_to")
+    
+    now = datetime.now(timezone.utc)
+    fields = {field: getattr(data, field) or [INTEREST_ANY] for field in INTEREST_FIELDS}
+    interest = await db.slot_interests.find_one_and_update(
+        {"mentee_id": user["id"]},
+        {
+            "$set": {
+                **fields,
+                "date_from": data.date_from or "",
+                "date_to": data.date_to or INTEREST_OPEN_END,
+                "waitlist": data.waitlist,
+                "updated_at": now
+            },
+            # Waitlist priority goes by first registration, so edits keep created_at
+            "$setOnInsert": {"id": str(uuid.uuid4()), "mentee_id": user["id"], "created_at": now}
+        },
+        upsert=True,
+        return_document=ReturnDocument.AFTER
+    )
+    return interest_response(interest)
+
+@api_router.delete("/mentee/slot-interests")
+async def delete_slot_interests(user=Depends(get_current_user)):
+    """Stop new-slot announcements for the caller"""
+    if user["role"] != "mentee":
+        raise HTTPException(status_code=403, detail="Mentee only")
+    await db.slot_interests.delete_one({"mentee_id": user["id"]})
+    return {"message": "Slot interests removed"}
+
 # ============ MENTEE ROUTES ============
 
+def shape_browse_slots(slots: list) -> list:
+    """Anonymized slots (mentor identity hidden), sorted by date and time ascending"""
+    slots.sort(key=lambda x: (x["date"], x["start_time"]))
+    return [public_slot(slot) for slot in slots]
+
 @api_router.get("/mentee/slots/browse")
 async def browse_available_slots(
+    request: Request,
+    response: Response,
     interview_type: Optional[str] = None,
     experience_level: Optional[str] = None,
     date_from: Optional[str] = None,
@@ -4602,6 +7810,10 @@ async def browse_available_slots(
     
     # Build query - only available slots with future dates
     today = datetime.now(timezone.utc).date().isoformat()
+    # Filters are part of the URL, so the ETag only has to cover slot writes and the date rollover
+    unchanged = await check_versions(request, response, ["mentor_slots"], today)
+    if unchanged:
+        return unchanged
     query = {
         "status": "available",
         "date": {"$gte": today}
@@ -4627,33 +7839,37 @@ async def browse_available_slots(
     
     # Fetch slots
     slots = await db.mentor_slots.find(query).to_list(1000)
+    return shape_browse_slots(slots)
+
+@api_router.get("/mentee/slots/stream")
+async def stream_available_slots(
+    request: Request,
+    interview_type: Optional[str] = None,
+    experience_level: Optional[str] = None,
+    date_from: Optional[str] = None,
+    date_to: Optional[str] = None,
+    company_id: Optional[str] = None,
+    user=Depends(get_stream_user)
+):
+    """
+    Server-sent slot_added, slot_booked, slot_released and slot_removed deltas for
+    the slots /mentee/slots/browse would return with the same filters.
+    """
+    if user["role"] != "mentee":
+        raise HTTPException(status_code=403, detail="Mentee only")
     
-    # Sort by date and time ascending
-    slots.sort(key=lambda x: (x["date"], x["start_time"]))
-    
-    # Return anonymized slots (hide mentor identity)
-    anonymized_slots = []
-    for slot in slots:
-        anonymized_slot = {
-            "id": slot["id"],
-            "date": slot["date"],
-            "start_time": slot["start_time"],
-            "end_time": slot["end_time"],
-            "interview_types": slot["interview_types"],
-            "experience_levels": slot["experience_levels"],
-            "company_specializations": slot["company_specializations"],
-            "preparation_notes": slot.get("preparation_notes")
-        }
-        anonymized_slots.append(anonymized_slot)
-    
-    return anonymized_slots
+    subscription = SlotSubscription(interview_type, experience_level, company_id, date_from, date_to)
+    slot_index.add(subscription)
+    return sse_stream(request, subscription.queue, lambda: slot_index.remove(subscription))
 
 @api_router.post("/mentee/bookings")
 async def create_booking(booking_data: BookingCreate, user=Depends(get_current_user)):
     """
     Create a booking for an available slot.
     Validates tier, quota, company selection, and slot availability.
-    Implements slot locking for concurrent access prevention.
+    The slot claim, quota decrement, booking and notifications are committed in
+    one multi-document transaction, so concurrent requests can't double-book a
+    slot or drive the quota negative.
     """
     # Log incoming request for debugging
     logger.info(f"Booking request from user {user['id']}: {booking_data.dict()}")
@@ -4673,194 +7889,186 @@ async def create_booking(booking_data: BookingCreate, user=Depends(get_current_u
             }
         )
     
-    # Check interview quota
-    quota_remaining = user.get("interview_quota_remaining", 0)
-    if quota_remaining <= 0:
-        raise HTTPException(
-            status_code=422,
-            detail={
-                "error": "quota_exceeded",
-                "message": "You have used all interviews in your plan",
-                "code": "INTERVIEW_QUOTA_EXCEEDED",
-                "remaining_quota": 0,
-                "upgrade_url": "/mentee/book"
-            }
-        )
+    # Fast-fail on the quota we already have; the commit re-checks it atomically
+    quota_exceeded_detail = {
+        "error": "quota_exceeded",
+        "message": "You have used all interviews in your plan",
+        "code": "INTERVIEW_QUOTA_EXCEEDED",
+        "remaining_quota": 0,
+        "upgrade_url": "/mentee/book"
+    }
+    if user.get("interview_quota_remaining", 0) <= 0:
+        raise HTTPException(status_code=422, detail=quota_exceeded_detail)
     
-    # Acquire slot lock for transaction (using MongoDB findAndModify for atomicity)
-    slot_lock_result = await db.mentor_slots.find_one_and_update(
-        {
-            "id": booking_data.slot_id,
-            "status": "available",
-            "$or": [
-                {"lock": {"$exists": False}},
-                {"lock.expires_at": {"$lt": datetime.now(timezone.utc)}}
-            ]
-        },
-        {
-            "$set": {
-                "lock": {
-                    "locked_by": user["id"],
-                    "locked_at": datetime.now(timezone.utc),
-                    "expires_at": datetime.now(timezone.utc) + timedelta(seconds=30)
-                }
-            }
-        },
-        return_document=True
-    )
+    # Read the slot; the transactional commit below re-checks availability atomically
+    slot = await db.mentor_slots.find_one({"id": booking_data.slot_id, "status": "available"})
+    if not slot:
+        raise HTTPException(status_code=409, detail=slot_unavailable_detail)
     
-    if not slot_lock_result:
-        # Slot not available or already locked
+    # Respect holds: someone else's live hold, or a queue the caller isn't at the front of, blocks the booking
+    hold = await get_live_hold(slot["id"])
+    if hold and hold["mentee_id"] != user["id"]:
         raise HTTPException(
             status_code=409,
             detail={
                 "error": "conflict",
-                "message": "This slot is no longer available or is being booked by another user",
-                "code": "SLOT_NOT_AVAILABLE"
+                "message": "Another mentee is completing a booking for this slot. Join the queue to be next in line.",
+                "code": "SLOT_HELD"
             }
         )
+    if not hold:
+        head = await db.slot_queue.find_one({"slot_id": slot["id"]}, {"_id": 0, "mentee_id": 1}, sort=[("queued_at", ASCENDING)])
+        if head and head["mentee_id"] != user["id"]:
+            raise HTTPException(
+                status_code=409,
+                detail={
+                    "error": "conflict",
+                    "message": "Other mentees are queued for this slot. Join the queue to be next in line.",
+                    "code": "SLOT_HELD"
+                }
+            )
     
-    try:
-        slot = dict(slot_lock_result)
-        
-        # Validate company is in slot's specializations (if specializations are specified)
-        # If company_specializations is empty or not set, allow any company
-        if slot.get("company_specializations") and len(slot["company_specializations"]) > 0:
-            if booking_data.company_id not in slot["company_specializations"]:
-                raise HTTPException(
-                    status_code=400,
-                    detail={
-                        "error": "validation_error",
-                        "message": "Selected company is not in slot's specializations",
-                        "field": "company_id",
-                        "code": "INVALID_COMPANY_SELECTION"
-                    }
-                )
-        
-        # Get company details
-        company = await db.companies.find_one({"id": booking_data.company_id})
-        if not company:
-            raise HTTPException(status_code=404, detail="Company not found")
-        
-        # Determine interview type and experience level from slot
-        # For now, use the first values (in a real system, mentee would select these)
-        interview_type = slot["interview_types"][0] if slot["interview_types"] else "coding"
-        experience_level = slot["experience_levels"][0] if slot["experience_levels"] else "mid"
-        
-        # Create booking record
-        booking_id = str(uuid.uuid4())
-        booking_doc = {
-            "id": booking_id,
-            "slot_id": slot["id"],
-            "mentee_id": user["id"],
-            "mentee_name": user["name"],
-            "mentee_email": user["email"],
-            "mentor_id": slot["mentor_id"],
-            "mentor_name": slot["mentor_name"],
-            "mentor_email": slot["mentor_email"],
-            "company_id": booking_data.company_id,
-            "company_name": company["name"],
-            "interview_type": interview_type,
-            "experience_level": experience_level,
-            "interview_track": booking_data.interview_track,
-            "specific_topics": booking_data.specific_topics or [],
-            "additional_notes": booking_data.additional_notes or "",
-            "date": slot["date"],
-            "start_time": slot["start_time"],
-            "end_time": slot["end_time"],
-            "meeting_link": slot["meeting_link"],
-            "status": "confirmed",
-            "cancelled_by": None,
-            "cancellation_reason": None,
-            "feedback_submitted": False,
-            "feedback_id": None,
-            "created_at": datetime.now(timezone.utc),
-            "confirmed_at": datetime.now(timezone.utc),
-            "completed_at": None,
-            "cancelled_at": None
-        }
-        
-        await db.bookings.insert_one(booking_doc)
-        
-        # Create notifications for mentee and mentor
-        mentee_notification = {
-            "id": str(uuid.uuid4()),
-            "user_id": user["id"],
-            "type": "booking_confirmed",
-            "title": "Mock Interview Booked!",
-            "message": f"Your mock interview with {slot['mentor_name']} for {company['name']} is confirmed on {slot['date']} at {slot['start_time']}",
-            "read": False,
-            "created_at": datetime.now(timezone.utc).isoformat()
-        }
-        await db.notifications.insert_one(mentee_notification)
-        logger.info(f"✅ Created mentee notification: {mentee_notification['id']} for user {user['id']}")
-        
-        mentor_notification = {
-            "id": str(uuid.uuid4()),
-            "user_id": slot["mentor_id"],
-            "type": "new_booking",
-            "title": "New Booking Received",
-            "message": f"{user['name']} booked your slot for {company['name']} on {slot['date']} at {slot['start_time']}",
-            "read": False,
-            "created_at": datetime.now(timezone.utc).isoformat()
-        }
-        await db.notifications.insert_one(mentor_notification)
-        logger.info(f"✅ Created mentor notification: {mentor_notification['id']} for user {slot['mentor_id']}")
-        
-        # Update slot status to "booked" and remove lock
-        await db.mentor_slots.update_one(
-            {"id": slot["id"]},
-            {
-                "$set": {"status": "booked", "updated_at": datetime.now(timezone.utc)},
-                "$unset": {"lock": ""}
-            }
-        )
-        
-        # Decrement mentee quota
-        await db.users.update_one(
-            {"id": user["id"]},
-            {
-                "$inc": {"interview_quota_remaining": -1},
-                "$set": {"updated_at": datetime.now(timezone.utc)}
-            }
+    # Validate company is in slot's specializations (if specializations are specified)
+    # If company_specializations is empty or not set, allow any company
+    if slot.get("company_specializations") and len(slot["company_specializations"]) > 0:
+        if booking_data.company_id not in slot["company_specializations"]:
+            raise HTTPException(
+                status_code=400,
+                detail={
+                    "error": "validation_error",
+                    "message": "Selected company is not in slot's specializations",
+                    "field": "company_id",
+                    "code": "INVALID_COMPANY_SELECTION"
+                }
+            )
+    
+    # Get company details
+    company = await db.companies.find_one({"id": booking_data.company_id})
+    if not company:
+        raise HTTPException(status_code=404, detail="Company not found")
+    
+    # Determine interview type and experience level from slot
+    # For now, use the first values (in a real system, mentee would select these)
+    interview_type = slot["interview_types"][0] if slot["interview_types"] else "coding"
+    experience_level = slot["experience_levels"][0] if slot["experience_levels"] else "mid"
+    
+    # Create booking record
+    booking_id = str(uuid.uuid4())
+    booking_doc = {
+        "id": booking_id,
+        "slot_id": slot["id"],
+        "mentee_id": user["id"],
+        "mentee_name": user["name"],
+        "mentee_email": user["email"],
+        "mentor_id": slot["mentor_id"],
+        "mentor_name": slot["mentor_name"],
+        "mentor_email": slot["mentor_email"],
+        "company_id": booking_data.company_id,
+        "company_name": company["name"],
+        "interview_type": interview_type,
+        "experience_level": experience_level,
+        "interview_track": booking_data.interview_track,
+        "specific_topics": booking_data.specific_topics or [],
+        "additional_notes": booking_data.additional_notes or "",
+        "date": slot["date"],
+        "start_time": slot["start_time"],
+        "end_time": slot["end_time"],
+        "meeting_link": slot["meeting_link"],
+        "status": "confirmed",
+        "cancelled_by": None,
+        "cancellation_reason": None,
+        "feedback_submitted": False,
+        "feedback_id": None,
+        "created_at": datetime.now(timezone.utc),
+        "confirmed_at": datetime.now(timezone.utc),
+        "completed_at": None,
+        "cancelled_at": None
+    }
+    
+    async def commit_booking(session):
+        # Claim the slot - only one concurrent request can flip it from available to booked
+        slot_claim = await db.mentor_slots.update_one(
+            {"id": slot["id"], "status": "available"},
+            {"$set": {"status": "booked", "updated_at": datetime.now(timezone.utc)}},
+            session=session
         )
+        if slot_claim.modified_count == 0:
+            raise HTTPException(status_code=409, detail=slot_unavailable_detail)
         
-        # Send confirmation emails (async, don't wait)
-        asyncio.create_task(send_new_booking_confirmation_emails(booking_doc))
-        
-        # Return booking response with revealed mentor information
-        return {
-            "id": booking_doc["id"],
-            "slot_id": booking_doc["slot_id"],
-            "mentee_id": booking_doc["mentee_id"],
-            "mentor_id": booking_doc["mentor_id"],
-            "mentor_name": booking_doc["mentor_name"],
-            "mentor_email": booking_doc["mentor_email"],
-            "company_name": booking_doc["company_name"],
-            "interview_type": booking_doc["interview_type"],
-            "experience_level": booking_doc["experience_level"],
-            "date": booking_doc["date"],
-            "start_time": booking_doc["start_time"],
-            "end_time": booking_doc["end_time"],
-            "meeting_link": booking_doc["meeting_link"],
-            "status": booking_doc["status"],
-            "created_at": booking_doc["created_at"]
-        }
+        # Conditional quota consume - never drives the quota below zero
+        try:
+            await record_quota_entry(
+                user["id"], "interview", "consume", -1,
+                idempotency_key=f"booking:{booking_id}:consume",
+                reason="Mock interview booking",
+                ref_id=booking_id,
+                session=session
+            )
+        except QuotaExhausted:
+            if session is None:
+                await db.mentor_slots.update_one(
+                    {"id": slot["id"], "status": "booked"},
+                    {"$set": {"status": "available", "updated_at": datetime.now(timezone.utc)}}
+                )
+            raise HTTPException(status_code=422, detail=quota_exceeded_detail)
         
+        try:
+            await db.bookings.insert_one(booking_doc, session=session)
+            return await record_event("booking.created", booking_id, booking_doc, session=session)
+        except Exception:
+            if session is None:
+                # No transaction to abort (standalone mongod) - undo the slot claim and quota consume
+                await db.bookings.delete_one({"id": booking_id})
+                await db.mentor_slots.update_one(
+                    {"id": slot["id"], "status": "booked"},
+                    {"$set": {"status": "available", "updated_at": datetime.now(timezone.utc)}}
+                )
+                await record_quota_entry(
+                    user["id"], "interview", "refund", 1,
+                    idempotency_key=f"booking:{booking_id}:refund",
+                    reason="Booking failed to commit",
+                    ref_id=booking_id
+                )
+            raise
+    
+    try:
+        event = await run_in_transaction(commit_booking)
     except HTTPException:
-        # Release lock on error
-        await db.mentor_slots.update_one(
-            {"id": booking_data.slot_id},
-            {"$unset": {"lock": ""}}
-        )
         raise
     except Exception as e:
-        # Release lock on any error
-        await db.mentor_slots.update_one(
-            {"id": booking_data.slot_id},
-            {"$unset": {"lock": ""}}
-        )
         raise HTTPException(status_code=500, detail=f"Booking failed: {str(e)}")
+    finally:
+        # Even a rolled-back claim may have been visible to a concurrent browse
+        await bump_version("mentor_slots")
+    
+    logger.info(f"✅ Booking {booking_id} committed")
+    await publish_slot_changes("slot_booked", [slot])
+    
+    # The hold has served its purpose; the queue stays as a waitlist in case the booking is cancelled
+    await db.slot_holds.delete_one({"slot_id": slot["id"], "mentee_id": user["id"]})
+    await db.slot_queue.delete_one({"slot_id": slot["id"], "mentee_id": user["id"]})
+    
+    # Notifications, confirmation emails and reminder timers run as event subscribers
+    dispatch_event_soon(event)
+    
+    # Return booking response with revealed mentor information
+    return {
+        "id": booking_doc["id"],
+        "slot_id": booking_doc["slot_id"],
+        "mentee_id": booking_doc["mentee_id"],
+        "mentor_id": booking_doc["mentor_id"],
+        "mentor_name": booking_doc["mentor_name"],
+        "mentor_email": booking_doc["mentor_email"],
+        "company_name": booking_doc["company_name"],
+        "interview_type": booking_doc["interview_type"],
+        "experience_level": booking_doc["experience_level"],
+        "date": booking_doc["date"],
+        "start_time": booking_doc["start_time"],
+        "end_time": booking_doc["end_time"],
+        "meeting_link": booking_doc["meeting_link"],
+        "status": booking_doc["status"],
+        "created_at": booking_doc["created_at"]
+    }
 
 @api_router.delete("/mentee/bookings/{booking_id}")
 async def cancel_booking(booking_id: str, user=Depends(get_current_user)):
@@ -4904,52 +8112,51 @@ async def cancel_booking(booking_id: str, user=Depends(get_current_user)):
             }
         )
     
-    # Update slot status to "available"
-    await db.mentor_slots.update_one(
-        {"id": booking["slot_id"]},
-        {
-            "$set": {
-                "status": "available",
-                "updated_at": datetime.now(timezone.utc)
-            }
-        }
-    )
-    
-    # Delete booking record
-    await db.bookings.delete_one({"id": booking_id})
-    
-    # Restore mentee quota
-    await db.users.update_one(
-        {"id": user["id"]},
-        {
-            "$inc": {"interview_quota_remaining": 1},
-            "$set": {"updated_at": datetime.now(timezone.utc)}
-        }
-    )
+    async def commit_cancellation(session):
+        # Delete booking record - a concurrent cancel of the same booking finds nothing
+        deleted = await db.bookings.delete_one({"id": booking_id, "status": {"$ne": "cancelled"}}, session=session)
+        if deleted.deleted_count == 0:
+            raise HTTPException(status_code=400, detail="Booking already cancelled")
+        
+        # Update slot status to "available"
+        await db.mentor_slots.update_one(
+            {"id": booking["slot_id"]},
+            {
+                "$set": {
+                    "status": "available",
+                    "updated_at": datetime.now(timezone.utc)
+                }
+            },
+            session=session
+        )
+        
+        # Restore mentee quota
+        await record_quota_entry(
+            user["id"], "interview", "refund", 1,
+            idempotency_key=f"booking:{booking_id}:refund",
+            reason="Booking cancelled by mentee",
+            ref_id=booking_id,
+            session=session
+        )
+        
+        booking.pop("_id", None)
+        return await record_event("booking.cancelled", booking_id, {
+            "booking": booking,
+            "cancelled_by_role": "mentee",
+            "cancellation_reason": None
+        }, session=session)
     
-    # Send cancellation notifications (async, don't wait)
-    asyncio.create_task(send_cancellation_notification_emails(
-        booking=dict(booking),
-        cancelled_by_role="mentee",
-        cancellation_reason=None
-    ))
+    # Timers, slot queue promotion and cancellation emails run as event subscribers
+    dispatch_event_soon(await run_in_transaction(commit_cancellation))
+    await bump_version("mentor_slots")
+    released = await db.mentor_slots.find_one({"id": booking["slot_id"], "status": "available"}, {"_id": 0})
+    if released:
+        await publish_slot_changes("slot_released", [released])
     
     return {"message": "Booking cancelled successfully"}
 
-@api_router.get("/mentee/bookings")
-async def get_mentee_bookings(user=Depends(get_current_user)):
-    """
-    Get all bookings for a mentee.
-    Returns bookings separated into upcoming and past sessions.
-    Includes mentor information, meeting links, and feedback status.
-    """
-    if user["role"] != "mentee":
-        raise HTTPException(status_code=403, detail="Mentee only")
-    
-    # Fetch all bookings for mentee
-    bookings = await db.bookings.find({"mentee_id": user["id"]}).to_list(1000)
-    
-    # Separate into upcoming and past
+def shape_mentee_bookings(bookings: list, feedback_ids: dict) -> dict:
+    """Split bookings into upcoming and past, marking which have feedback (booking id -> feedback id)"""
     now = datetime.now(timezone.utc).replace(tzinfo=None)
     upcoming = []
     past = []
@@ -4957,11 +8164,10 @@ async def get_mentee_bookings(user=Depends(get_current_user)):
     for booking in bookings:
         booking_dict = dict(booking)
         
-        # Check if feedback exists for this booking
-        feedback = await db.feedbacks.find_one({"booking_id": booking_dict["id"]})
-        booking_dict["feedback_submitted"] = feedback is not None
-        if feedback:
-            booking_dict["feedback_id"] = feedback["id"]
+        feedback_id = feedback_ids.get(booking_dict["id"])
+        booking_dict["feedback_submitted"] = feedback_id is not None
+        if feedback_id:
+            booking_dict["feedback_id"] = feedback_id
         
         # Determine if upcoming or past
         booking_datetime = datetime.fromisoformat(f"{booking_dict['date']}T{booking_dict['start_time']}:00")
@@ -4980,6 +8186,23 @@ async def get_mentee_bookings(user=Depends(get_current_user)):
         "past": past
     }
 
+@api_router.get("/mentee/bookings")
+async def get_mentee_bookings(user=Depends(get_current_user)):
+    """
+    Get all bookings for a mentee.
+    Returns bookings separated into upcoming and past sessions.
+    Includes mentor information, meeting links, and feedback status.
+    """
+    if user["role"] != "mentee":
+        raise HTTPException(status_code=403, detail="Mentee only")
+    
+    # Fetch all bookings for mentee, and their feedback in one query
+    bookings = await db.bookings.find({"mentee_id": user["id"]}).to_list(1000)
+    feedbacks = await db.feedbacks.find(
+        {"booking_id": {"$in": [b["id"] for b in bookings]}}, {"_id": 0, "id": 1, "booking_id": 1}
+    ).to_list(None)
+    return shape_mentee_bookings(bookings, {f["booking_id"]: f["id"] for f in feedbacks})
+
 @api_router.get("/mentee/feedbacks")
 async def get_mentee_feedbacks(user=Depends(get_current_user)):
     if user["role"] != "mentee":
@@ -5001,25 +8224,20 @@ async def create_resume_request(
     if user["role"] != "mentee":
         raise HTTPException(status_code=403, detail="Mentee only")
     
-    # Check if user has resume review quota
+    # Check if user has resume review quota (cached ledger balance - no per-request counting)
+    if not user.get("quota_ledger_opened"):
+        await open_quota_ledger(user)
+    
     resume_reviews = user.get("plan_features", {}).get("resume_reviews", 0)
-    if resume_reviews <= 0:
+    if resume_reviews <= 0 and user.get("resume_review_quota", 0) <= 0:
         raise HTTPException(
             status_code=403,
             detail="No resume reviews available in your plan. Please upgrade."
         )
     
-    # Check how many reviews already used
-    used_reviews = await db.resume_requests.count_documents({
-        "mentee_id": user["id"],
-        "status": {"$ne": "cancelled"}
-    })
-    
-    if used_reviews >= resume_reviews:
-        raise HTTPException(
-            status_code=403,
-            detail="You have used all your resume reviews. Please upgrade your plan."
-        )
+    quota_exhausted_detail = "You have used all your resume reviews. Please upgrade your plan."
+    if user.get("resume_review_quota", 0) <= 0:
+        raise HTTPException(status_code=403, detail=quota_exhausted_detail)
     
     # Validate file
     if not resume.content_type in ["application/pdf", "application/msword", "application/vnd.openxmlformats-officedocument.wordprocessingml.document"]:
@@ -5057,7 +8275,20 @@ async def create_resume_request(
         "updated_at": datetime.now(timezone.utc).isoformat()
     }
     
-    await db.resume_requests.insert_one(request_doc)
+    async def commit_request(session):
+        await record_quota_entry(
+            user["id"], "resume_review", "consume", -1,
+            idempotency_key=f"resume_request:{request_doc['id']}:consume",
+            reason="Resume review request",
+            ref_id=request_doc["id"],
+            session=session
+        )
+        await db.resume_requests.insert_one(request_doc, session=session)
+    
+    try:
+        await run_in_transaction(commit_request)
+    except QuotaExhausted:
+        raise HTTPException(status_code=403, detail=quota_exhausted_detail)
     
     # Send email notification to admin
     try:
@@ -5230,6 +8461,8 @@ async def create_resume_review_slot(data: ResumeReviewSlotCreate, user=Depends(g
     if duration != 30:
         raise HTTPException(status_code=400, detail="Resume review slots must be exactly 30 minutes")
     
+    await ensure_no_slot_overlap(user["id"], data.date, data.start_time, data.end_time)
+    
     # Create slot
     slot = {
         "id": str(uuid.uuid4()),
@@ -5310,6 +8543,15 @@ async def update_resume_review_slot(slot_id: str, data: dict, user=Depends(get_c
     if "meeting_link" in data:
         update_data["meeting_link"] = data["meeting_link"]
     
+    if any(field in update_data for field in ("date", "start_time", "end_time")):
+        await ensure_no_slot_overlap(
+            user["id"],
+            update_data.get("date", slot["date"]),
+            update_data.get("start_time", slot["start_time"]),
+            update_data.get("end_time", slot["end_time"]),
+            exclude_id=slot_id
+        )
+    
     update_data["updated_at"] = datetime.now(timezone.utc).isoformat()
     
     await db.resume_review_slots.update_one({"id": slot_id}, {"$set": update_data})
@@ -5724,7 +8966,10 @@ async def get_available_mentors(user=Depends(get_current_user)):
     """Get list of available mentors with their profiles"""
     if user["role"] != "mentee":
         raise HTTPException(status_code=403, detail="Mentee only")
-    
+    return await load_available_mentors()
+
+@cached("available_mentors", ttl=60, maxsize=1, tags=("mentors",))
+async def load_available_mentors():
     mentors = await db.users.find({"role": "mentor", "status": "active"}).to_list(100)
     
     # Enhance mentor data with stats
@@ -5788,79 +9033,6 @@ class VerifyPaymentRequest(BaseModel):
     razorpay_signature: str
     order_id: str  # Our internal order ID
 
-PLAN_PRICES = {
-    # New minimal launch pricing
-    "foundation": 199900,   # ₹1,999 in paise
-    "growth": 499900,       # ₹4,999 in paise  
-    "accelerator": 899900,  # ₹8,999 in paise
-    # Legacy support for old plan IDs - DEPRECATED: Use dynamic pricing
-    "starter": 199900,      # ₹1,999 in paise
-    "professional": 499900, # ₹4,999 in paise
-    "premium": 899900,      # ₹8,999 in paise
-    "monthly": 199900,      # ₹1,999 in paise
-    "quarterly": 499900,    # ₹4,999 in paise
-    "biannual": 899900      # ₹8,999 in paise
-}
-
-PLAN_NAMES = {
-    # New minimal launch plans
-    "foundation": "Foundation Plan",
-    "growth": "Growth Plan",
-    "accelerator": "Accelerator Plan", 
-    # Legacy support for old plan IDs - DEPRECATED: Use dynamic pricing
-    "starter": "Starter Plan",
-    "professional": "Professional Plan", 
-    "premium": "Premium Plan",
-    "monthly": "Monthly Plan",
-    "quarterly": "3 Months Plan",
-    "biannual": "6 Months Plan"
-}
-
-async def get_pricing_plan(plan_id: str):
-    """Get pricing plan from database, fallback to hardcoded values"""
-    plan = await db.pricing_plans.find_one({"plan_id": plan_id, "is_active": True})
-    if plan:
-        return {
-            "price": plan["price"],
-            "name": plan["name"],
-            "duration_months": plan["duration_months"],
-            "features": plan.get("features", [])
-        }
-    
-    # Mock add-on plans (not in database)
-    mock_addons = {
-        "mock_1": {"price": 249900, "name": "1 Mock Interview", "duration_months": 0},
-        "mock_3": {"price": 699900, "name": "3 Mock Interviews", "duration_months": 0},
-        "mock_5": {"price": 1099900, "name": "5 Mock Interviews", "duration_months": 0}
-    }
-    
-    if plan_id in mock_addons:
-        return mock_addons[plan_id]
-    
-    # Fallback to hardcoded values for backward compatibility
-    if plan_id in PLAN_PRICES:
-        duration_map = {
-            # New minimal launch plans
-            "foundation": 1,
-            "growth": 3,
-            "accelerator": 6,
-            # Legacy support
-            "starter": 1,
-            "professional": 3,
-            "premium": 6,
-            "monthly": 1,
-            "quarterly": 3,
-            "biannual": 6
-        }
-        return {
-            "price": PLAN_PRICES[plan_id],
-            "name": PLAN_NAMES[plan_id],
-            "duration_months": duration_map.get(plan_id, 1),
-            "features": []
-        }
-    
-    return None
-
 @api_router.post("/payment/create-order")
 async def create_payment_order(data: CreateOrderRequest):
     # Check if email already exists
@@ -5911,10 +9083,7 @@ async def create_payment_order(data: CreateOrderRequest):
         raise HTTPException(status_code=500, detail=f"Failed to create order: {str(e)}")
     
     # Store order in DB with user details (pending status)
-    # Check if this is a founding batch purchase (first 25 customers)
-    founding_count = await db.orders.count_documents({"status": "success", "is_founding_batch": True})
-    is_founding_batch = founding_count < FOUNDING_SLOTS_TOTAL
-    
+    # Founding seats are claimed when the payment is verified, not when the order is created
     order_doc = {
         "id": str(uuid.uuid4()),
         "razorpay_order_id": razorpay_order["id"],
@@ -5930,7 +9099,7 @@ async def create_payment_order(data: CreateOrderRequest):
         "struggle": data.struggle,
         "status": "pending",
         "is_upgrade": data.is_upgrade or bool(existing),
-        "is_founding_batch": is_founding_batch,
+        "is_founding_batch": False,
         "created_at": datetime.now(timezone.utc).isoformat()
     }
     await db.orders.insert_one(order_doc)
@@ -5968,15 +9137,29 @@ async def verify_payment(data: VerifyPaymentRequest):
     except Exception as e:
         raise HTTPException(status_code=400, detail=f"Signature verification error: {str(e)}")
     
-    # Update order status
-    await db.orders.update_one(
-        {"id": data.order_id},
+    # Update order status (conditional, so a replayed verification can't process the order twice)
+    marked = await db.orders.update_one(
+        {"id": data.order_id, "status": {"$ne": "paid"}},
         {"$set": {
             "status": "paid",
             "razorpay_payment_id": data.razorpay_payment_id,
             "paid_at": datetime.now(timezone.utc).isoformat()
         }}
     )
+    if marked.modified_count == 0:
+        raise HTTPException(status_code=400, detail="Order already processed")
+    
+    # The first FOUNDING_SLOTS_TOTAL customers to buy a plan join the founding batch
+    already_founding = await db.orders.find_one(
+        {"email": order["email"], "status": "paid", "is_founding_batch": True}, {"_id": 1}
+    )
+    if not order["plan_id"].startswith("mock_") and not already_founding:
+        founding_number = await claim_founding_slot()
+        if founding_number:
+            await db.orders.update_one(
+                {"id": data.order_id},
+                {"$set": {"is_founding_batch": True, "founding_number": founding_number}}
+            )
     
     # Check if this is an upgrade (user already exists)
     existing_user = await db.users.find_one({"email": order["email"]})
@@ -5985,27 +9168,22 @@ async def verify_payment(data: VerifyPaymentRequest):
         # Check if this is a mock add-on purchase
         if order["plan_id"].startswith("mock_"):
             # This is a mock add-on purchase - just add to quota
-            mock_counts = {
-                "mock_1": 1,
-                "mock_3": 3,
-                "mock_5": 5
-            }
-            
-            additional_mocks = mock_counts.get(order["plan_id"], 0)
+            addon = await get_pricing_plan(order["plan_id"])
+            additional_mocks = addon.get("mock_interviews", 0) if addon else 0
             
-            # Update user's quota
-            await db.users.update_one(
-                {"email": order["email"]},
-                {
-                    "$inc": {
-                        "interview_quota_total": additional_mocks,
-                        "interview_quota_remaining": additional_mocks
-                    },
-                    "$set": {
-                        "updated_at": datetime.now(timezone.utc).isoformat()
-                    }
-                }
+            # Grant the mocks through the ledger (keyed by order, so a replayed verification grants once)
+            await open_quota_ledger(existing_user)
+            granted = await record_quota_entry(
+                existing_user["id"], "interview", "grant", additional_mocks,
+                idempotency_key=f"order:{order['id']}:interview",
+                reason=f"Purchased {order['plan_name']}",
+                ref_id=order["id"]
             )
+            if granted:
+                await db.users.update_one(
+                    {"email": order["email"]},
+                    {"$inc": {"interview_quota_total": additional_mocks}}
+                )
             
             # Get updated user
             updated_user = await db.users.find_one({"email": order["email"]})
@@ -6014,13 +9192,16 @@ async def verify_payment(data: VerifyPaymentRequest):
             # Generate token for auto-login
             token = create_token(user_doc["id"], user_doc["role"])
             
-            # Send upgrade email (non-blocking)
-            asyncio.create_task(send_upgrade_email(
-                name=order["name"],
-                email=order["email"],
-                plan_name=order["plan_name"],
-                amount=int(order["amount"] / 100)  # Convert paise to rupees
-            ))
+            # Welcome / upgrade email runs as an event subscriber
+            await publish_event("payment.verified", order["id"], {
+                "user_id": user_doc["id"],
+                "plan_id": order["plan_id"],
+                "is_upgrade": True,
+                "name": order["name"],
+                "email": order["email"],
+                "plan_name": order["plan_name"],
+                "amount": int(order["amount"] / 100)  # Convert paise to rupees
+            })
             
             return {
                 "success": True,
@@ -6030,52 +9211,7 @@ async def verify_payment(data: VerifyPaymentRequest):
             }
         
         # Get plan configuration for quota (for plan upgrades)
-        plan_configs = {
-            "starter": {
-                "interview_quota_total": 1,
-                "plan_features": {
-                    "mock_interviews": 1,
-                    "resume_reviews": 1,
-                    "resume_review_type": "email",
-                    "offline_profile_creation": 0,
-                    "ai_tools_access": "limited",
-                    "community_access": False,
-                    "priority_support": False,
-                    "strategy_calls": 0,
-                    "referral_guidance": False
-                }
-            },
-            "pro": {
-                "interview_quota_total": 3,
-                "plan_features": {
-                    "mock_interviews": 3,
-                    "resume_reviews": 1,
-                    "resume_review_type": "call",
-                    "offline_profile_creation": 0,
-                    "ai_tools_access": "full",
-                    "community_access": True,
-                    "priority_support": False,
-                    "strategy_calls": 1,
-                    "referral_guidance": False
-                }
-            },
-            "elite": {
-                "interview_quota_total": 6,
-                "plan_features": {
-                    "mock_interviews": 6,
-                    "resume_reviews": 1,
-                    "resume_review_type": "call",
-                    "offline_profile_creation": 1,
-                    "ai_tools_access": "full",
-                    "community_access": True,
-                    "priority_support": True,
-                    "strategy_calls": 0,
-                    "referral_guidance": True
-                }
-            }
-        }
-        
-        plan_config = plan_configs.get(order["plan_id"], plan_configs["starter"])
+        plan_config = await plan_entitlements(order["plan_id"])
         
         # This is an upgrade - update existing user
         await db.users.update_one(
@@ -6087,12 +9223,26 @@ async def verify_payment(data: VerifyPaymentRequest):
                 "current_role": order.get("current_role", existing_user.get("current_role", "")),
                 "target_role": order.get("target_role", existing_user.get("target_role", "")),
                 "interview_quota_total": plan_config["interview_quota_total"],
-                "interview_quota_remaining": plan_config["interview_quota_total"],
                 "plan_features": plan_config["plan_features"],
                 "upgraded_at": datetime.now(timezone.utc).isoformat()
             }}
         )
         
+        # An upgrade resets balances to the new plan's allowance
+        await open_quota_ledger(existing_user)
+        await set_quota_balance(
+            existing_user["id"], "interview", plan_config["interview_quota_total"],
+            idempotency_key=f"order:{order['id']}:interview",
+            reason=f"Upgraded to {order['plan_name']}",
+            ref_id=order["id"]
+        )
+        await set_quota_balance(
+            existing_user["id"], "resume_review", plan_config["plan_features"]["resume_reviews"],
+            idempotency_key=f"order:{order['id']}:resume_review",
+            reason=f"Upgraded to {order['plan_name']}",
+            ref_id=order["id"]
+        )
+        
         # Get updated user
         updated_user = await db.users.find_one({"email": order["email"]})
         user_doc = updated_user
@@ -6100,13 +9250,16 @@ async def verify_payment(data: VerifyPaymentRequest):
         # Generate token for auto-login
         token = create_token(user_doc["id"], user_doc["role"])
         
-        # Send upgrade email (non-blocking)
-        asyncio.create_task(send_upgrade_email(
-            name=order["name"],
-            email=order["email"],
-            plan_name=order["plan_name"],
-            amount=int(order["amount"] / 100)  # Convert paise to rupees
-        ))
+        # Welcome / upgrade email runs as an event subscriber
+        await publish_event("payment.verified", order["id"], {
+            "user_id": user_doc["id"],
+            "plan_id": order["plan_id"],
+            "is_upgrade": True,
+            "name": order["name"],
+            "email": order["email"],
+            "plan_name": order["plan_name"],
+            "amount": int(order["amount"] / 100)  # Convert paise to rupees
+        })
         
         return {
             "success": True,
@@ -6117,52 +9270,7 @@ async def verify_payment(data: VerifyPaymentRequest):
     
     else:
         # Get plan configuration for quota
-        plan_configs = {
-            "starter": {
-                "interview_quota_total": 1,
-                "plan_features": {
-                    "mock_interviews": 1,
-                    "resume_reviews": 1,
-                    "resume_review_type": "email",
-                    "offline_profile_creation": 0,
-                    "ai_tools_access": "limited",
-                    "community_access": False,
-                    "priority_support": False,
-                    "strategy_calls": 0,
-                    "referral_guidance": False
-                }
-            },
-            "pro": {
-                "interview_quota_total": 3,
-                "plan_features": {
-                    "mock_interviews": 3,
-                    "resume_reviews": 1,
-                    "resume_review_type": "call",
-                    "offline_profile_creation": 0,
-                    "ai_tools_access": "full",
-                    "community_access": True,
-                    "priority_support": False,
-                    "strategy_calls": 1,
-                    "referral_guidance": False
-                }
-            },
-            "elite": {
-                "interview_quota_total": 6,
-                "plan_features": {
-                    "mock_interviews": 6,
-                    "resume_reviews": 1,
-                    "resume_review_type": "call",
-                    "offline_profile_creation": 1,
-                    "ai_tools_access": "full",
-                    "community_access": True,
-                    "priority_support": True,
-                    "strategy_calls": 0,
-                    "referral_guidance": True
-                }
-            }
-        }
-        
-        plan_config = plan_configs.get(order["plan_id"], plan_configs["starter"])
+        plan_config = await plan_entitlements(order["plan_id"])
         
         # This is a new user - create account
         user_doc = {
@@ -6178,22 +9286,41 @@ async def verify_payment(data: VerifyPaymentRequest):
             "current_role": order.get("current_role", ""),
             "target_role": order.get("target_role", ""),
             "interview_quota_total": plan_config["interview_quota_total"],
-            "interview_quota_remaining": plan_config["interview_quota_total"],
+            "interview_quota_remaining": 0,
+            "resume_review_quota": 0,
+            "quota_ledger_opened": True,
             "plan_features": plan_config["plan_features"],
             "created_at": datetime.now(timezone.utc).isoformat()
         }
         await db.users.insert_one(user_doc)
+        await register_default_slot_interest(user_doc["id"])
+        
+        # Plan allowances are granted through the quota ledger
+        for quota_type, amount in [
+            ("interview", plan_config["interview_quota_total"]),
+            ("resume_review", plan_config["plan_features"]["resume_reviews"])
+        ]:
+            await record_quota_entry(
+                user_doc["id"], quota_type, "grant", amount,
+                idempotency_key=f"order:{order['id']}:{quota_type}",
+                reason=f"Purchased {order['plan_name']}",
+                ref_id=order["id"]
+            )
+        user_doc = await db.users.find_one({"id": user_doc["id"]})
         
         # Generate token for auto-login
         token = create_token(user_doc["id"], user_doc["role"])
         
-        # Send welcome email (non-blocking)
-        asyncio.create_task(send_welcome_email(
-            name=order["name"],
-            email=order["email"],
-            plan_name=order["plan_name"],
-            amount=int(order["amount"] / 100)  # Convert paise to rupees
-        ))
+        # Welcome / upgrade email runs as an event subscriber
+        await publish_event("payment.verified", order["id"], {
+            "user_id": user_doc["id"],
+            "plan_id": order["plan_id"],
+            "is_upgrade": False,
+            "name": order["name"],
+            "email": order["email"],
+            "plan_name": order["plan_name"],
+            "amount": int(order["amount"] / 100)  # Convert paise to rupees
+        })
         
         return {
             "success": True,
@@ -6506,42 +9633,53 @@ async def cancel_session_as_admin(
     if not booking:
         raise HTTPException(status_code=404, detail="Booking not found")
     
-    # Update slot status to "available"
-    await db.mentor_slots.update_one(
-        {"id": booking["slot_id"]},
-        {"$set": {"status": "available", "updated_at": datetime.now(timezone.utc).isoformat()}}
-    )
-    
-    # Update booking status to cancelled
-    await db.bookings.update_one(
-        {"id": booking_id},
-        {
-            "$set": {
-                "status": "cancelled",
-                "cancelled_by": user["id"],
-                "cancellation_reason": cancellation_reason or "Cancelled by admin",
-                "cancelled_at": datetime.now(timezone.utc).isoformat()
-            }
-        }
-    )
-    
-    # Restore mentee's interview quota
-    mentee = await db.users.find_one({"id": booking["mentee_id"]})
-    if mentee and mentee.get("interview_quota_remaining") is not None:
-        await db.users.update_one(
-            {"id": booking["mentee_id"]},
-            {"$inc": {"interview_quota_remaining": 1}}
+    async def commit_cancellation(session):
+        # Update booking status to cancelled (only once)
+        cancelled = await db.bookings.update_one(
+            {"id": booking_id, "status": {"$ne": "cancelled"}},
+            {
+                "$set": {
+                    "status": "cancelled",
+                    "cancelled_by": user["id"],
+                    "cancellation_reason": cancellation_reason or "Cancelled by admin",
+                    "cancelled_at": datetime.now(timezone.utc).isoformat()
+                }
+            },
+            session=session
         )
-    
-    # Send cancellation notifications
-    try:
-        await send_cancellation_notification_emails(
-            dict(booking),
-            cancelled_by_role="admin",
-            cancellation_reason=cancellation_reason or "Cancelled by admin"
+        if cancelled.modified_count == 0:
+            raise HTTPException(status_code=400, detail="Booking already cancelled")
+        
+        # Update slot status to "available"
+        await db.mentor_slots.update_one(
+            {"id": booking["slot_id"]},
+            {"$set": {"status": "available", "updated_at": datetime.now(timezone.utc).isoformat()}},
+            session=session
         )
-    except Exception as e:
-        logger.error(f"Failed to send cancellation emails: {str(e)}")
+        
+        # Restore mentee's interview quota (same key as a mentee cancel, so it is refunded once)
+        if await db.users.count_documents({"id": booking["mentee_id"]}, session=session):
+            await record_quota_entry(
+                booking["mentee_id"], "interview", "refund", 1,
+                idempotency_key=f"booking:{booking_id}:refund",
+                reason=cancellation_reason or "Cancelled by admin",
+                ref_id=booking_id,
+                actor_id=user["id"],
+                session=session
+            )
+        
+        booking.pop("_id", None)
+        return await record_event("booking.cancelled", booking_id, {
+            "booking": booking,
+            "cancelled_by_role": "admin",
+            "cancellation_reason": cancellation_reason or "Cancelled by admin"
+        }, session=session)
+    
+    dispatch_event_soon(await run_in_transaction(commit_cancellation))
+    await bump_version("mentor_slots")
+    released = await db.mentor_slots.find_one({"id": booking["slot_id"], "status": "available"}, {"_id": 0})
+    if released:
+        await publish_slot_changes("slot_released", [released])
     
     return {"message": "Session cancelled successfully"}
 
@@ -6828,6 +9966,13 @@ async def get_payment_config():
 async def root():
     return {"message": "Codementee API"}
 
+@app.get("/metrics", include_in_schema=False)
+async def get_metrics(request: Request):
+    """Prometheus scrape endpoint for this worker (Bearer METRICS_TOKEN when set)"""
+    if METRICS_TOKEN and not hmac.compare_digest(request.headers.get("authorization", ""), f"Bearer {METRICS_TOKEN}"):
+        raise HTTPException(status_code=401, detail="Invalid metrics token")
+    return Response(metrics.render(), media_type="text/plain; version=0.0.4; charset=utf-8")
+
 # Include router
 app.include_router(api_router)
 
@@ -6838,17 +9983,34 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
+# Added last so it is outermost and times CORS handling too
+app.add_middleware(MetricsMiddleware)
 
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
 @app.on_event("startup")
 async def startup_scheduler():
-    """Start the background scheduler on application startup"""
+    """Create indexes, run backfills and start the background scheduler"""
+    await ensure_indexes()
+    await backfill_booking_jobs()
+    await backfill_quota_ledger()
+    await backfill_meet_link_leases()
+    await backfill_founding_counter()
+    await backfill_slot_interests()
+    await ensure_social_proof_collection()
+    await clear_stale_slot_locks()
+    await load_plan_catalog()
+    await start_live_broker()
+    metrics_sampler["task"] = asyncio.create_task(sample_event_loop_lag())
     start_scheduler()
 
 @app.on_event("shutdown")
 async def shutdown_db_client():
     """Shutdown database client and scheduler on application shutdown"""
     scheduler.shutdown()
+    if live_broker["task"]:
+        live_broker["task"].cancel()
+    if metrics_sampler["task"]:
+        metrics_sampler["task"].cancel()
     client.close()
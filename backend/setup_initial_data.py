@@ -405,6 +405,11 @@ async def setup_initial_data():
         else:
             print("🔧 Pricing integrity issues fixed")
 
+        # Bump the versions the API serves companies and pricing under, so running servers
+        # reload the catalog and clients holding an old ETag refetch
+        for scope in ("companies", "plan_catalog"):
+            await db.cache_versions.update_one({"_id": scope}, {"$inc": {"version": 1}}, upsert=True)
+
         print("\n🎉 Initial data setup completed successfully!")
         print("\n📋 Test Credentials:")
         print("   Admin:  admin@codementee.com / Admin@123")
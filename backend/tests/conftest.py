@@ -0,0 +1,27 @@
+import contextlib
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+
+@pytest.fixture
+def assert_max_queries():
+    """
+    Fail if a block issues more Mongo commands than allowed:
+
+        with assert_max_queries(3) as stats:
+            await server.get_mentee_bookings(user=mentee)
+    """
+    # Imported lazily: the live-API tests don't need server.py (or MONGO_URL) at all
+    from server import track_queries
+
+    @contextlib.contextmanager
+    def check(limit: int):
+        with track_queries() as stats:
+            yield stats
+        assert stats.count <= limit, f"expected at most {limit} Mongo commands, got {stats.summary()}"
+
+    return check
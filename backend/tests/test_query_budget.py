@@ -0,0 +1,68 @@
+"""
+Query budget tests: hot endpoints must not regress into one Mongo command per row.
+Runs server.py against a throwaway database; skipped when no mongod is reachable.
+"""
+import os
+import uuid
+
+import pytest
+from pymongo import MongoClient
+from pymongo.errors import PyMongoError
+
+# Never point these tests at the application's database
+os.environ["DB_NAME"] = f"codementee_query_budget_{uuid.uuid4().hex[:8]}"
+os.environ.setdefault("MONGO_URL", "mongodb://localhost:27017")
+
+import server  # noqa: E402
+
+try:
+    MongoClient(server.mongo_url, serverSelectionTimeoutMS=1000).admin.command("ping")
+except PyMongoError:
+    pytest.skip("no mongod reachable at MONGO_URL", allow_module_level=True)
+
+pytestmark = pytest.mark.asyncio(scope="module")
+
+MENTEE = {"id": "mentee-1", "role": "mentee", "name": "Test Mentee", "email": "mentee@test.com"}
+
+
+@pytest.fixture(scope="module", autouse=True)
+def throwaway_database():
+    yield
+    MongoClient(server.mongo_url).drop_database(os.environ["DB_NAME"])
+
+
+class TestQueryTracking:
+    """track_queries / QueryMonitor attribution"""
+
+    async def test_counts_only_commands_inside_block(self):
+        """Commands issued outside the block aren't attributed to it"""
+        await server.db.users.find_one({"id": "nobody"})
+        with server.track_queries() as stats:
+            await server.db.users.find_one({"id": "nobody"})
+            await server.db.bookings.count_documents({"mentee_id": "nobody"})
+        await server.db.users.find_one({"id": "nobody"})
+        assert stats.count == 2, stats.summary()
+        assert ("find", "users", ("id",)) in stats.shapes
+
+
+class TestMenteeBookings:
+    """GET /mentee/bookings"""
+
+    async def test_feedback_lookup_is_one_query(self, assert_max_queries):
+        """Bookings plus one $in query for their feedback, however many bookings there are"""
+        bookings = [
+            {"id": f"booking-{i}", "mentee_id": MENTEE["id"], "date": f"2020-01-{i + 1:02d}", "start_time": "10:00"}
+            for i in range(5)
+        ]
+        await server.db.bookings.insert_many(bookings)
+        await server.db.feedbacks.insert_many([
+            {"id": "feedback-0", "booking_id": "booking-0", "mentee_id": MENTEE["id"]},
+            {"id": "feedback-3", "booking_id": "booking-3", "mentee_id": MENTEE["id"]},
+        ])
+
+        with assert_max_queries(2):
+            result = await server.get_mentee_bookings(user=MENTEE)
+
+        assert len(result["past"]) == 5
+        with_feedback = {b["id"]: b.get("feedback_id") for b in result["past"] if b["feedback_submitted"]}
+        assert with_feedback == {"booking-0": "feedback-0", "booking-3": "feedback-3"}
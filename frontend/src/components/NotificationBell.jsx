@@ -3,6 +3,7 @@ import { Bell } from 'lucide-react';
 import { useAuth } from '../contexts/AuthContext';
 import { useNavigate } from 'react-router-dom';
 import api from '../utils/api';
+import { openEventStream } from '../utils/stream';
 
 const NotificationBell = () => {
   const { user } = useAuth();
@@ -12,14 +13,42 @@ const NotificationBell = () => {
   const [notifications, setNotifications] = useState([]);
 
   useEffect(() => {
-    if (user) {
-      fetchNotifications();
-      // Poll every 30 seconds
+    if (!user) return;
+    fetchNotifications();
+
+    const token = localStorage.getItem('token');
+    if (!window.EventSource || !token) {
+      // No push channel available - fall back to polling every 30 seconds
       const interval = setInterval(fetchNotifications, 30000);
       return () => clearInterval(interval);
     }
+
+    // New notifications are pushed; (re)connecting refetches anything missed while disconnected
+    return openEventStream('/notifications/stream', {
+      onOpen: fetchNotifications,
+      events: {
+        notification: (event) => {
+          const notification = JSON.parse(event.data);
+          setNotifications(prev => sortNotifications([notification, ...prev.filter(n => n.id !== notification.id)]));
+          setUnreadCount(prev => prev + 1);
+        },
+        // Read/clear actions taken in another tab
+        notification_read: fetchNotifications,
+        notifications_read_all: fetchNotifications,
+        notifications_cleared: fetchNotifications,
+        // Announcements carry no content on the stream; the refetch applies the audience filter
+        broadcast: fetchNotifications
+      }
+    });
   }, [user]);
 
+  const sortNotifications = (list) => list.sort((a, b) => {
+    // Unread first
+    if (a.read !== b.read) return a.read ? 1 : -1;
+    // Then by date
+    return new Date(b.created_at) - new Date(a.created_at);
+  });
+
   const fetchNotifications = async () => {
     try {
       console.log('🔔 Fetching notifications...');
@@ -30,12 +59,7 @@ const NotificationBell = () => {
       
       // Simplified: Show all notifications, don't filter by bug status
       // Just show unread ones with higher priority
-      const sortedNotifications = allNotifications.sort((a, b) => {
-        // Unread first
-        if (a.read !== b.read) return a.read ? 1 : -1;
-        // Then by date
-        return new Date(b.created_at) - new Date(a.created_at);
-      });
+      const sortedNotifications = sortNotifications(allNotifications);
       
       console.log('🔔 Sorted notifications:', sortedNotifications);
       const unreadCount = sortedNotifications.filter(n => !n.read).length;
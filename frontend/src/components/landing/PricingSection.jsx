@@ -54,17 +54,8 @@ const PricingSection = () => {
       const isProduction = window.location.hostname === 'codementee.io' || window.location.hostname === 'www.codementee.io';
       const backendUrl = isProduction ? 'https://codementee.io' : (process.env.REACT_APP_BACKEND_URL || 'http://localhost:8001');
       
-      // Add cache-busting and no-cache headers to ensure fresh data
-      const response = await axios.get(`${backendUrl}/api/pricing-plans`, {
-        headers: {
-          'Cache-Control': 'no-cache, no-store, must-revalidate',
-          'Pragma': 'no-cache',
-          'Expires': '0'
-        },
-        params: {
-          _t: new Date().getTime() // Cache buster
-        }
-      });
+      // The API sends an ETag; the browser revalidates and gets a 304 when pricing is unchanged
+      const response = await axios.get(`${backendUrl}/api/pricing-plans`);
       
       if (!response.data || !Array.isArray(response.data) || response.data.length === 0) {
         throw new Error('No pricing data');
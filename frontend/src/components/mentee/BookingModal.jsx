@@ -1,4 +1,4 @@
-import React, { useState, useEffect } from 'react';
+import React, { useState, useEffect, useRef } from 'react';
 import { useTheme } from '../../contexts/ThemeContext';
 import { useAuth } from '../../contexts/AuthContext';
 import {
@@ -23,6 +23,7 @@ import {
   CheckCircle,
   AlertCircle,
   Loader2,
+  Users,
   X
 } from "lucide-react";
 import api from "../../utils/api";
@@ -38,6 +39,8 @@ const BookingModal = ({ slot, onClose, onSuccess }) => {
   const [specificTopics, setSpecificTopics] = useState([]);
   const [additionalNotes, setAdditionalNotes] = useState('');
   const [availableTracks, setAvailableTracks] = useState([]);
+  const [hold, setHold] = useState(null);
+  const holdPollRef = useRef(null);
 
   // Check if user is free tier
   const isFreeUser = user?.status === 'Free' || !user?.plan_id;
@@ -46,6 +49,49 @@ const BookingModal = ({ slot, onClose, onSuccess }) => {
     fetchCompanies();
   }, []);
 
+  // Hold the slot while the modal is open; release it (or leave the queue) on close
+  useEffect(() => {
+    if (isFreeUser) return undefined;
+    requestHold();
+    return () => {
+      clearInterval(holdPollRef.current);
+      api.delete(`/mentee/slots/${slot.id}/hold`).catch(() => {});
+    };
+  }, [slot.id]);
+
+  const requestHold = async () => {
+    try {
+      const response = await api.post(`/mentee/slots/${slot.id}/hold`);
+      setHold(response.data);
+      if (response.data.status === 'queued') {
+        pollHold();
+      }
+    } catch (error) {
+      if (error.response?.status === 409) {
+        toast.error('Slot no longer available', {
+          description: 'This slot was just booked by another user. Please select a different slot.'
+        });
+        onSuccess();
+      }
+    }
+  };
+
+  const pollHold = () => {
+    clearInterval(holdPollRef.current);
+    holdPollRef.current = setInterval(async () => {
+      try {
+        const response = await api.get(`/mentee/slots/${slot.id}/hold`);
+        setHold(response.data);
+        if (response.data.status === 'held') {
+          clearInterval(holdPollRef.current);
+          toast.success("You're up!", { description: 'The slot is now held for you. Complete your booking.' });
+        }
+      } catch (error) {
+        clearInterval(holdPollRef.current);
+      }
+    }, 5000);
+  };
+
   useEffect(() => {
     if (selectedCompany) {
       const company = companies.find(c => c.id === selectedCompany);
@@ -156,7 +202,12 @@ const BookingModal = ({ slot, onClose, onSuccess }) => {
             onClick: () => window.location.href = '/mentee/book'
           }
         });
-      } else if (errorData?.code === 'SLOT_ALREADY_BOOKED') {
+      } else if (errorData?.code === 'SLOT_HELD') {
+        toast.error('Someone else is booking this slot', {
+          description: "We've added you to the queue and will hold the slot for you if it frees up."
+        });
+        requestHold();
+      } else if (errorData?.code === 'SLOT_ALREADY_BOOKED' || errorData?.code === 'SLOT_NOT_AVAILABLE') {
         toast.error('Slot no longer available', {
           description: 'This slot was just booked by another user. Please select a different slot.'
         });
@@ -297,6 +348,24 @@ const BookingModal = ({ slot, onClose, onSuccess }) => {
             </div>
           </div>
 
+          {/* Hold / Queue Status */}
+          {hold?.status === 'held' && (
+            <div className="rounded-xl p-3 border border-emerald-500/30 bg-emerald-500/10 flex items-center gap-2">
+              <CheckCircle className="w-4 h-4 text-emerald-400 flex-shrink-0" />
+              <p className="text-emerald-400 text-sm">
+                This slot is held for you until {new Date(hold.expires_at).toLocaleTimeString('en-IN', { hour: '2-digit', minute: '2-digit' })}.
+              </p>
+            </div>
+          )}
+          {hold?.status === 'queued' && (
+            <div className="rounded-xl p-3 border border-yellow-500/30 bg-yellow-500/10 flex items-center gap-2">
+              <Users className="w-4 h-4 text-yellow-400 flex-shrink-0" />
+              <p className="text-yellow-400 text-sm">
+                Another mentee is booking this slot. You're #{hold.position} in line - keep this window open and we'll hold it for you if it frees up.
+              </p>
+            </div>
+          )}
+
           {/* Free User Warning */}
           {isFreeUser && (
             <div className={`${theme.bg.secondary} rounded-xl p-4 border-2 border-yellow-500/30`}>
@@ -483,7 +552,7 @@ const BookingModal = ({ slot, onClose, onSuccess }) => {
             </Button>
             <Button
               onClick={handleBooking}
-              disabled={loading || !selectedCompany || !selectedTrack || isFreeUser}
+              disabled={loading || !selectedCompany || !selectedTrack || isFreeUser || hold?.status === 'queued'}
               className="flex-1 bg-gradient-to-r from-[#06b6d4] to-[#0891b2] text-white hover:from-[#0891b2] hover:to-[#0e7490]"
             >
               {loading ? (
@@ -4,8 +4,9 @@ import { Card, CardContent, CardHeader, CardTitle } from "../ui/card";
 import { Button } from "../ui/button";
 import { Badge } from "../ui/badge";
 import { toast } from "sonner";
-import { Calendar, Clock, Briefcase, TrendingUp, Building2, RefreshCw, Search, Filter } from "lucide-react";
+import { Calendar, Clock, Briefcase, TrendingUp, Building2, RefreshCw, Search, Filter, BellRing } from "lucide-react";
 import api from "../../utils/api";
+import { openEventStream } from "../../utils/stream";
 import SlotFilters from './SlotFilters';
 import BookingModal from './BookingModal';
 
@@ -26,21 +27,68 @@ const SlotBrowser = () => {
   });
 
   useEffect(() => {
-    fetchSlots();
+    const token = localStorage.getItem('token');
+    if (!window.EventSource || !token) {
+      fetchSlots();
+      return undefined;
+    }
+
+    // Slots are added, booked and released while the page is open. Subscribe first, then
+    // load the snapshot once (also if the stream never opens, e.g. an expired token);
+    // each reconnect refetches it since deltas sent while disconnected are not replayed
+    let loaded = false;
+    const loadOnce = () => {
+      if (!loaded) {
+        loaded = true;
+        fetchSlots();
+      }
+    };
+    const upsertSlot = (event) => {
+      const { slot } = JSON.parse(event.data);
+      setSlots(prev => sortSlots([...prev.filter(s => s.id !== slot.id), slot]));
+    };
+    const removeSlot = (event) => {
+      const { slot } = JSON.parse(event.data);
+      setSlots(prev => prev.filter(s => s.id !== slot.id));
+    };
+    return openEventStream('/mentee/slots/stream', {
+      params: buildFilterParams(),
+      onOpen: () => {
+        if (loaded) {
+          fetchSlots();
+        } else {
+          loadOnce();
+        }
+      },
+      onError: loadOnce,
+      events: {
+        slot_added: upsertSlot,
+        slot_released: upsertSlot,
+        slot_booked: removeSlot,
+        slot_removed: removeSlot
+      }
+    });
   }, [filters]);
 
+  const buildFilterParams = () => {
+    const params = new URLSearchParams();
+    if (filters.interview_type) params.append('interview_type', filters.interview_type);
+    if (filters.experience_level) params.append('experience_level', filters.experience_level);
+    if (filters.date_from) params.append('date_from', filters.date_from);
+    if (filters.date_to) params.append('date_to', filters.date_to);
+    if (filters.company_id) params.append('company_id', filters.company_id);
+    return params;
+  };
+
+  const sortSlots = (list) => list.sort((a, b) =>
+    a.date.localeCompare(b.date) || a.start_time.localeCompare(b.start_time)
+  );
+
   const fetchSlots = async (showRefreshing = false) => {
     if (showRefreshing) setRefreshing(true);
     
     try {
-      // Build query params from filters
-      const params = new URLSearchParams();
-      if (filters.interview_type) params.append('interview_type', filters.interview_type);
-      if (filters.experience_level) params.append('experience_level', filters.experience_level);
-      if (filters.date_from) params.append('date_from', filters.date_from);
-      if (filters.date_to) params.append('date_to', filters.date_to);
-      if (filters.company_id) params.append('company_id', filters.company_id);
-
+      const params = buildFilterParams();
       const response = await api.get(`/mentee/slots/browse?${params.toString()}`);
       setSlots(response.data);
       
@@ -56,6 +104,24 @@ const SlotBrowser = () => {
     }
   };
 
+  const saveInterests = async () => {
+    try {
+      // The current filters become the mentee's slot interests; an unset filter matches anything
+      await api.put('/mentee/slot-interests', {
+        interview_types: filters.interview_type ? [filters.interview_type] : [],
+        experience_levels: filters.experience_level ? [filters.experience_level] : [],
+        company_ids: filters.company_id ? [filters.company_id] : [],
+        date_from: filters.date_from,
+        date_to: filters.date_to,
+        waitlist: true
+      });
+      toast.success("We'll let you know about new matching slots and hold the next one for you");
+    } catch (error) {
+      toast.error('Failed to save slot alert');
+      console.error('Save slot interests error:', error);
+    }
+  };
+
   const handleBookSlot = (slot) => {
     setSelectedSlot(slot);
     setShowBookingModal(true);
@@ -132,6 +198,14 @@ const SlotBrowser = () => {
             <Filter className="w-4 h-4" />
             {showFilters ? 'Hide Filters' : 'Show Filters'}
           </Button>
+          <Button
+            onClick={saveInterests}
+            variant="outline"
+            className={`${theme.button.secondary} flex items-center gap-2`}
+          >
+            <BellRing className="w-4 h-4" />
+            Alert Me
+          </Button>
           <Button
             onClick={() => fetchSlots(true)}
             disabled={refreshing}
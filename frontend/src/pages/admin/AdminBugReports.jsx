@@ -18,6 +18,7 @@ import {
   Filter
 } from "lucide-react";
 import api from "../../utils/api";
+import { openEventStream } from "../../utils/stream";
 
 const AdminBugReports = () => {
   const { theme } = useTheme();
@@ -28,10 +29,41 @@ const AdminBugReports = () => {
   const [showDetailModal, setShowDetailModal] = useState(false);
 
   useEffect(() => {
-    fetchBugs();
-    // Poll for updates every 30 seconds
-    const interval = setInterval(fetchBugs, 30000);
-    return () => clearInterval(interval);
+    const token = localStorage.getItem('token');
+    if (!window.EventSource || !token) {
+      fetchBugs();
+      // No live feed available - poll for updates every 30 seconds
+      const interval = setInterval(fetchBugs, 30000);
+      return () => clearInterval(interval);
+    }
+
+    // Subscribe first, then load the list once; the server's initial `sync` event sets
+    // Last-Event-ID, so reconnects resume from there instead of refetching
+    let loaded = false;
+    const loadOnce = () => {
+      if (!loaded) {
+        loaded = true;
+        fetchBugs();
+      }
+    };
+    return openEventStream('/admin/bug-reports/stream', {
+      onOpen: loadOnce,
+      onError: loadOnce,
+      events: {
+        // Only carries the position to resume from
+        sync: () => {},
+        bug_report_created: (event) => {
+          const report = JSON.parse(event.data);
+          setBugs(prev => [report, ...prev.filter(bug => bug.id !== report.id)]);
+        },
+        bug_report_updated: (event) => {
+          const update = JSON.parse(event.data);
+          setBugs(prev => prev.map(bug => (bug.id === update.id ? { ...bug, ...update } : bug)));
+        },
+        // Too far behind to replay - start over from the full list
+        reset: fetchBugs
+      }
+    });
   }, []);
 
   const fetchBugs = async () => {
@@ -50,7 +82,7 @@ const AdminBugReports = () => {
     try {
       await api.put(`/admin/bug-reports/${bugId}/status`, { status: newStatus });
       toast.success('Bug status updated successfully');
-      fetchBugs();
+      setBugs(prev => prev.map(bug => (bug.id === bugId ? { ...bug, status: newStatus } : bug)));
       if (selectedBug?.id === bugId) {
         setSelectedBug({ ...selectedBug, status: newStatus });
       }
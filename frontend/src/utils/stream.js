@@ -0,0 +1,58 @@
+import api, { API } from './api';
+
+const RECONNECT_MS = 5000;
+
+// EventSource can't send headers, so streams are opened with a short-lived stream
+// token in the URL rather than the login token. The browser retries a dropped
+// connection with the same URL, which is rejected once that token has expired and
+// closes the source - so reopen it then with a fresh token, resuming after the last
+// event id seen. Returns a function that closes the stream.
+export const openEventStream = (path, { params, events = {}, onOpen, onError } = {}) => {
+  let source = null;
+  let closed = false;
+  let retryTimer = null;
+  let lastEventId = null;
+
+  const retry = () => {
+    if (!closed) retryTimer = setTimeout(connect, RECONNECT_MS);
+  };
+
+  const connect = async () => {
+    let token;
+    try {
+      const response = await api.post('/auth/stream-token');
+      token = response.data.token;
+    } catch (error) {
+      if (onError) onError(error);
+      // Logged out or forbidden - a new token won't help
+      if (![401, 403].includes(error.response?.status)) retry();
+      return;
+    }
+    if (closed) return;
+
+    const query = new URLSearchParams(params);
+    query.set('token', token);
+    if (lastEventId) query.set('last_event_id', lastEventId);
+    source = new EventSource(`${API}${path}?${query.toString()}`);
+    source.onopen = (event) => {
+      if (onOpen) onOpen(event);
+    };
+    source.onerror = (event) => {
+      if (onError) onError(event);
+      if (source.readyState === EventSource.CLOSED) retry();
+    };
+    Object.entries(events).forEach(([name, handler]) => {
+      source.addEventListener(name, (event) => {
+        if (event.lastEventId) lastEventId = event.lastEventId;
+        handler(event);
+      });
+    });
+  };
+
+  connect();
+  return () => {
+    closed = true;
+    clearTimeout(retryTimer);
+    if (source) source.close();
+  };
+};